@@ -7,12 +7,13 @@ import traceback
 import threading
 import time
 from datetime import datetime
+from decimal import Decimal
 import uuid
 import jwt
 import functools
 from supabase import create_client, Client
 from dotenv import load_dotenv
-from flow_py_adapter import FlowPyAdapter
+from flow_py_adapter import FlowPyAdapter, FINALITY_STATUS
 from wallet_crypto import encrypt_private_key, get_plain_private_key
 from transaction_logger import TransactionLogger
 
@@ -36,6 +37,9 @@ SUPABASE_JWT_SECRET = os.getenv('SUPABASE_JWT_SECRET')
 ADMIN_SECRET_KEY = os.getenv('ADMIN_SECRET_KEY')
 WEBHOOK_SECRET = os.getenv('WEBHOOK_SECRET') or ADMIN_SECRET_KEY
 
+# Finality send-bait waits for before responding ('executed' or 'sealed')
+SEND_BAIT_FINALITY = os.getenv('SEND_BAIT_FINALITY', 'sealed')
+
 # Validate required environment variables
 if not SUPABASE_URL:
     print("WARNING: SUPABASE_URL environment variable not set")
@@ -498,6 +502,8 @@ def index():
             },
             'scripts': {
                 'check_bait_balance': 'GET /scripts/check-bait-balance?address=<address>',
+                'contract_state': 'GET /scripts/contract-state - BAIT supply, contract USDF reserve and token info (read-only, cached)',
+                'account_summary': 'GET /scripts/account-summary?address=<address> - BAIT/FLOW balances, BAIT capabilities and BAIT supply in one script call',
                 'check_contract_vaults': 'GET /scripts/check-contract-vaults',
                 'create_vault_and_mint': 'POST /scripts/create-vault-and-mint',
                 'sell_bait': 'POST /scripts/sell-bait',
@@ -511,11 +517,11 @@ def index():
                 'admin_burn_bait': 'POST /transactions/admin-burn-bait (amount, from_wallet?) - Burn from admin wallet or transfer from custodial wallet then burn',
                 'admin_mint_bait': 'POST /transactions/admin-mint-bait (to_address, amount)',
                 'admin_mint_fusd': 'POST /transactions/admin-mint-fusd (to_address, amount)',
-                'check_contract_usdf_balance': 'GET /transactions/check-contract-usdf-balance',
+                'check_contract_usdf_balance': 'GET /transactions/check-contract-usdf-balance - read-only script, same data as /scripts/contract-state',
                 'create_all_vault': 'POST /transactions/create-all-vault (address)',
                 'create_usdf_vault': 'POST /transactions/create-usdf-vault (address)',
                 'reset_all_vaults': 'POST /transactions/reset-all-vaults',
-                'send_bait': 'POST /transactions/send-bait (to_address, amount)',
+                'send_bait': 'POST /transactions/send-bait (to_address, amount, finality?)',
                 'send_fusd': 'POST /transactions/send-fusd (to_address, amount)',
                 'swap_bait_for_fusd': 'POST /transactions/swap-bait-for-fusd (amount)',
                 'swap_fusd_for_bait': 'POST /transactions/swap-fusd-for-bait (amount)',
@@ -666,6 +672,31 @@ def check_bait_balance():
         'execution_time': result.get('execution_time')
     })
 
+@app.route('/scripts/account-summary')
+@require_auth
+def account_summary():
+    """BAIT and FLOW balances, BAIT capabilities and BAIT supply in one script call"""
+    address = request.args.get('address') or get_wallet_address(request.wallet_details)
+    network = request.args.get('network', 'mainnet')
+    if not address:
+        return jsonify({'error': 'Address parameter is required and no wallet address found for authenticated user'}), 400
+
+    result = (flow_adapter.query(network)
+              .add('bait_balance', 'bait_balance', address)
+              .add('flow_balance', 'flow_balance', address)
+              .add('capabilities', 'bait_capabilities', address)
+              .add('bait_total_supply', 'bait_total_supply')
+              .execute())
+
+    data = result.get('data') or {}
+    return jsonify({
+        'success': result.get('success'),
+        'address': address,
+        'data': {k: float(v) if isinstance(v, Decimal) else v for k, v in data.items()},
+        'error': result.get('error_message'),
+        'execution_time': result.get('execution_time')
+    }), 200 if result.get('success') else 400
+
 # Transaction endpoints
 @app.route('/transactions/admin-burn-bait', methods=['POST'])
 @require_admin_auth
@@ -977,75 +1008,40 @@ def deposit_flow():
         'execution_time': result.get('execution_time')
     })
 
+def _contract_state_response(result):
+    state = result.get('data') or {}
+    body = {
+        'success': result.get('success'),
+        'data': {k: float(v) if isinstance(v, Decimal) else v for k, v in state.items()},
+        'cached': bool(result.get('cached')),
+        'stderr': result.get('stderr'),
+        'execution_time': result.get('execution_time')
+    }
+    if not result.get('success'):
+        body['error'] = result.get('error_message') or 'Script failed'
+    return body
+
+@app.route('/scripts/contract-state')
+@require_auth
+def contract_state():
+    """BAIT total supply, contract USDF reserve and token info via a cached read-only script"""
+    network = request.args.get('network', 'mainnet')
+    body = _contract_state_response(flow_adapter.get_contract_state(network))
+    return jsonify(body), 200 if body['success'] else 400
+
 @app.route('/transactions/check-contract-usdf-balance')
 @require_auth
 def check_contract_usdf_balance():
-    """Check contract USDF balance"""
+    """Check contract USDF balance (read-only script; kept at this path for existing clients)"""
     network = request.args.get('network', 'mainnet')
-    
-    # Use Node adapter for transaction execution
-    result = flow_adapter.send_transaction(
-        transaction_path='cadence/transactions/checkContractUsdfBalance.cdc',
-        args=[],
-        roles={'proposer': 'mainnet-agfarms', 'authorizer': 'mainnet-agfarms', 'payer': 'mainnet-agfarms'}
-    )
-    
-    # Check if the transaction actually succeeded
-    if not result.get('success'):
-        print(f"Check contract balance transaction failed: {result.get('stderr', 'Unknown error')}")
-        return jsonify({
-            'success': False,
-            'error': result.get('stderr') or result.get('errorMessage') or 'Transaction failed',
-            'stdout': result.get('stdout'),
-            'stderr': result.get('stderr'),
-            'returncode': result.get('returncode'),
-            'transaction_id': result.get('transaction_id'),
-            'execution_time': result.get('execution_time')
-        }), 400
-    
-    return jsonify({
-        'success': True,
-        'stdout': result.get('stdout'),
-        'stderr': result.get('stderr'),
-        'returncode': result.get('returncode'),
-        'transaction_id': result.get('transaction_id'),
-        'execution_time': result.get('execution_time')
-    })
-
-def check_bait_balance(flow_address):
-    """Check BaitCoin balance for a wallet using checkBaitBalance.cdc script"""
-    try:
-        # Ensure address has 0x prefix
-        if not flow_address.startswith('0x'):
-            flow_address = '0x' + flow_address
-        
-        # Use Node adapter to execute script
-        result = flow_adapter.execute_script(
-            script_path="cadence/scripts/checkBaitBalance.cdc",
-            args=[flow_address],
-            network="mainnet"
-        )
-        
-        if not result.get('success', False):
-            error_msg = result.get('error_message', '') or result.get('stderr', '')
-            print(f"Error checking BaitCoin balance for {flow_address}: {error_msg}")
-            return None
-        
-        try:
-            balance_data = result.get('data')
-            if isinstance(balance_data, (int, float)):
-                return float(balance_data)
-            if isinstance(balance_data, dict) and "value" in balance_data:
-                return float(balance_data["value"])
-            print(f"Unexpected response format for {flow_address}: {balance_data}")
-            return None
-        except (ValueError, KeyError, TypeError) as e:
-            print(f"Error parsing BaitCoin balance result for {flow_address}: {e}")
-            return None
-        
-    except Exception as e:
-        print(f"Error checking BaitCoin balance for {flow_address}: {e}")
-        return None
+    body = _contract_state_response(flow_adapter.get_contract_state(network))
+    if not body['success']:
+        print(f"Check contract balance script failed: {body.get('error')}")
+        return jsonify(body), 400
+    state = body['data']
+    body['stdout'] = f"Contract USDF Balance: {state.get('usdf_reserve')}\nBAIT Total Supply: {state.get('bait_total_supply')}"
+    body['transaction_id'] = None
+    return jsonify(body)
 
 @app.route('/transactions/send-bait', methods=['POST'])
 @require_auth
@@ -1069,6 +1065,7 @@ def _send_bait_impl():
     to_address = data.get('to_address')
     amount = data.get('amount')
     network = data.get('network', 'mainnet')
+    finality = data.get('finality', SEND_BAIT_FINALITY)
     
     if not amount:
         return jsonify({'error': 'amount parameter is required'}), 400
@@ -1076,6 +1073,9 @@ def _send_bait_impl():
     if not to_address:
         return jsonify({'error': 'to_address parameter is required'}), 400
     
+    if finality not in ('executed', 'sealed'):
+        return jsonify({'error': "finality must be 'executed' or 'sealed'"}), 400
+    
     if re.match(r'^[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}$', to_address):
         print(f"to_address appears to be a user ID: {to_address}")
         flow_address = get_flow_address_by_user_id(to_address)
@@ -1108,32 +1108,12 @@ def _send_bait_impl():
     if not user_private_key:
         return jsonify({'error': 'No private key found for authenticated user'}), 400
     
-    # Check user's BaitCoin balance before attempting transaction
-    print(f"Checking BaitCoin balance for user {user_flow_address}...")
-    user_balance = check_bait_balance(user_flow_address)
-    
-    # Convert amount to float for comparison
     try:
         amount_float = float(amount)
     except (ValueError, TypeError):
         return jsonify({'error': 'Invalid amount format'}), 400
     
-    # If balance check failed, log warning but continue with transaction
-    if user_balance is None:
-        print(f"⚠️  Could not check BaitCoin balance for {user_flow_address}, proceeding with transaction")
-        print(f"⚠️  Transaction may fail if insufficient balance")
-    else:
-        print(f"✓ BaitCoin balance check: {user_balance} BaitCoin")
-        
-        if user_balance < amount_float:
-            return jsonify({
-                'error': f'Insufficient BaitCoin balance. You have {user_balance} BaitCoin but are trying to send {amount_float} BaitCoin.',
-                'current_balance': user_balance,
-                'requested_amount': amount_float,
-                'shortfall': amount_float - user_balance
-            }), 400
-        
-        print(f"✓ BaitCoin balance check passed: {user_balance} >= {amount_float}")
+    # Sender balance and recipient receiver are checked by the adapter's pre-flight script before signing
     
     print(f"User ID (auth_id): {user_id}")
     print(f"User Flow Address: {user_flow_address}")
@@ -1160,13 +1140,36 @@ def _send_bait_impl():
         private_keys={user_flow_address_with_prefix: user_private_key},
         proposer_wallet_id=user_id,
         payer_wallet_id=admin_wallet_id,
-        authorizer_wallet_ids=[user_id] if user_id else None
+        authorizer_wallet_ids=[user_id] if user_id else None,
+        finality=finality
     )
     
     print(f"=== PYTHON APP SEND BAIT RESULT ===")
     print(f"Result: {result}")
     print("=====================================")
     
+    if result.get('error_type') == 'preflight':
+        print(f"Transaction rejected by pre-flight: {result.get('error_message')}")
+        shortfall = next((f for f in result['preflight'] if f['reason'] == 'insufficient'), None)
+        if shortfall is not None:
+            user_balance = float(shortfall['value'])
+            return jsonify({
+                'success': False,
+                'error': f'Insufficient BaitCoin balance. You have {user_balance} BaitCoin but are trying to send {amount_float} BaitCoin.',
+                'error_type': 'insufficient_balance',
+                'current_balance': user_balance,
+                'requested_amount': amount_float,
+                'shortfall': amount_float - user_balance,
+                'execution_time': result.get('execution_time')
+            }), 400
+        return jsonify({
+            'success': False,
+            'error': result.get('error_message'),
+            'error_type': 'preflight',
+            'checks': [{'check': f['check'], 'address': f['address'], 'reason': f['reason'], 'message': f['message']} for f in result['preflight']],
+            'execution_time': result.get('execution_time')
+        }), 400
+    
     if not result.get('success'):
         error_msg = result.get('stderr') or result.get('error_message') or 'Transaction failed'
         print(f"Transaction failed: {error_msg}")
@@ -1192,11 +1195,11 @@ def _send_bait_impl():
         }), 400
 
     tx_status = result.get('data', {}).get('status') if isinstance(result.get('data'), dict) else result.get('data')
-    if tx_status != 4:
-        print(f"Transaction not sealed: status={tx_status}")
+    if not isinstance(tx_status, int) or tx_status < FINALITY_STATUS[finality]:
+        print(f"Transaction not {finality}: status={tx_status}")
         return jsonify({
             'success': False,
-            'error': f'Transaction not sealed (status={tx_status})',
+            'error': f'Transaction not {finality} (status={tx_status})',
             'transaction_id': result.get('transaction_id'),
             'execution_time': result.get('execution_time')
         }), 400
@@ -1217,11 +1220,12 @@ def _send_bait_impl():
                 network=network
             )
             if tx_row and tx_row.get('id'):
-                transaction_logger.update_transaction_sealed(
-                    tx_row['id'],
-                    result_data={'flow_transaction_id': flow_tx_id, 'to_address': to_address, 'amount': amount_float},
-                    execution_time_ms=exec_time_ms
-                )
+                result_data = {'flow_transaction_id': flow_tx_id, 'to_address': to_address, 'amount': amount_float}
+                if tx_status == 4:
+                    transaction_logger.update_transaction_sealed(tx_row['id'], result_data=result_data, execution_time_ms=exec_time_ms)
+                else:
+                    transaction_logger.update_transaction_success(tx_row['id'], result_data=result_data, execution_time_ms=exec_time_ms)
+                    flow_adapter.when_sealed(flow_tx_id, functools.partial(_record_send_bait_seal, tx_row['id'], result_data))
                 transaction_logger.update_transaction(tx_row['id'], {'flow_transaction_id': flow_tx_id})
                 print(f"Logged transaction to DB: {tx_row['id']}")
         except Exception as log_err:
@@ -1265,10 +1269,20 @@ def _send_bait_impl():
         'stderr': result.get('stderr'),
         'returncode': result.get('returncode'),
         'transaction_id': flow_tx_id,
+        'status': tx_status,
+        'finality': finality,
         'execution_time': result.get('execution_time')
     })
 
 
+def _record_send_bait_seal(tx_row_id, result_data, flow_tx_id, outcome):
+    if outcome.get('sealed') and not outcome.get('error_message'):
+        transaction_logger.update_transaction_sealed(tx_row_id, result_data=result_data)
+    else:
+        print(f"Transaction {flow_tx_id} failed to seal: {outcome}", file=sys.stderr)
+        transaction_logger.update_transaction_failure(tx_row_id, outcome.get('error_message') or f"status={outcome.get('status')}", 0)
+
+
 # Background task endpoints
 @app.route('/background/run-script', methods=['POST'])
 @require_auth
@@ -1448,7 +1462,17 @@ def health_check():
 def get_metrics():
     """Get Flow wrapper metrics"""
     return jsonify({
-        'flow_metrics': {},
+        'flow_metrics': flow_adapter.metrics(),
+        'timestamp': datetime.now().isoformat()
+    })
+
+# Computation profile endpoint
+@app.route('/metrics/computation')
+@require_auth
+def get_computation_profile():
+    """Get computation used per transaction template and the gas limits derived from it"""
+    return jsonify({
+        'computation': flow_adapter.computation_profile(),
         'timestamp': datetime.now().isoformat()
     })
 
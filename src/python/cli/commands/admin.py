@@ -4,6 +4,7 @@ sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
 
 import click
 from rich.console import Console
+from rich.table import Table
 
 from cli.core import resolve_wallet, REPO_ROOT
 
@@ -139,3 +140,46 @@ def mint_fusd(ctx, to_id, amount, json_output):
         network=network
     )
     _admin_result(r, json_output)
+
+@admin_group.command('add-proposal-keys')
+@click.option('--count', required=True, type=click.IntRange(1, 100), help='Number of service key copies to add')
+@click.option('--json', 'json_output', is_flag=True)
+@click.pass_context
+def add_proposal_keys(ctx, count, json_output):
+    from flow_py_adapter import FlowPyAdapter
+    adapter = FlowPyAdapter(repo_root=REPO_ROOT)
+    network = ctx.obj.get('network', 'mainnet')
+    r = adapter.add_proposal_keys(count, network=network)
+    if r.get('success') and not json_output:
+        Console().print(f"Proposal keys: {r.get('proposal_keys')}")
+    _admin_result(r, json_output)
+
+@admin_group.command('gas-profile')
+@click.option('--json', 'json_output', is_flag=True)
+@click.pass_context
+def gas_profile(ctx, json_output):
+    # Samples are collected by the long-running API process, so this reads them from there.
+    if not ctx.obj.get('api_url'):
+        click.echo('gas-profile reads the API server profile; pass --api <url>', err=True)
+        raise SystemExit(1)
+    import requests
+    base = ctx.obj.get('api_url', '').rstrip('/')
+    token = ctx.obj.get('admin_secret')
+    if not token:
+        click.echo('Admin operations require --admin', err=True)
+        raise SystemExit(1)
+    r = requests.get(f'{base}/metrics/computation', headers={'Authorization': f'Bearer {token}'}, timeout=10)
+    if r.status_code != 200:
+        click.echo(f'Failed: HTTP {r.status_code}', err=True)
+        raise SystemExit(1)
+    profile = r.json().get('computation', {})
+    if json_output:
+        import json
+        click.echo(json.dumps(profile, indent=2))
+        return
+    table = Table(title=f"Computation per template (default gas limit {profile.get('default_gas_limit')})")
+    for column in ('Template', 'Samples', 'p50', 'p95', 'p99', 'Max', 'Gas limit', 'Limit exceeded'):
+        table.add_column(column)
+    for name, t in sorted(profile.get('templates', {}).items()):
+        table.add_row(name, str(t.get('samples')), str(t.get('p50', '-')), str(t.get('p95', '-')), str(t.get('p99', '-')), str(t.get('max', '-')), str(t.get('gas_limit')), str(t.get('limit_exceeded')))
+    Console().print(table)
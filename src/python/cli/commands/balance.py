@@ -13,19 +13,23 @@ def run_balance_standalone(ctx, address, flow_only, all_balances, contract_usdf,
     adapter = FlowPyAdapter(repo_root=REPO_ROOT)
     network = ctx.obj.get('network', 'mainnet')
     if contract_usdf:
-        if not ctx.obj.get('admin_secret'):
-            click.echo('--contract-usdf requires admin mode', err=True)
-            raise SystemExit(1)
-        r = adapter.send_transaction(
-            'cadence/transactions/checkContractUsdfBalance.cdc', [],
-            roles={'proposer': 'mainnet-agfarms', 'authorizer': 'mainnet-agfarms', 'payer': 'mainnet-agfarms'},
-            network=network
-        )
+        r = adapter.get_contract_state(network)
         if json_output:
             import json
-            click.echo(json.dumps(r, indent=2))
-        else:
-            Console().print(r.get('stdout', r.get('stderr', str(r))))
+            click.echo(json.dumps(r, indent=2, default=str))
+            return
+        if not r.get('success'):
+            click.echo(r.get('error_message') or 'Failed to read contract state', err=True)
+            raise SystemExit(1)
+        state = r['data']
+        table = Table(title=f"Contract {state['contract_address']}")
+        table.add_column('Field', style='cyan')
+        table.add_column('Value', style='green')
+        table.add_row('USDF reserve', f"{state['usdf_reserve']:.4f}" if state['usdf_reserve'] is not None else 'No USDF vault')
+        table.add_row('BAIT total supply', f"{state['bait_total_supply']:.4f}")
+        if state['reserve_ratio'] is not None:
+            table.add_row('Reserve ratio', f"{state['reserve_ratio']:.4f}")
+        Console().print(table)
         return
     if not address:
         click.echo('Address or auth_id required', err=True)
@@ -73,7 +77,7 @@ def run_balance_api(ctx, address, flow_only, all_balances, contract_usdf, json_o
         raise SystemExit(1)
     headers = {'Authorization': f'Bearer {token}', 'Content-Type': 'application/json'}
     if contract_usdf:
-        r = requests.get(f'{base}/transactions/check-contract-usdf-balance', headers=headers, timeout=30)
+        r = requests.get(f'{base}/scripts/contract-state', headers=headers, timeout=10)
         if json_output:
             click.echo(r.text)
         else:
@@ -101,7 +105,7 @@ def run_balance_api(ctx, address, flow_only, all_balances, contract_usdf, json_o
 @click.argument('address', required=False)
 @click.option('--flow', 'flow_only', is_flag=True, help='Show FLOW balance only')
 @click.option('--all', 'all_balances', is_flag=True, help='Show BAIT and FLOW')
-@click.option('--contract-usdf', is_flag=True, help='Show contract USDF balance (admin)')
+@click.option('--contract-usdf', is_flag=True, help='Show contract USDF reserve and BAIT supply')
 @click.option('--json', 'json_output', is_flag=True, help='Output as JSON')
 @click.pass_context
 def balance(ctx, address, flow_only, all_balances, contract_usdf, json_output):
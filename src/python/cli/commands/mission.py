@@ -13,27 +13,28 @@ def run_mission_standalone(ctx, json_output):
     adapter = FlowPyAdapter(repo_root=REPO_ROOT)
     wallets = get_all_wallets_from_supabase()
     wallet_count = len(wallets)
-    total_bait = 0.0
-    total_flow = 0.0
     errors = []
+    network = ctx.obj.get('network', 'mainnet')
+    addresses = []
     for w in wallets[:50]:
         addr = w.get('flow_address', '')
         if not addr:
             continue
-        if not addr.startswith('0x'):
-            addr = f'0x{addr}'
-        try:
-            r = adapter.execute_script('cadence/scripts/checkBaitBalance.cdc', [addr], ctx.obj.get('network', 'mainnet'))
-            if r.get('success') and r.get('data') is not None:
-                total_bait += float(r['data'])
-        except Exception as e:
-            errors.append(str(e))
-        try:
-            r = adapter.execute_script('cadence/scripts/checkFlowBalance.cdc', [addr], ctx.obj.get('network', 'mainnet'))
-            if r.get('success') and r.get('data') is not None:
-                total_flow += float(r['data'])
-        except Exception as e:
-            errors.append(str(e))
+        addresses.append(addr if addr.startswith('0x') else f'0x{addr}')
+    block_height = None
+    try:
+        with adapter.snapshot(network) as snap:
+            block_height = snap.block_height
+            balance_results = [snap.get_balances(addresses, 'bait'), snap.get_balances(addresses, 'flow')]
+    except Exception as e:
+        errors.append(f'Could not pin a sealed block: {e}')
+        balance_results = [adapter.get_balances(addresses, 'bait', network), adapter.get_balances(addresses, 'flow', network)]
+    bait_result, flow_result = balance_results
+    total_bait = float(sum(b for b in bait_result['data'].values() if b is not None))
+    total_flow = float(sum(b for b in flow_result['data'].values() if b is not None))
+    for r in balance_results:
+        if r.get('error_message'):
+            errors.append(r['error_message'])
     health = 'ok'
     try:
         r = adapter.execute_script('cadence/scripts/checkBaitBalance.cdc', ['0xed2202de80195438'], ctx.obj.get('network', 'mainnet'))
@@ -48,6 +49,7 @@ def run_mission_standalone(ctx, json_output):
             'wallet_count': wallet_count,
             'total_bait': total_bait,
             'total_flow': total_flow,
+            'block_height': block_height,
             'health': health,
             'recent_transactions': recent,
             'errors': errors[:5]
@@ -60,6 +62,8 @@ def run_mission_standalone(ctx, json_output):
     table.add_row('Wallets', str(wallet_count))
     table.add_row('Total BAIT', f'{total_bait:.2f}')
     table.add_row('Total FLOW', f'{total_flow:.2f}')
+    if block_height is not None:
+        table.add_row('Block Height', str(block_height))
     table.add_row('Health', health)
     console.print(table)
     if recent:
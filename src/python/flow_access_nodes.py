@@ -0,0 +1,214 @@
+import asyncio
+import os
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import Any, AsyncContextManager, AsyncIterator, Awaitable, Callable, Deque, Dict, List, Optional, Tuple
+
+from flow_channel_pool import is_connection_failure
+from flow_rate_limiter import AdaptiveRateLimiter, is_throttled
+
+DEFAULT_ACCESS_NODES = {
+    'mainnet': 'access.mainnet.nodes.onflow.org:9000',
+    'testnet': 'access.devnet.nodes.onflow.org:9000',
+    'emulator': '127.0.0.1:3569',
+}
+EWMA_ALPHA = 0.3
+HEDGE_MIN_DELAY = float(os.getenv('FLOW_HEDGE_MIN_DELAY', '0.05'))
+HEDGE_MIN_SAMPLES = 20
+LATENCY_WINDOW = 500
+MAX_COOLDOWN = 30.0
+
+Endpoint = Tuple[str, int]
+
+
+def parse_endpoints(spec: Optional[str], default_port: int = 9000) -> List[Endpoint]:
+    endpoints = []
+    for part in (spec or '').split(','):
+        part = part.strip()
+        if not part:
+            continue
+        host, sep, port = part.rpartition(':')
+        endpoints.append((host, int(port)) if sep and port.isdigit() else (part, default_port))
+    return endpoints
+
+
+def access_nodes_for(network: str) -> List[Endpoint]:
+    spec = os.getenv(f'FLOW_ACCESS_NODES_{network.upper()}') or DEFAULT_ACCESS_NODES.get(network, DEFAULT_ACCESS_NODES['emulator'])
+    return parse_endpoints(spec)
+
+
+class _NodeState:
+    __slots__ = ('endpoint', 'ewma', 'in_flight', 'failures', 'down_until', 'calls', 'errors')
+
+    def __init__(self, endpoint: Endpoint):
+        self.endpoint = endpoint
+        self.ewma = 0.0
+        self.in_flight = 0
+        self.failures = 0
+        self.down_until = 0.0
+        self.calls = 0
+        self.errors = 0
+
+
+class AccessNodeSet:
+    """Access nodes for one network, picked by latency EWMA with failover.
+
+    ``client()`` borrows a client from the lowest-scoring healthy node; a node
+    that fails with UNAVAILABLE/DEADLINE_EXCEEDED (or a dropped connection) is
+    skipped for an exponentially growing cooldown. ``call(fn)`` additionally
+    retries a failed read on the next node, and with ``hedge=True`` sends a
+    second copy to another node once the first has run past the observed p95,
+    returning whichever answers first. Only use ``call`` for idempotent reads.
+    Every borrow first takes a token from the node's bucket for its call
+    class ('script' or 'transaction') when a rate limiter is attached.
+    """
+
+    def __init__(self, network: str, endpoints: List[Endpoint], client_factory: Callable[[str, int], AsyncContextManager[Any]], hedge_min_delay: float = HEDGE_MIN_DELAY, limiter: Optional[AdaptiveRateLimiter] = None):
+        if not endpoints:
+            raise ValueError(f'No access nodes configured for {network}')
+        self.network = network
+        self._nodes = [_NodeState(e) for e in endpoints]
+        self._client_factory = client_factory
+        self.hedge_min_delay = hedge_min_delay
+        self._limiter = limiter
+        self._latencies: Deque[float] = deque(maxlen=LATENCY_WINDOW)
+        self.stats = {'calls': 0, 'failovers': 0, 'hedged': 0, 'hedge_wins': 0}
+
+    def __len__(self) -> int:
+        return len(self._nodes)
+
+    def pick(self, exclude: Tuple[Endpoint, ...] = ()) -> _NodeState:
+        now = time.monotonic()
+        candidates = [n for n in self._nodes if n.endpoint not in exclude] or self._nodes
+        healthy = [n for n in candidates if n.down_until <= now] or candidates
+        return min(healthy, key=lambda n: (n.ewma * (n.in_flight + 1), n.down_until))
+
+    def record(self, node: _NodeState, latency: Optional[float], failed: bool = False, sample: bool = True) -> None:
+        node.calls += 1
+        if failed:
+            node.errors += 1
+            node.failures += 1
+            node.down_until = time.monotonic() + min(MAX_COOLDOWN, 2 ** (node.failures - 1))
+            return
+        node.failures = 0
+        node.down_until = 0.0
+        if latency is not None:
+            node.ewma = latency if node.ewma == 0.0 else EWMA_ALPHA * latency + (1 - EWMA_ALPHA) * node.ewma
+            if sample:
+                self._latencies.append(latency)
+
+    def percentile(self, quantile: float) -> Optional[float]:
+        if not self._latencies:
+            return None
+        ordered = sorted(self._latencies)
+        return ordered[min(len(ordered) - 1, int(quantile * len(ordered)))]
+
+    def hedge_delay(self) -> Optional[float]:
+        if len(self._nodes) < 2 or len(self._latencies) < HEDGE_MIN_SAMPLES:
+            return None
+        return max(self.hedge_min_delay, self.percentile(0.95))
+
+    async def _acquire(self, node: _NodeState, kind: str) -> None:
+        if self._limiter is not None:
+            await self._limiter.acquire(node.endpoint, kind)
+
+    def _observe(self, node: _NodeState, kind: str, exc: Optional[BaseException] = None) -> None:
+        if self._limiter is not None:
+            self._limiter.observe(node.endpoint, kind, exc)
+
+    @asynccontextmanager
+    async def client(self, node: Optional[_NodeState] = None, kind: str = 'script') -> AsyncIterator[Any]:
+        node = node or self.pick()
+        await self._acquire(node, kind)
+        node.in_flight += 1
+        try:
+            async with self._client_factory(*node.endpoint) as client:
+                yield client
+        except BaseException as e:
+            self._observe(node, kind, e)
+            if is_connection_failure(e):
+                self.record(node, None, failed=True)
+            raise
+        else:
+            self._observe(node, kind)
+            self.record(node, None)
+        finally:
+            node.in_flight -= 1
+
+    async def _attempt(self, node: _NodeState, fn: Callable[[Any], Awaitable[Any]], kind: str = 'script') -> Any:
+        await self._acquire(node, kind)
+        started = time.monotonic()
+        node.in_flight += 1
+        try:
+            async with self._client_factory(*node.endpoint) as client:
+                result = await fn(client)
+        except asyncio.CancelledError:
+            # A hedged loser: count the time it had already taken, so a slow
+            # node's EWMA still rises even though it never answered. It is kept
+            # out of the p95 window, which only holds completed calls.
+            self.record(node, time.monotonic() - started, sample=False)
+            raise
+        except BaseException as e:
+            self._observe(node, kind, e)
+            if is_connection_failure(e):
+                self.record(node, None, failed=True)
+            raise
+        finally:
+            node.in_flight -= 1
+        self._observe(node, kind)
+        self.record(node, time.monotonic() - started)
+        return result
+
+    async def call(self, fn: Callable[[Any], Awaitable[Any]], hedge: bool = False, kind: str = 'script') -> Any:
+        self.stats['calls'] += 1
+        tried: Tuple[Endpoint, ...] = ()
+        while True:
+            node = self.pick(tried)
+            tried += (node.endpoint,)
+            try:
+                if hedge:
+                    return await self._hedged(node, fn, tried, kind)
+                return await self._attempt(node, fn, kind)
+            except Exception as e:
+                if not (is_connection_failure(e) or is_throttled(e)) or len(tried) >= len(self._nodes):
+                    raise
+                self.stats['failovers'] += 1
+
+    async def _hedged(self, node: _NodeState, fn: Callable[[Any], Awaitable[Any]], tried: Tuple[Endpoint, ...], kind: str = 'script') -> Any:
+        delay = self.hedge_delay()
+        if delay is None:
+            return await self._attempt(node, fn, kind)
+        first = asyncio.ensure_future(self._attempt(node, fn, kind))
+        pending = {first}
+        try:
+            done, pending = await asyncio.wait(pending, timeout=delay)
+            if done:
+                return first.result()
+            backup_node = self.pick(tried)
+            if backup_node is node:
+                return await asyncio.shield(first)
+            self.stats['hedged'] += 1
+            backup = asyncio.ensure_future(self._attempt(backup_node, fn, kind))
+            pending = {first, backup}
+            error: Optional[BaseException] = None
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        if task is backup:
+                            self.stats['hedge_wins'] += 1
+                        return task.result()
+                    error = task.exception()
+            raise error
+        finally:
+            for task in pending:
+                task.cancel()
+
+    def metrics(self) -> Dict[str, Any]:
+        nodes = {
+            f'{host}:{port}': {'ewma_ms': round(n.ewma * 1000, 2), 'in_flight': n.in_flight, 'calls': n.calls, 'errors': n.errors, 'down': n.down_until > time.monotonic()}
+            for n in self._nodes for host, port in [n.endpoint]
+        }
+        p95 = self.percentile(0.95)
+        return {'nodes': nodes, 'p95_ms': round(p95 * 1000, 2) if p95 is not None else None, **self.stats}
@@ -0,0 +1,123 @@
+import json
+import os
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+DEFAULT_CHECK_INTERVAL = float(os.getenv('FLOW_ACCOUNT_DIRECTORY_CHECK_INTERVAL', '1'))
+
+
+class AccountRecord:
+    __slots__ = ('name', 'address', 'key_id', 'signature_algorithm', 'hash_algorithm', 'key_location')
+
+    def __init__(self, name: str, address: str, key_id: Optional[int], signature_algorithm: Optional[str], hash_algorithm: Optional[str], key_location: Optional[str]):
+        self.name = name
+        self.address = address
+        self.key_id = key_id
+        self.signature_algorithm = signature_algorithm
+        self.hash_algorithm = hash_algorithm
+        self.key_location = key_location
+
+    @classmethod
+    def from_config(cls, name: str, acc: Dict[str, Any]) -> Optional['AccountRecord']:
+        address = str(acc.get('address') or '').lower().replace('0x', '')
+        if not address:
+            return None
+        key = acc.get('key')
+        if not isinstance(key, dict):
+            key = {}
+        key_id = key.get('index') if isinstance(key.get('index'), int) else None
+        return cls(
+            name,
+            f'0x{address}',
+            key_id,
+            key.get('signatureAlgorithm') or None,
+            key.get('hashAlgorithm') or None,
+            key.get('location') if key.get('type') == 'file' else None
+        )
+
+
+class AccountDirectory:
+    """Index of the accounts in flow.json and flow/accounts/flow-production.json.
+
+    Both files are parsed once into records keyed by account name and by
+    address; earlier files win on duplicate names, matching the lookup order
+    the adapter always used. The files are re-read only when their mtime or
+    size changes (checked at most every ``check_interval`` seconds), since the
+    sync service rewrites flow-production.json in place.
+    """
+
+    def __init__(self, paths: List[str], check_interval: float = DEFAULT_CHECK_INTERVAL):
+        self.paths = list(paths)
+        self.check_interval = check_interval
+        self._by_name: Dict[str, AccountRecord] = {}
+        self._by_address: Dict[str, AccountRecord] = {}
+        self._signatures: List[Optional[Tuple[float, int]]] = []
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+        self.stats = {'loads': 0, 'load_errors': 0, 'lookups': 0}
+
+    def _file_signatures(self) -> List[Optional[Tuple[float, int]]]:
+        signatures = []
+        for path in self.paths:
+            try:
+                st = os.stat(path)
+                signatures.append((st.st_mtime, st.st_size))
+            except OSError:
+                signatures.append(None)
+        return signatures
+
+    def _refresh(self) -> None:
+        now = time.monotonic()
+        if self._signatures and now - self._checked_at < self.check_interval:
+            return
+        with self._lock:
+            if self._signatures and now - self._checked_at < self.check_interval:
+                return
+            signatures = self._file_signatures()
+            self._checked_at = now
+            if signatures == self._signatures:
+                return
+            by_name: Dict[str, AccountRecord] = {}
+            by_address: Dict[str, AccountRecord] = {}
+            for path, signature in zip(self.paths, signatures):
+                if signature is None:
+                    continue
+                try:
+                    with open(path) as f:
+                        accounts = json.load(f).get('accounts', {})
+                except (OSError, ValueError) as e:
+                    self.stats['load_errors'] += 1
+                    print(f'Failed to load accounts from {path}: {e}')
+                    if self._signatures:
+                        return
+                    continue
+                for name, acc in accounts.items():
+                    if name in by_name or not isinstance(acc, dict):
+                        continue
+                    record = AccountRecord.from_config(name, acc)
+                    if record is None:
+                        continue
+                    by_name[name] = record
+                    by_address.setdefault(record.address, record)
+            self._by_name = by_name
+            self._by_address = by_address
+            self._signatures = signatures
+            self.stats['loads'] += 1
+
+    def get(self, name: str) -> Optional[AccountRecord]:
+        self._refresh()
+        self.stats['lookups'] += 1
+        return self._by_name.get(name)
+
+    def find_by_address(self, address: str) -> Optional[AccountRecord]:
+        self._refresh()
+        self.stats['lookups'] += 1
+        return self._by_address.get(f"0x{address.lower().replace('0x', '')}")
+
+    def __len__(self) -> int:
+        self._refresh()
+        return len(self._by_name)
+
+    def metrics(self) -> Dict[str, Any]:
+        return {'accounts': len(self._by_name), **self.stats}
@@ -19,6 +19,7 @@ class FlowAdapter(Protocol):
         proposer_wallet_id: Optional[str] = None,
         payer_wallet_id: Optional[str] = None,
         authorizer_wallet_ids: Optional[List[str]] = None,
+        finality: str = "sealed",
     ) -> Dict[str, Any]:
         ...
 
@@ -32,6 +33,7 @@ class FlowAdapter(Protocol):
         proposer_wallet_id: Optional[str] = None,
         payer_wallet_id: Optional[str] = None,
         authorizer_wallet_ids: Optional[List[str]] = None,
+        finality: str = "sealed",
     ) -> Dict[str, Any]:
         ...
 
@@ -48,3 +50,48 @@ class FlowAdapter(Protocol):
         network: str = "mainnet",
     ) -> Dict[str, Any]:
         ...
+
+
+class AsyncFlowAdapter(Protocol):
+    async def aexecute_script(
+        self,
+        script_path: str,
+        args: Optional[List[Any]] = None,
+        network: str = "mainnet",
+    ) -> Dict[str, Any]:
+        ...
+
+    async def asend_transaction(
+        self,
+        transaction_path: str,
+        args: Optional[List[Any]] = None,
+        roles: Optional[Dict[str, Any]] = None,
+        network: str = "mainnet",
+        private_keys: Optional[Dict[str, str]] = None,
+        proposer_wallet_id: Optional[str] = None,
+        payer_wallet_id: Optional[str] = None,
+        authorizer_wallet_ids: Optional[List[str]] = None,
+        finality: str = "sealed",
+    ) -> Dict[str, Any]:
+        ...
+
+    async def aget_transaction(
+        self,
+        transaction_id: str,
+        network: str = "mainnet",
+    ) -> Dict[str, Any]:
+        ...
+
+    async def aget_account(
+        self,
+        address: str,
+        network: str = "mainnet",
+    ) -> Dict[str, Any]:
+        ...
+
+    async def agather_scripts(
+        self,
+        requests: List[Any],
+        max_concurrency: int = 16,
+    ) -> List[Dict[str, Any]]:
+        ...
@@ -0,0 +1,77 @@
+from decimal import Decimal
+from typing import Any, Callable, Dict
+
+from flow_py_sdk.cadence import (
+    Address, Array, Bool, Capability, Contract, Dictionary, Enum, Event, Fix64, InclusiveRange, Int, Int8,
+    Int16, Int32, Int64, Int128, Int256, Optional, Path, Resource, String, Struct, TypeValue, UFix64, UInt,
+    UInt8, UInt16, UInt32, UInt64, UInt128, UInt256, Void, Word8, Word16, Word32, Word64
+)
+
+FIXED_POINT_MODES = ('decimal', 'int', 'float')
+
+_INTEGER_TYPES = (Int, Int8, Int16, Int32, Int64, Int128, Int256, UInt, UInt8, UInt16, UInt32, UInt64, UInt128, UInt256, Word8, Word16, Word32, Word64)
+_COMPOSITE_TYPES = (Struct, Resource, Event, Contract, Enum)
+
+
+def _fixed_point_decoder(mode: str) -> Callable[[Any], Any]:
+    if mode == 'decimal':
+        return lambda v: Decimal(v.value).scaleb(-8)
+    if mode == 'int':
+        return lambda v: v.value
+    if mode == 'float':
+        return lambda v: v.value / 100_000_000
+    raise ValueError(f'Invalid fixed_point mode: {mode} (expected one of {", ".join(FIXED_POINT_MODES)})')
+
+
+def _build_table(mode: str) -> Dict[type, Callable[[Any], Any]]:
+    table: Dict[type, Callable[[Any], Any]] = {}
+
+    def decode(v: Any) -> Any:
+        fn = table.get(type(v))
+        return fn(v) if fn is not None else v
+
+    def composite(v: Any) -> Dict[str, Any]:
+        return {name: decode(field) for name, field in v.fields.items()}
+
+    def optional(v: Any) -> Any:
+        return None if v.value is None else decode(v.value)
+
+    fixed_point = _fixed_point_decoder(mode)
+    value = lambda v: v.value
+    table.update({t: value for t in _INTEGER_TYPES})
+    table.update({t: composite for t in _COMPOSITE_TYPES})
+    table.update({
+        UFix64: fixed_point,
+        Fix64: fixed_point,
+        String: value,
+        Bool: value,
+        Void: lambda v: None,
+        Address: lambda v: v.hex_with_prefix(),
+        Optional: optional,
+        Array: lambda v: [decode(x) for x in v.value],
+        Dictionary: lambda v: {decode(kv.key): decode(kv.value) for kv in v.value},
+        Path: lambda v: f'/{v.domain}/{v.identifier}',
+        TypeValue: lambda v: str(v.type_) if v.type_ is not None else None,
+        Capability: lambda v: {'id': v.id_, 'address': v.address.hex_with_prefix(), 'borrow_type': str(v.borrow_type)},
+        InclusiveRange: lambda v: {'start': decode(v.start), 'end': decode(v.end), 'step': decode(v.step)},
+    })
+    table[None] = decode
+    return table
+
+
+_TABLES = {mode: _build_table(mode) for mode in FIXED_POINT_MODES}
+
+
+def decode_cadence(value: Any, fixed_point: str = 'decimal') -> Any:
+    """Convert an SDK cadence Value into plain Python values, recursively.
+
+    Composites (structs, resources, events, contracts, enums) become dicts of
+    their fields, Optionals become the inner value or None and Addresses become
+    '0x'-prefixed hex. UFix64/Fix64 become exact ``Decimal`` by default, or the
+    raw 1e-8 fixed-point int with ``fixed_point='int'``, or float with
+    ``fixed_point='float'``. Anything unknown is returned unchanged.
+    """
+    table = _TABLES.get(fixed_point)
+    if table is None:
+        _fixed_point_decoder(fixed_point)
+    return table[None](value)
@@ -0,0 +1,283 @@
+import hashlib
+import json
+import os
+import re
+import threading
+from decimal import Decimal, InvalidOperation
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from flow_py_sdk.cadence import (
+    Address, Array, Bool, Dictionary, Fix64, Int, Int8, Int16, Int32, Int64, Int128, Int256,
+    KeyValuePair, Optional as OptionalValue, String, UFix64, UInt, UInt8, UInt16, UInt32, UInt64,
+    UInt128, UInt256, Value, Word8, Word16, Word32, Word64
+)
+
+FIXED_POINT_SCALE = Decimal(100_000_000)
+
+_COMMENT_RE = re.compile(r'//[^\n]*|/\*.*?\*/', re.DOTALL)
+_STRING_IMPORT_RE = re.compile(r'^(\s*)import\s+"(\w+)"', re.MULTILINE)
+_TRANSACTION_RE = re.compile(r'\btransaction\s*(\(([^)]*)\))?\s*\{')
+_SCRIPT_RE = re.compile(r'\bfun\s+main\s*\(([^)]*)\)')
+_CONTRACT_RE = re.compile(r'\bcontract\s+(interface\s+)?\w+')
+
+Encoder = Callable[[Any], Value]
+
+
+def _split_top_level(text: str, sep: str) -> List[str]:
+    parts, depth, current = [], 0, []
+    for ch in text:
+        if ch in '[{(<':
+            depth += 1
+        elif ch in ']})>':
+            depth -= 1
+        if ch == sep and depth == 0:
+            parts.append(''.join(current))
+            current = []
+        else:
+            current.append(ch)
+    if ''.join(current).strip():
+        parts.append(''.join(current))
+    return [p.strip() for p in parts if p.strip()]
+
+
+def _integer(cls: type) -> Encoder:
+    def encode(value: Any) -> Value:
+        if isinstance(value, bool) or (isinstance(value, float) and not value.is_integer()):
+            raise ValueError(f'Expected an integer for {cls.__name__}, got {value!r}')
+        return cls(int(value))
+    return encode
+
+
+def _fixed_point(cls: type, signed: bool) -> Encoder:
+    def encode(value: Any) -> Value:
+        try:
+            scaled = (value if isinstance(value, Decimal) else Decimal(str(value))) * FIXED_POINT_SCALE
+        except InvalidOperation:
+            raise ValueError(f'Invalid {cls.__name__} value: {value!r}')
+        if scaled != scaled.to_integral_value():
+            raise ValueError(f'{value!r} has more than 8 decimal places')
+        if not signed and scaled < 0:
+            raise ValueError(f'{cls.__name__} cannot be negative: {value!r}')
+        return cls(int(scaled))
+    return encode
+
+
+def _address(value: Any) -> Value:
+    text = str(value).lower()
+    text = text[2:] if text.startswith('0x') else text
+    if not text or len(text) > 16 or any(c not in '0123456789abcdef' for c in text):
+        raise ValueError(f'Invalid Address: {value!r}')
+    return Address.from_hex(f'0x{text.zfill(16)}')
+
+
+def _bool(value: Any) -> Value:
+    if isinstance(value, str) and value.lower() in ('true', 'false'):
+        return Bool(value.lower() == 'true')
+    if not isinstance(value, bool):
+        raise ValueError(f'Expected a Bool, got {value!r}')
+    return Bool(value)
+
+
+SIMPLE_ENCODERS: Dict[str, Encoder] = {
+    'Address': _address,
+    'String': lambda v: String(str(v)),
+    'Bool': _bool,
+    'UFix64': _fixed_point(UFix64, signed=False),
+    'Fix64': _fixed_point(Fix64, signed=True),
+    **{cls.__name__: _integer(cls) for cls in (Int, Int8, Int16, Int32, Int64, Int128, Int256, UInt, UInt8, UInt16, UInt32, UInt64, UInt128, UInt256, Word8, Word16, Word32, Word64)},
+}
+
+
+def compile_encoder(type_str: str, fallback: Optional[Encoder] = None) -> Encoder:
+    t = type_str.strip()
+    if t.endswith('?'):
+        inner = compile_encoder(t[:-1], fallback)
+        return lambda v: v if isinstance(v, Value) else OptionalValue(None if v is None else inner(v))
+    if t.startswith('[') and t.endswith(']'):
+        inner = compile_encoder(t[1:-1].split(';')[0], fallback)
+        return lambda v: v if isinstance(v, Value) else Array([inner(x) for x in v])
+    if t.startswith('{') and t.endswith('}'):
+        key_type, value_type = _split_top_level(t[1:-1], ':')
+        encode_key = compile_encoder(key_type, fallback)
+        encode_value = compile_encoder(value_type, fallback)
+        return lambda v: v if isinstance(v, Value) else Dictionary([KeyValuePair(encode_key(k), encode_value(x)) for k, x in v.items()])
+    simple = SIMPLE_ENCODERS.get(t)
+    if simple is not None:
+        return lambda v: v if isinstance(v, Value) else simple(v)
+    if fallback is not None:
+        return fallback
+
+    def unsupported(v: Any) -> Value:
+        if isinstance(v, Value):
+            return v
+        raise TypeError(f'No encoder for Cadence type {t}; pass a cadence Value')
+    return unsupported
+
+
+class CadenceParam:
+    __slots__ = ('name', 'type', 'encode')
+
+    def __init__(self, name: str, type_str: str, encode: Encoder):
+        self.name = name
+        self.type = type_str
+        self.encode = encode
+
+
+class CadenceTemplate:
+    """One .cdc file: source, content hash, parameter schema and per-network code."""
+
+    __slots__ = ('path', 'source', 'content_hash', 'kind', 'params', 'imports', '_code')
+
+    def __init__(self, path: str, source: str, fallback: Optional[Encoder] = None):
+        self.path = path
+        self.source = source
+        self.content_hash = hashlib.sha256(source.encode()).hexdigest()
+        self.imports = [m.group(2) for m in _STRING_IMPORT_RE.finditer(source)]
+        self.kind, self.params = _parse_signature(source, fallback)
+        self._code: Dict[str, str] = {}
+
+    def code(self, network: str, aliases: Dict[str, str]) -> str:
+        code = self._code.get(network)
+        if code is None:
+            missing = [name for name in self.imports if name not in aliases]
+            if missing:
+                raise ValueError(f'No {network} address for contract(s) {", ".join(missing)} imported by {os.path.basename(self.path)}')
+            code = _STRING_IMPORT_RE.sub(lambda m: f'{m.group(1)}import {m.group(2)} from 0x{aliases[m.group(2)]}', self.source)
+            self._code[network] = code
+        return code
+
+    def encode(self, args: List[Any]) -> List[Value]:
+        if self.params is None:
+            raise ValueError(f'{os.path.basename(self.path)} has no parameter schema')
+        if len(args) != len(self.params):
+            expected = ', '.join(f'{p.name}: {p.type}' for p in self.params)
+            raise ValueError(f'{os.path.basename(self.path)} expects {len(self.params)} argument(s) ({expected}), got {len(args)}')
+        values = []
+        for param, arg in zip(self.params, args):
+            try:
+                values.append(param.encode(arg))
+            except (TypeError, ValueError) as e:
+                raise ValueError(f'Argument {param.name}: {param.type} of {os.path.basename(self.path)}: {e}')
+        return values
+
+
+def _parse_params(text: str, fallback: Optional[Encoder]) -> List[CadenceParam]:
+    params = []
+    for part in _split_top_level(text, ','):
+        name, _, type_str = part.partition(':')
+        type_str = type_str.strip()
+        params.append(CadenceParam(name.strip().split()[-1], type_str, compile_encoder(type_str, fallback)))
+    return params
+
+
+def _parse_signature(source: str, fallback: Optional[Encoder]) -> Tuple[str, Optional[List[CadenceParam]]]:
+    stripped = _COMMENT_RE.sub('', source)
+    tx = _TRANSACTION_RE.search(stripped)
+    if tx is not None:
+        return 'transaction', _parse_params(tx.group(2) or '', fallback)
+    script = _SCRIPT_RE.search(stripped)
+    if script is not None:
+        return 'script', _parse_params(script.group(1), fallback)
+    if _CONTRACT_RE.search(stripped):
+        return 'contract', None
+    return 'unknown', None
+
+
+def load_contract_aliases(flow_json_path: str) -> Dict[str, Dict[str, str]]:
+    with open(flow_json_path) as f:
+        cfg = json.load(f)
+    aliases: Dict[str, Dict[str, str]] = {}
+    for section in ('dependencies', 'contracts'):
+        for name, spec in (cfg.get(section) or {}).items():
+            if isinstance(spec, dict):
+                for network, address in (spec.get('aliases') or {}).items():
+                    aliases.setdefault(network, {})[name] = str(address).replace('0x', '')
+    accounts = cfg.get('accounts') or {}
+    for network, deployments in (cfg.get('deployments') or {}).items():
+        for account_name, contracts in (deployments or {}).items():
+            address = str((accounts.get(account_name) or {}).get('address') or '').replace('0x', '')
+            if not address:
+                continue
+            for contract in contracts or []:
+                name = contract.get('name') if isinstance(contract, dict) else contract
+                aliases.setdefault(network, {}).setdefault(name, address)
+    return aliases
+
+
+class CadenceRegistry:
+    """Preloaded .cdc templates under flow/cadence with typed argument schemas.
+
+    String imports (``import "BaitCoin"``) are rewritten per network from the
+    flow.json contract aliases and deployments; the rewritten code is cached per
+    template. Each template is keyed by absolute path and content hash, so
+    ``reload`` only re-parses files whose contents actually changed.
+    """
+
+    def __init__(self, flow_dir: str, fallback: Optional[Encoder] = None):
+        self.flow_dir = flow_dir
+        self.fallback = fallback
+        self._templates: Dict[str, CadenceTemplate] = {}
+        self._aliases: Optional[Dict[str, Dict[str, str]]] = None
+        self._lock = threading.Lock()
+        self.stats = {'templates': 0, 'loads': 0, 'parses': 0, 'hits': 0}
+
+    def _abspath(self, path: str) -> str:
+        return os.path.normpath(path if os.path.isabs(path) else os.path.join(self.flow_dir, path))
+
+    def preload(self, subdir: str = 'cadence') -> int:
+        root = os.path.join(self.flow_dir, subdir)
+        count = 0
+        for dirpath, _, filenames in os.walk(root):
+            for filename in filenames:
+                if not filename.endswith('.cdc'):
+                    continue
+                try:
+                    self._load(os.path.join(dirpath, filename))
+                    count += 1
+                except (OSError, ValueError) as e:
+                    print(f'Failed to load Cadence template {filename}: {e}')
+        return count
+
+    def aliases(self, network: str) -> Dict[str, str]:
+        if self._aliases is None:
+            flow_json = os.path.join(self.flow_dir, 'flow.json')
+            self._aliases = load_contract_aliases(flow_json) if os.path.exists(flow_json) else {}
+        return self._aliases.get(network, {})
+
+    def _load(self, full: str) -> CadenceTemplate:
+        with open(full, 'r') as f:
+            source = f.read()
+        content_hash = hashlib.sha256(source.encode()).hexdigest()
+        with self._lock:
+            template = self._templates.get(full)
+            if template is None or template.content_hash != content_hash:
+                template = CadenceTemplate(full, source, self.fallback)
+                self._templates[full] = template
+                self.stats['parses'] += 1
+            self.stats['loads'] += 1
+            self.stats['templates'] = len(self._templates)
+        return template
+
+    def get(self, path: str) -> CadenceTemplate:
+        full = self._abspath(path)
+        template = self._templates.get(full)
+        if template is not None:
+            self.stats['hits'] += 1
+            return template
+        return self._load(full)
+
+    def peek(self, path: str) -> Optional[CadenceTemplate]:
+        return self._templates.get(self._abspath(path))
+
+    def code(self, path: str, network: str) -> str:
+        return self.get(path).code(network, self.aliases(network))
+
+    def reload(self) -> None:
+        with self._lock:
+            self._aliases = None
+            for template in self._templates.values():
+                template._code.clear()
+        self.preload()
+
+    def metrics(self) -> Dict[str, Any]:
+        return dict(self.stats)
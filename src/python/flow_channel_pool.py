@@ -0,0 +1,171 @@
+import asyncio
+import os
+import threading
+import time
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+
+from grpclib.client import Channel
+from grpclib.config import Configuration
+from grpclib.const import Status
+from grpclib.exceptions import GRPCError, StreamTerminatedError
+from flow_py_sdk.client.client import AccessAPI
+
+DEFAULT_POOL_SIZE = int(os.getenv('FLOW_CHANNEL_POOL_SIZE', '2'))
+DEFAULT_KEEPALIVE_TIME = float(os.getenv('FLOW_GRPC_KEEPALIVE_TIME', '120'))
+DEFAULT_KEEPALIVE_TIMEOUT = float(os.getenv('FLOW_GRPC_KEEPALIVE_TIMEOUT', '20'))
+HEALTH_CHECK_TIMEOUT = 5.0
+
+_TRANSPORT_ERRORS = (ConnectionError, OSError, StreamTerminatedError)
+_CONNECTION_ERRORS = _TRANSPORT_ERRORS + (asyncio.TimeoutError,)
+
+
+def is_connection_failure(exc: BaseException) -> bool:
+    if isinstance(exc, GRPCError):
+        return exc.status in (Status.UNAVAILABLE, Status.DEADLINE_EXCEEDED)
+    return isinstance(exc, _CONNECTION_ERRORS)
+
+
+def is_transport_failure(exc: BaseException) -> bool:
+    """The connection itself broke, as opposed to one RPC failing or timing out on a healthy channel."""
+    if isinstance(exc, (GRPCError, asyncio.TimeoutError)):
+        return False
+    return isinstance(exc, _TRANSPORT_ERRORS)
+
+
+class _PooledChannel:
+    __slots__ = ('channel', 'client', 'loop', 'created_at', 'last_used', 'in_use')
+
+    def __init__(self, channel: Channel, loop: asyncio.AbstractEventLoop):
+        self.channel = channel
+        self.client = AccessAPI(channel=channel)
+        self.loop = loop
+        self.created_at = time.time()
+        self.last_used = self.created_at
+        self.in_use = 0
+
+    def close(self) -> None:
+        try:
+            self.channel.close()
+        except Exception:
+            pass
+
+
+class FlowChannelPool:
+    """Long-lived gRPC channels to Flow access nodes, shared by every adapter call.
+
+    Channels are bound to the event loop that created them; a channel whose loop
+    is gone is dropped and replaced on the next borrow.
+    """
+
+    def __init__(self, size: Optional[int] = None, keepalive_time: Optional[float] = None, keepalive_timeout: Optional[float] = None):
+        self.size = max(1, size or DEFAULT_POOL_SIZE)
+        self._config = Configuration(
+            _keepalive_time=keepalive_time if keepalive_time is not None else DEFAULT_KEEPALIVE_TIME,
+            _keepalive_timeout=keepalive_timeout if keepalive_timeout is not None else DEFAULT_KEEPALIVE_TIMEOUT,
+            _keepalive_permit_without_calls=True,
+            _http2_max_pings_without_data=0,
+        )
+        self._channels: Dict[Tuple[str, int], List[_PooledChannel]] = {}
+        self._lock = threading.Lock()
+        self.stats = {'created': 0, 'borrowed': 0, 'reconnects': 0, 'health_checks': 0, 'unhealthy': 0}
+
+    def _new_entry(self, host: str, port: int, loop: asyncio.AbstractEventLoop) -> _PooledChannel:
+        channel = Channel(host=host, port=port, config=self._config)
+        self.stats['created'] += 1
+        return _PooledChannel(channel, loop)
+
+    def _borrow(self, host: str, port: int) -> _PooledChannel:
+        loop = asyncio.get_running_loop()
+        key = (host, port)
+        with self._lock:
+            entries = self._channels.setdefault(key, [])
+            stale = [e for e in entries if e.loop is not loop or e.loop.is_closed()]
+            for e in stale:
+                entries.remove(e)
+                if not e.loop.is_closed() and e.loop is not loop:
+                    e.loop.call_soon_threadsafe(e.close)
+            entry = min(entries, key=lambda e: e.in_use) if entries else None
+            if entry is None or (entry.in_use > 0 and len(entries) < self.size):
+                entry = self._new_entry(host, port, loop)
+                entries.append(entry)
+            entry.in_use += 1
+            entry.last_used = time.time()
+            self.stats['borrowed'] += 1
+            return entry
+
+    def _discard(self, host: str, port: int, entry: _PooledChannel) -> None:
+        with self._lock:
+            entries = self._channels.get((host, port), [])
+            if entry in entries:
+                entries.remove(entry)
+                self.stats['reconnects'] += 1
+        entry.close()
+
+    @asynccontextmanager
+    async def client(self, host: str, port: int) -> AsyncIterator[AccessAPI]:
+        entry = self._borrow(host, port)
+        try:
+            yield entry.client
+        except BaseException as e:
+            # A gRPC status (UNAVAILABLE from an overloaded node, DEADLINE_EXCEEDED on a
+            # slow script) arrived over a working connection; keep the channel for reuse.
+            if is_transport_failure(e):
+                self._discard(host, port, entry)
+            raise
+        finally:
+            entry.in_use -= 1
+            entry.last_used = time.time()
+
+    async def health_check(self) -> Dict[str, Any]:
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            targets = [(key, e) for key, entries in self._channels.items() for e in entries if e.loop is loop and e.in_use == 0]
+        unhealthy = 0
+        for (host, port), entry in targets:
+            self.stats['health_checks'] += 1
+            try:
+                await asyncio.wait_for(entry.client.ping(), timeout=HEALTH_CHECK_TIMEOUT)
+            except Exception:
+                unhealthy += 1
+                self.stats['unhealthy'] += 1
+                self._discard(host, port, entry)
+        return {'checked': len(targets), 'unhealthy': unhealthy}
+
+    def release_loop(self, loop: asyncio.AbstractEventLoop) -> None:
+        with self._lock:
+            closing = []
+            for entries in self._channels.values():
+                for e in [e for e in entries if e.loop is loop]:
+                    entries.remove(e)
+                    closing.append(e)
+        for e in closing:
+            e.close()
+
+    def close(self) -> None:
+        with self._lock:
+            closing = [e for entries in self._channels.values() for e in entries]
+            self._channels.clear()
+        for e in closing:
+            if e.loop.is_closed():
+                continue
+            try:
+                if e.loop.is_running() and e.loop is not _running_loop():
+                    e.loop.call_soon_threadsafe(e.close)
+                else:
+                    e.close()
+            except RuntimeError:
+                pass
+
+    def metrics(self) -> Dict[str, Any]:
+        with self._lock:
+            open_channels = {f'{h}:{p}': len(entries) for (h, p), entries in self._channels.items()}
+            in_use = sum(e.in_use for entries in self._channels.values() for e in entries)
+        return {'size': self.size, 'open_channels': open_channels, 'in_use': in_use, **self.stats}
+
+
+def _running_loop() -> Optional[asyncio.AbstractEventLoop]:
+    try:
+        return asyncio.get_running_loop()
+    except RuntimeError:
+        return None
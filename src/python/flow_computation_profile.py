@@ -0,0 +1,150 @@
+import math
+import os
+import threading
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional
+
+MAX_GAS_LIMIT = 9999
+DEFAULT_GAS_LIMIT = int(os.getenv('FLOW_DEFAULT_GAS_LIMIT', str(MAX_GAS_LIMIT)))
+GAS_LIMIT_HEADROOM = float(os.getenv('FLOW_GAS_LIMIT_HEADROOM', '1.5'))
+GAS_LIMIT_MIN_SAMPLES = int(os.getenv('FLOW_GAS_LIMIT_MIN_SAMPLES', '20'))
+GAS_LIMIT_FLOOR = int(os.getenv('FLOW_GAS_LIMIT_FLOOR', '100'))
+GAS_LIMIT_MAX_SPREAD = float(os.getenv('FLOW_GAS_LIMIT_MAX_SPREAD', '4'))
+PROFILE_WINDOW = int(os.getenv('FLOW_COMPUTATION_PROFILE_WINDOW', '500'))
+
+FEES_DEDUCTED_EVENT = '.FlowFees.FeesDeducted'
+
+
+def execution_effort(events: Optional[List[Any]]) -> Optional[int]:
+    """Computation used by a sealed transaction, read from its FlowFees.FeesDeducted event.
+
+    Transaction results carry no computation field; the fee event reports it
+    as ``executionEffort``, a UFix64 whose raw value is the computation units.
+    """
+    for ev in events or []:
+        if not str(getattr(ev, 'type', '')).endswith(FEES_DEDUCTED_EVENT):
+            continue
+        fields = getattr(getattr(ev, 'value', None), 'fields', None) or {}
+        effort = fields.get('executionEffort')
+        if effort is not None and hasattr(effort, 'value'):
+            return int(effort.value)
+    return None
+
+
+def is_computation_limit_error(error_message: Optional[str]) -> bool:
+    message = (error_message or '').lower()
+    return '[error code: 1110]' in message or 'computation exceeds limit' in message
+
+
+def _percentile(ordered: List[int], q: float) -> int:
+    rank = max(1, math.ceil(q / 100 * len(ordered)))
+    return ordered[min(rank, len(ordered)) - 1]
+
+
+class _TemplateProfile:
+    __slots__ = ('content_hash', 'samples', 'recorded', 'limit_exceeded', 'resets', 'floor')
+
+    def __init__(self, content_hash: Optional[str], window: int):
+        self.content_hash = content_hash
+        self.samples: Deque[int] = deque(maxlen=window)
+        self.recorded = 0
+        self.limit_exceeded = 0
+        self.resets = 0
+        self.floor = 0
+
+
+class ComputationProfile:
+    """Rolling window of computation used per transaction template.
+
+    Once a template has ``min_samples`` sealed results its gas limit becomes
+    p99 * ``headroom`` (between ``floor`` and the network maximum); until then,
+    and after its source changes or it hits the computation limit, it gets
+    ``default_limit``. Templates whose max exceeds ``max_spread`` times their
+    median depend too much on state to predict and keep ``default_limit``, and
+    a template that ran out at a derived limit never gets one that low again.
+    """
+
+    def __init__(self, window: int = PROFILE_WINDOW, min_samples: int = GAS_LIMIT_MIN_SAMPLES, headroom: float = GAS_LIMIT_HEADROOM, floor: int = GAS_LIMIT_FLOOR, default_limit: int = DEFAULT_GAS_LIMIT, max_spread: float = GAS_LIMIT_MAX_SPREAD):
+        self.window = max(1, window)
+        self.min_samples = max(1, min_samples)
+        self.headroom = max(1.0, headroom)
+        self.floor = max(1, floor)
+        self.max_spread = max(1.0, max_spread)
+        self.default_limit = min(MAX_GAS_LIMIT, max(self.floor, default_limit))
+        self._profiles: Dict[str, _TemplateProfile] = {}
+        self._lock = threading.Lock()
+
+    def _profile(self, template: str, content_hash: Optional[str]) -> _TemplateProfile:
+        profile = self._profiles.get(template)
+        if profile is None:
+            profile = self._profiles[template] = _TemplateProfile(content_hash, self.window)
+        elif content_hash is not None and profile.content_hash != content_hash:
+            # Edited source: old measurements no longer describe the transaction.
+            profile.samples.clear()
+            profile.content_hash = content_hash
+            profile.resets += 1
+            profile.floor = 0
+        return profile
+
+    def record(self, template: str, computation: int, content_hash: Optional[str] = None) -> None:
+        with self._lock:
+            profile = self._profile(template, content_hash)
+            profile.samples.append(int(computation))
+            profile.recorded += 1
+
+    def record_limit_exceeded(self, template: str, content_hash: Optional[str] = None, gas_limit: Optional[int] = None) -> None:
+        """A derived limit proved too low: fall back to the default until the window refills.
+
+        Later derived limits stay above ``gas_limit``, the limit that ran out
+        (by default the one this profile was handing out).
+        """
+        with self._lock:
+            profile = self._profile(template, content_hash)
+            if gas_limit is None:
+                gas_limit = self._limit(sorted(profile.samples), profile.floor)
+            profile.samples.clear()
+            profile.limit_exceeded += 1
+            profile.floor = min(MAX_GAS_LIMIT, max(profile.floor, math.ceil(gas_limit * self.headroom)))
+
+    def percentile(self, template: str, q: float) -> Optional[int]:
+        with self._lock:
+            profile = self._profiles.get(template)
+            ordered = sorted(profile.samples) if profile is not None else []
+        return _percentile(ordered, q) if ordered else None
+
+    def _limit(self, ordered: List[int], floor: int = 0) -> int:
+        if len(ordered) < self.min_samples or ordered[-1] > self.max_spread * max(1, _percentile(ordered, 50)):
+            return self.default_limit
+        return min(MAX_GAS_LIMIT, max(self.floor, floor, math.ceil(_percentile(ordered, 99) * self.headroom)))
+
+    def gas_limit(self, template: str, content_hash: Optional[str] = None) -> int:
+        with self._lock:
+            profile = self._profiles.get(template)
+            if profile is None or (content_hash is not None and profile.content_hash != content_hash):
+                return self.default_limit
+            ordered, floor = sorted(profile.samples), profile.floor
+        return self._limit(ordered, floor)
+
+    def metrics(self) -> Dict[str, Any]:
+        with self._lock:
+            snapshot = {name: (sorted(p.samples), p.recorded, p.limit_exceeded, p.resets, p.floor) for name, p in self._profiles.items()}
+        templates = {}
+        for name, (ordered, recorded, limit_exceeded, resets, floor) in snapshot.items():
+            entry = {'samples': len(ordered), 'recorded': recorded, 'limit_exceeded': limit_exceeded, 'resets': resets, 'floor': floor, 'gas_limit': self._limit(ordered, floor)}
+            if ordered:
+                entry.update({
+                    'min': ordered[0],
+                    'p50': _percentile(ordered, 50),
+                    'p95': _percentile(ordered, 95),
+                    'p99': _percentile(ordered, 99),
+                    'max': ordered[-1]
+                })
+            templates[name] = entry
+        return {
+            'default_gas_limit': self.default_limit,
+            'headroom': self.headroom,
+            'min_samples': self.min_samples,
+            'max_spread': self.max_spread,
+            'window': self.window,
+            'templates': templates
+        }
@@ -0,0 +1,96 @@
+import asyncio
+import threading
+from concurrent.futures import Future
+from typing import Any, Awaitable, Callable, List, Optional
+
+
+class FlowEventLoopThread:
+    """A single asyncio loop running in a daemon thread, shared by every caller of the adapter."""
+
+    def __init__(self, name: str = 'flow-adapter-loop'):
+        self.name = name
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._ready = threading.Event()
+        self._lock = threading.Lock()
+        self._periodic: List[tuple] = []
+        self._tasks: List[asyncio.Task] = []
+        self._scheduling: Optional[asyncio.AbstractEventLoop] = None
+
+    @property
+    def loop(self) -> asyncio.AbstractEventLoop:
+        self.start()
+        return self._loop
+
+    def is_running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def in_loop_thread(self) -> bool:
+        return self._thread is not None and threading.current_thread() is self._thread
+
+    def start(self) -> None:
+        with self._lock:
+            if not self.is_running():
+                self._ready.clear()
+                self._thread = threading.Thread(target=self._main, name=self.name, daemon=True)
+                self._thread.start()
+        # Callers that find the thread already started still wait for its loop.
+        self._ready.wait()
+
+    def _main(self) -> None:
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        self._loop = loop
+        with self._lock:
+            # From here on every() schedules new jobs on this loop itself.
+            self._scheduling = loop
+            periodic = list(self._periodic)
+        for interval, fn in periodic:
+            self._tasks.append(loop.create_task(self._repeat(interval, fn)))
+        loop.call_soon(self._ready.set)
+        try:
+            loop.run_forever()
+        finally:
+            for task in asyncio.all_tasks(loop):
+                task.cancel()
+            loop.run_until_complete(asyncio.gather(*asyncio.all_tasks(loop), return_exceptions=True))
+            loop.close()
+
+    async def _repeat(self, interval: float, fn: Callable[[], Awaitable[Any]]) -> None:
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await fn()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f'Background task {getattr(fn, "__name__", fn)} failed: {e}')
+
+    def every(self, interval: float, fn: Callable[[], Awaitable[Any]]) -> None:
+        with self._lock:
+            self._periodic.append((interval, fn))
+            loop = self._scheduling
+        if loop is not None:
+            loop.call_soon_threadsafe(lambda: self._tasks.append(loop.create_task(self._repeat(interval, fn))))
+
+    def submit(self, coro: Awaitable[Any]) -> Future:
+        return asyncio.run_coroutine_threadsafe(coro, self.loop)
+
+    def run(self, coro: Awaitable[Any], timeout: Optional[float] = None) -> Any:
+        if self.in_loop_thread():
+            if hasattr(coro, 'close'):
+                coro.close()
+            raise RuntimeError('Blocking adapter call made from the adapter event loop; await the coroutine instead')
+        return self.submit(coro).result(timeout)
+
+    def stop(self) -> None:
+        with self._lock:
+            thread = self._thread
+            loop = self._loop
+            self._thread = None
+            self._scheduling = None
+        if thread is None or loop is None:
+            return
+        loop.call_soon_threadsafe(loop.stop)
+        if threading.current_thread() is not thread:
+            thread.join(timeout=5)
@@ -0,0 +1,88 @@
+import os
+from decimal import Decimal
+from typing import Any, Callable, Dict, List, Optional
+
+ROLES = ('proposer', 'payer', 'authorizer')
+CONTRACT_SUBJECT = 'contract'
+
+
+class PreflightCheck:
+    """A transaction precondition answered by one composite query read.
+
+    ``subject`` names whose state is read: a role ('proposer', 'payer',
+    'authorizer' = first authorizer), 'contract' (the BaitCoin account) or a
+    transaction parameter holding an address. Without ``amount`` the read must
+    be truthy; with it, the read is a balance that must cover the value of that
+    transaction parameter.
+    """
+
+    __slots__ = ('read', 'subject', 'amount', 'message')
+
+    def __init__(self, read: str, subject: str, message: str, amount: Optional[str] = None):
+        self.read = read
+        self.subject = subject
+        self.amount = amount
+        self.message = message
+
+
+PREFLIGHT_CHECKS: Dict[str, List[PreflightCheck]] = {
+    'sendBait.cdc': [
+        PreflightCheck('bait_vault_balance', 'authorizer', 'Sender BAIT balance', amount='amount'),
+        PreflightCheck('bait_receiver', 'to', 'Recipient has no BAIT receiver capability'),
+    ],
+    'adminMintBait.cdc': [
+        PreflightCheck('bait_admin', 'authorizer', 'Signer has no BaitCoin admin resource'),
+        PreflightCheck('bait_receiver', 'to', 'Recipient has no BAIT receiver capability'),
+    ],
+    'adminBurnBait.cdc': [
+        PreflightCheck('bait_admin', 'authorizer', 'Signer has no BaitCoin admin resource'),
+        PreflightCheck('bait_vault_balance', 'authorizer', 'Admin BAIT balance', amount='amount'),
+    ],
+    'swapBaitForFusd.cdc': [
+        PreflightCheck('bait_vault_balance', 'authorizer', 'Sender BAIT balance', amount='baitAmount'),
+        PreflightCheck('usdf_receiver', 'authorizer', 'Sender has no USDF receiver capability'),
+        PreflightCheck('contract_usdf_reserve', CONTRACT_SUBJECT, 'Contract USDF reserve', amount='baitAmount'),
+    ],
+    'swapFusdForBait.cdc': [
+        PreflightCheck('usdf_vault_balance', 'authorizer', 'Sender USDF balance', amount='fusdAmount'),
+        PreflightCheck('bait_receiver', 'authorizer', 'Sender has no BAIT receiver capability'),
+    ],
+    'withdrawContractUsdf.cdc': [
+        PreflightCheck('contract_usdf_reserve', CONTRACT_SUBJECT, 'Contract USDF reserve', amount='amount'),
+        PreflightCheck('usdf_receiver', 'authorizer', 'Signer has no USDF receiver capability'),
+    ],
+}
+
+
+def checks_for(transaction_path: str) -> List[PreflightCheck]:
+    return PREFLIGHT_CHECKS.get(os.path.basename(transaction_path), [])
+
+
+def bind_checks(checks: List[PreflightCheck], params: List[str], args: List[Any], resolve_subject: Callable[[str], str]) -> List[Dict[str, Any]]:
+    """Pair each check with the address it reads and the amount it needs."""
+    values = dict(zip(params, args))
+    bound = []
+    for i, check in enumerate(checks):
+        subject = check.subject
+        address = resolve_subject(subject) if subject in ROLES or subject == CONTRACT_SUBJECT else values[subject]
+        required = Decimal(str(values[check.amount])) if check.amount is not None else None
+        bound.append({'name': f'{check.read}_{i}', 'check': check, 'address': address, 'required': required})
+    return bound
+
+
+def evaluate(bound: List[Dict[str, Any]], facts: Dict[str, Any]) -> List[Dict[str, Any]]:
+    failures = []
+    for b in bound:
+        check, value, required = b['check'], facts.get(b['name']), b['required']
+        if required is None:
+            if value:
+                continue
+            reason, message = 'missing', check.message
+        elif value is None:
+            reason, message = 'missing', f'{check.message}: no vault at {b["address"]}'
+        elif Decimal(value) < required:
+            reason, message = 'insufficient', f'{check.message} {value} is less than {required}'
+        else:
+            continue
+        failures.append({'check': check.read, 'address': b['address'], 'reason': reason, 'message': message, 'value': value, 'required': required})
+    return failures
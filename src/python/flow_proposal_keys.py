@@ -0,0 +1,188 @@
+import asyncio
+import os
+import time
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+
+FULL_KEY_WEIGHT = 1000
+DISCOVERY_RETRY_BASE = 1.0
+DISCOVERY_RETRY_MAX = 60.0
+
+
+def parse_key_indices(value: Optional[str]) -> List[int]:
+    """Key indices from a list like '1,2,5' or ranges like '1-8,12'."""
+    if not value:
+        return []
+    indices = set()
+    for part in value.split(','):
+        part = part.strip()
+        if not part:
+            continue
+        first, _, last = part.partition('-')
+        indices.update(range(int(first), int(last or first) + 1))
+    return sorted(indices)
+
+
+def proposal_key_ranges() -> Tuple[List[int], List[int]]:
+    """This process's proposal keys and the keys reserved for other processes.
+
+    Every process keeps its own sequence numbers, so two processes proposing
+    on the same service key invalidate each other's transactions. Each one
+    sets FLOW_SERVICE_PROPOSAL_KEYS to its own keys (empty = discover) and
+    FLOW_RESERVED_PROPOSAL_KEYS to the keys the others use.
+    """
+    own = parse_key_indices(os.getenv('FLOW_SERVICE_PROPOSAL_KEYS'))
+    reserved = parse_key_indices(os.getenv('FLOW_RESERVED_PROPOSAL_KEYS'))
+    overlap = sorted(set(own) & set(reserved))
+    if overlap:
+        raise ValueError(f'FLOW_SERVICE_PROPOSAL_KEYS and FLOW_RESERVED_PROPOSAL_KEYS overlap on keys {overlap}; each process needs its own proposal keys')
+    return own, reserved
+
+
+class ProposalKeyPool:
+    """Leases proposal key indices of one account to concurrent transactions.
+
+    Only keys that share the configured public key (so the same private key signs
+    for them), carry full weight and are not revoked are eligible; ``reserved``
+    keys belong to other processes and are never leased. Until discovery
+    succeeds the pool leases the default key and discovery is retried with
+    exponential backoff.
+    """
+
+    def __init__(self, address: str, default_key_id: int = 0, public_key: Optional[bytes] = None, key_indices: Optional[List[int]] = None, reserved: Optional[List[int]] = None):
+        self.address = address
+        self.default_key_id = default_key_id
+        self.public_key = public_key
+        self.reserved = frozenset(reserved or [])
+        overlap = sorted(set(key_indices or []) & self.reserved)
+        if overlap:
+            raise ValueError(f'Proposal keys {overlap} are reserved for another process')
+        self._keys: List[int] = list(key_indices or [])
+        self._free: List[int] = list(self._keys)
+        self._loaded = bool(self._keys)
+        self._failures = 0
+        self._retry_at = 0.0
+        self._cond: Optional[asyncio.Condition] = None
+        self.stats = {'leases': 0, 'waits': 0, 'discoveries': 0, 'discovery_failures': 0}
+
+    @property
+    def loaded(self) -> bool:
+        return self._loaded
+
+    @property
+    def keys(self) -> List[int]:
+        return list(self._keys)
+
+    def should_discover(self) -> bool:
+        return not self._loaded and time.monotonic() >= self._retry_at
+
+    def retry_in(self) -> float:
+        return max(0.0, self._retry_at - time.monotonic())
+
+    def _fallback(self) -> List[int]:
+        return [] if self.default_key_id in self.reserved else [self.default_key_id]
+
+    def _set_keys(self, key_indices: List[int]) -> None:
+        leased = set(self._keys) - set(self._free)
+        self._keys = sorted(key_indices)
+        self._free = [i for i in self._keys if i not in leased]
+
+    def _condition(self) -> asyncio.Condition:
+        if self._cond is None:
+            self._cond = asyncio.Condition()
+        return self._cond
+
+    def load(self, account_keys: List[Any]) -> List[int]:
+        eligible = []
+        for k in account_keys:
+            if k.index in self.reserved or getattr(k, 'revoked', False) or (getattr(k, 'weight', FULL_KEY_WEIGHT) or 0) < FULL_KEY_WEIGHT:
+                continue
+            if self.public_key is not None and bytes(k.public_key) != self.public_key:
+                continue
+            eligible.append(k.index)
+        self._set_keys(eligible or self._fallback())
+        self._loaded = True
+        self._failures = 0
+        self._retry_at = 0.0
+        self.stats['discoveries'] += 1
+        return self.keys
+
+    def discovery_failed(self) -> None:
+        """Keep proposing on the default key (or the keys already known) and retry discovery later."""
+        self._failures += 1
+        self._retry_at = time.monotonic() + min(DISCOVERY_RETRY_MAX, DISCOVERY_RETRY_BASE * 2 ** (self._failures - 1))
+        self.stats['discovery_failures'] += 1
+        if not self._keys:
+            self._set_keys(self._fallback())
+
+    def reset(self) -> None:
+        self._loaded = False
+        self._retry_at = 0.0
+
+    @asynccontextmanager
+    async def lease(self) -> AsyncIterator[int]:
+        if not self._keys:
+            self._set_keys(self._fallback())
+        if not self._keys:
+            raise RuntimeError(f'No proposal keys left for {self.address} outside FLOW_RESERVED_PROPOSAL_KEYS; add some with `admin add-proposal-keys --count N`')
+        cond = self._condition()
+        async with cond:
+            if not self._free:
+                self.stats['waits'] += 1
+            await cond.wait_for(lambda: bool(self._free))
+            key_id = self._free.pop(0)
+            self.stats['leases'] += 1
+        try:
+            yield key_id
+        finally:
+            async with cond:
+                if key_id in self._keys:
+                    self._free.append(key_id)
+                cond.notify()
+
+    def metrics(self) -> Dict[str, Any]:
+        return {
+            'address': self.address,
+            'keys': self.keys,
+            'reserved': sorted(self.reserved),
+            'free': len(self._free),
+            'in_use': len(self._keys) - len(self._free),
+            **self.stats
+        }
+
+
+class ProposerLocks:
+    """One lock per (proposer address, key index), created on demand.
+
+    Only transactions that share a proposal key are serialised; a lock is
+    dropped again once nobody holds or waits for it.
+    """
+
+    def __init__(self):
+        self._locks: Dict[Tuple[str, int], asyncio.Lock] = {}
+        self._users: Dict[Tuple[str, int], int] = {}
+        self.stats = {'acquired': 0, 'contended': 0}
+
+    @staticmethod
+    def _key(address: str, key_id: int) -> Tuple[str, int]:
+        return (address.lower().replace('0x', ''), int(key_id))
+
+    @asynccontextmanager
+    async def hold(self, address: str, key_id: int) -> AsyncIterator[None]:
+        key = self._key(address, key_id)
+        lock = self._locks.setdefault(key, asyncio.Lock())
+        self._users[key] = self._users.get(key, 0) + 1
+        if lock.locked():
+            self.stats['contended'] += 1
+        try:
+            async with lock:
+                self.stats['acquired'] += 1
+                yield
+        finally:
+            self._users[key] -= 1
+            if not self._users[key]:
+                del self._users[key]
+                del self._locks[key]
+
+    def metrics(self) -> Dict[str, Any]:
+        return {'active': len(self._locks), **self.stats}
@@ -1,25 +1,62 @@
 import os
 import json
 import asyncio
+import hashlib
 import time
-from typing import Any, Dict, List, Optional
+from collections import OrderedDict
+from contextlib import asynccontextmanager, contextmanager
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, FrozenSet, Iterator, List, Optional, Set
 
-from flow_py_sdk import flow_client
 from flow_py_sdk.account_key import AccountKey
 from flow_py_sdk.script import Script
 from flow_py_sdk.tx import Tx, ProposalKey
 from flow_py_sdk.signer import InMemorySigner, HashAlgo, SignAlgo
-from flow_py_sdk.cadence import Address, Array, String, UFix64, UInt8, Value
+from flow_py_sdk.cadence import Address, Array, Int, String, UFix64, UInt8, Value, encode_arguments
+
+from flow_access_nodes import AccessNodeSet, access_nodes_for
+from flow_account_directory import AccountDirectory
+from flow_cadence_decoder import decode_cadence
+from flow_cadence_registry import CadenceRegistry
+from flow_channel_pool import FlowChannelPool
+from flow_computation_profile import DEFAULT_GAS_LIMIT, ComputationProfile, execution_effort, is_computation_limit_error
+from flow_event_loop import FlowEventLoopThread
+from flow_preflight import bind_checks, checks_for, evaluate
+from flow_proposal_keys import ProposalKeyPool, ProposerLocks, proposal_key_ranges
+from flow_query_builder import CompositeQuery, QueryShapeCache
+from flow_rate_limiter import AdaptiveRateLimiter
+from flow_reference_block import ReferenceBlockCache, is_expired_error
+from flow_script_cache import ScriptResultCache, addresses_in
+from flow_sequence_tracker import SequenceTracker, is_sequence_mismatch
+from flow_signer_cache import SignerCache
+from flow_singleflight import SingleFlight
+from flow_tx_tracker import TransactionStatusTracker
 
 UFIX64_FACTOR = 100_000_000
+CHANNEL_HEALTH_CHECK_INTERVAL = float(os.getenv('FLOW_CHANNEL_HEALTH_CHECK_INTERVAL', '60'))
+DEFAULT_SCRIPT_CONCURRENCY = int(os.getenv('FLOW_SCRIPT_CONCURRENCY', '16'))
+REFERENCE_BLOCK_REFRESH_INTERVAL = float(os.getenv('FLOW_REFERENCE_BLOCK_REFRESH_INTERVAL', '5'))
+REFERENCE_BLOCK_MAX_AGE = float(os.getenv('FLOW_REFERENCE_BLOCK_MAX_AGE', '60'))
+TX_PREFLIGHT = os.getenv('FLOW_TX_PREFLIGHT', 'true').lower() != 'false'
+SEQUENCE_MISMATCH_RETRIES = int(os.getenv('FLOW_SEQUENCE_MISMATCH_RETRIES', '1'))
+SEQUENCE_RESIGN_LIMIT = int(os.getenv('FLOW_SEQUENCE_RESIGN_LIMIT', '10'))
+SEAL_OUTCOME_HISTORY = 1000
+TX_STATUS_POLL_INTERVAL = float(os.getenv('FLOW_TX_STATUS_POLL_INTERVAL', '0.5'))
+TX_STATUS_MAX_POLLS_PER_TICK = int(os.getenv('FLOW_TX_STATUS_MAX_POLLS_PER_TICK', '10'))
+FINALITY_STATUS = {'submitted': 1, 'finalized': 2, 'executed': 3, 'sealed': 4}
+BALANCE_SCRIPTS = {
+    'bait': 'cadence/scripts/checkBaitBalances.cdc',
+    'flow': 'cadence/scripts/checkFlowBalances.cdc',
+}
+BALANCE_BATCH_SIZE = int(os.getenv('FLOW_BALANCE_BATCH_SIZE', '200'))
+CONTRACT_STATE_SCRIPT = 'cadence/scripts/checkContractState.cdc'
+WALLET_HEALTH_SCRIPT = 'cadence/scripts/checkWalletHealth.cdc'
+WALLET_HEALTH_BATCH_SIZE = int(os.getenv('FLOW_WALLET_HEALTH_BATCH_SIZE', '100'))
+HASH_ALGOS = {'SHA2_256': HashAlgo.SHA2_256, 'SHA3_256': HashAlgo.SHA3_256}
+SIGN_ALGOS = {'ECDSA_P256': SignAlgo.ECDSA_P256, 'ECDSA_secp256k1': SignAlgo.ECDSA_secp256k1}
 
 
 def _get_access_node(network: str) -> tuple[str, int]:
-    if network == 'mainnet':
-        return ('access.mainnet.nodes.onflow.org', 9000)
-    if network == 'testnet':
-        return ('access.devnet.nodes.onflow.org', 9000)
-    return ('127.0.0.1', 3569)
+    return access_nodes_for(network)[0]
 
 
 def _to_cadence_arg(arg: Any) -> Value:
@@ -43,17 +80,196 @@ def _to_cadence_arg(arg: Any) -> Value:
     return String(str(arg))
 
 
+def _build_roles(roles: Optional[Dict[str, Any]], proposer_wallet_id: Optional[str], payer_wallet_id: Optional[str], authorizer_wallet_ids: Optional[List[str]]) -> Dict[str, Any]:
+    roles = roles or {}
+    if not roles and (proposer_wallet_id or payer_wallet_id or authorizer_wallet_ids):
+        roles = {
+            'proposer': proposer_wallet_id or payer_wallet_id,
+            'payer': payer_wallet_id or proposer_wallet_id,
+            'authorizer': authorizer_wallet_ids if authorizer_wallet_ids else (proposer_wallet_id or payer_wallet_id)
+        }
+    return roles
+
+
+def _check_finality(finality: str) -> None:
+    if finality not in FINALITY_STATUS:
+        raise ValueError(f'Invalid finality: {finality} (expected one of {", ".join(FINALITY_STATUS)})')
+
+
+def _event_dicts(result: Any) -> List[Dict[str, Any]]:
+    events = []
+    for ev in getattr(result, 'events', None) or []:
+        value = getattr(ev, 'value', None)
+        events.append({'type': ev.type, 'event_index': ev.event_index, 'value': str(value if value is not None else ''), 'fields': decode_cadence(value)})
+    return events
+
+
+def _touched_addresses(cadence_args: List[Value], proposer: tuple, payer: tuple, authorizers: List[tuple]) -> FrozenSet[str]:
+    return addresses_in(cadence_args) | {proposer[0].hex(), payer[0].hex()} | {a[0].hex() for a in authorizers}
+
+
+def _block_ref(block_height: Optional[int], block_id: Optional[str]) -> tuple[Optional[int], Optional[bytes]]:
+    if (block_height is None) == (block_id is None):
+        raise ValueError('Pass exactly one of block_height or block_id')
+    return (block_height, bytes.fromhex(block_id.replace('0x', '')) if block_id is not None else None)
+
+
+def _script_request(req: Any) -> tuple[str, List[Any], str]:
+    if isinstance(req, dict):
+        return (req['script_path'], req.get('args') or [], req.get('network', 'mainnet'))
+    if isinstance(req, str):
+        return (req, [], 'mainnet')
+    script_path, args, *rest = req
+    return (script_path, args or [], rest[0] if rest else 'mainnet')
+
+
+def _normalize_address(address: str) -> str:
+    return f"0x{str(address).lower().replace('0x', '').zfill(16)}"
+
+
+def _wallet_health_record(address: str, health: Dict[str, Any]) -> Dict[str, Any]:
+    record = {
+        'address': address,
+        'flow_balance': health.get('flowBalance'),
+        'available_flow_balance': health.get('availableFlowBalance'),
+        'bait_vault': bool(health.get('baitVault')),
+        'bait_receiver': bool(health.get('baitReceiver')),
+        'bait_balance_capability': bool(health.get('baitBalanceCapability')),
+        'bait_balance': health.get('baitBalance'),
+        'storage_used': health.get('storageUsed'),
+        'storage_capacity': health.get('storageCapacity'),
+    }
+    record['healthy'] = record['bait_vault'] and record['bait_receiver'] and record['bait_balance_capability']
+    return record
+
+
+def _script_failure(e: Exception, command: str, started: float) -> Dict[str, Any]:
+    return {
+        'success': False,
+        'stdout': '',
+        'stderr': str(e),
+        'returncode': 1,
+        'data': None,
+        'transaction_id': None,
+        'error_message': str(e),
+        'execution_time': time.time() - started,
+        'command': command
+    }
+
+
+class ScriptSnapshot:
+    """Script reads pinned to one sealed block height of a network.
+
+    Results at a fixed height never change, so they are kept in the adapter's
+    pinned cache and repeated runs at the same height are served from memory.
+    """
+
+    def __init__(self, adapter: 'FlowPyAdapter', network: str, block_height: int):
+        self._adapter = adapter
+        self.network = network
+        self.block_height = block_height
+
+    def execute_script(self, script_path: str, args: Optional[List[Any]] = None, fixed_point: str = 'float') -> Dict[str, Any]:
+        return self._adapter.execute_script_at_block(script_path, args, self.network, block_height=self.block_height, fixed_point=fixed_point)
+
+    async def aexecute_script(self, script_path: str, args: Optional[List[Any]] = None, fixed_point: str = 'float') -> Dict[str, Any]:
+        return await self._adapter.aexecute_script_at_block(script_path, args, self.network, block_height=self.block_height, fixed_point=fixed_point)
+
+    def gather_scripts(self, requests: List[Any], max_concurrency: int = DEFAULT_SCRIPT_CONCURRENCY, fixed_point: str = 'float') -> List[Dict[str, Any]]:
+        return self._adapter._run(self._adapter._gather_scripts_async(requests, max_concurrency, self.block_height, self.network, fixed_point))
+
+    async def agather_scripts(self, requests: List[Any], max_concurrency: int = DEFAULT_SCRIPT_CONCURRENCY, fixed_point: str = 'float') -> List[Dict[str, Any]]:
+        return await self._adapter._on_loop(self._adapter._gather_scripts_async(requests, max_concurrency, self.block_height, self.network, fixed_point))
+
+    def get_balances(self, addresses: List[str], token: str = 'bait') -> Dict[str, Any]:
+        return self._adapter.get_balances(addresses, token, self.network, block_height=self.block_height)
+
+    async def aget_balances(self, addresses: List[str], token: str = 'bait') -> Dict[str, Any]:
+        return await self._adapter.aget_balances(addresses, token, self.network, block_height=self.block_height)
+
+    def query(self) -> CompositeQuery:
+        return CompositeQuery(self._adapter, self.network, self.block_height)
+
+
 class FlowPyAdapter:
-    def __init__(self, repo_root: Optional[str] = None):
+    def __init__(self, repo_root: Optional[str] = None, channel_pool: Optional[FlowChannelPool] = None):
         self.repo_root = repo_root or os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
         self.flow_dir = os.path.join(self.repo_root, 'flow')
         self._service_account: Optional[Dict[str, Any]] = None
-        self._tx_lock: Optional[asyncio.Lock] = None
+        self._accounts = AccountDirectory([
+            os.path.join(self.flow_dir, 'flow.json'),
+            os.path.join(self.flow_dir, 'accounts', 'flow-production.json')
+        ])
+        self._templates = CadenceRegistry(self.flow_dir, fallback=_to_cadence_arg)
+        self._templates.preload()
+        self._query_shapes = QueryShapeCache(fallback=_to_cadence_arg)
+        self._computation = ComputationProfile()
+        self._proposer_locks = ProposerLocks()
+        self._signers = SignerCache(self._create_signer)
+        self._pool = channel_pool or FlowChannelPool()
+        self._access_nodes: Dict[str, AccessNodeSet] = {}
+        self._rate_limiter = AdaptiveRateLimiter()
+        self._proposal_key_pools: Dict[str, ProposalKeyPool] = {}
+        # Checked at startup: overlapping key ranges would let processes invalidate each other's sequence numbers.
+        self._proposal_key_ranges = proposal_key_ranges()
+        self._discovery_lock: Optional[asyncio.Lock] = None
+        self._sequences = SequenceTracker()
+        self._reference_blocks = ReferenceBlockCache(max_age=REFERENCE_BLOCK_MAX_AGE)
+        self._script_cache = ScriptResultCache()
+        self._script_flights = SingleFlight()
+        self._tx_tracker = TransactionStatusTracker(self._client, tick=TX_STATUS_POLL_INTERVAL, max_polls_per_tick=TX_STATUS_MAX_POLLS_PER_TICK)
+        self._seal_tasks: Set[asyncio.Task] = set()
+        self._seal_outcomes: 'OrderedDict[str, Dict[str, Any]]' = OrderedDict()
+        self._seal_callbacks: Dict[str, List[Callable[[str, Dict[str, Any]], Any]]] = {}
+        self._loop_thread = FlowEventLoopThread()
+        self._loop_thread.every(CHANNEL_HEALTH_CHECK_INTERVAL, self._pool.health_check)
+        self._loop_thread.every(REFERENCE_BLOCK_REFRESH_INTERVAL, self._refresh_reference_blocks)
+        self._prewarm_signers()
+
+    def _run(self, coro: Any) -> Any:
+        return self._loop_thread.run(coro)
+
+    async def _on_loop(self, coro: Any) -> Any:
+        if self._loop_thread.in_loop_thread():
+            return await coro
+        return await asyncio.wrap_future(self._loop_thread.submit(coro))
 
-    def _get_tx_lock(self) -> asyncio.Lock:
-        if self._tx_lock is None:
-            self._tx_lock = asyncio.Lock()
-        return self._tx_lock
+    def _nodes(self, network: str) -> AccessNodeSet:
+        nodes = self._access_nodes.get(network)
+        if nodes is None:
+            nodes = AccessNodeSet(network, access_nodes_for(network), self._pool.client, limiter=self._rate_limiter)
+            self._access_nodes[network] = nodes
+        return nodes
+
+    def _client(self, network: str, kind: str = 'script') -> Any:
+        return self._nodes(network).client(kind=kind)
+
+    async def _read(self, network: str, fn: Callable[[Any], Any], hedge: bool = False) -> Any:
+        return await self._nodes(network).call(fn, hedge=hedge)
+
+    def metrics(self) -> Dict[str, Any]:
+        return {
+            'channels': self._pool.metrics(),
+            'access_nodes': {network: nodes.metrics() for network, nodes in self._access_nodes.items()},
+            'rate_limits': self._rate_limiter.metrics(),
+            'accounts': self._accounts.metrics(),
+            'cadence_templates': self._templates.metrics(),
+            'query_shapes': self._query_shapes.metrics(),
+            'computation': self._computation.metrics(),
+            'signers': self._signers.metrics(),
+            'proposal_keys': {network: pool.metrics() for network, pool in self._proposal_key_pools.items()},
+            'proposer_locks': self._proposer_locks.metrics(),
+            'sequence_numbers': self._sequences.metrics(),
+            'reference_blocks': self._reference_blocks.metrics(),
+            'script_cache': self._script_cache.metrics(),
+            'script_singleflight': self._script_flights.metrics(),
+            'pending_seal_confirmations': len(self._seal_tasks),
+            'transaction_status': self._tx_tracker.metrics()
+        }
+
+    def close(self) -> None:
+        self._pool.close()
+        self._loop_thread.stop()
 
     def _load_service_account(self) -> Dict[str, Any]:
         if self._service_account is not None:
@@ -65,135 +281,312 @@ class FlowPyAdapter:
         else:
             raise RuntimeError(f'Service account private key not found. Tried: {os.path.join(self.flow_dir, "mainnet-agfarms.pkey")} and {os.path.join(self.repo_root, "mainnet-agfarms.pkey")}')
         key = open(key_path, 'r').read().strip()
-        address = None
-        key_id = 0
-        signature_algorithm = 'ECDSA_secp256k1'
-        hash_algorithm = 'SHA2_256'
-        flow_json_path = os.path.join(self.flow_dir, 'flow.json')
-        if os.path.exists(flow_json_path):
-            with open(flow_json_path) as f:
-                cfg = json.load(f)
-            if cfg.get('accounts', {}).get('mainnet-agfarms'):
-                acc = cfg['accounts']['mainnet-agfarms']
-                address = str(acc.get('address', ''))
-                if acc.get('key') and isinstance(acc['key'].get('index'), int):
-                    key_id = acc['key']['index']
-                if acc.get('key', {}).get('signatureAlgorithm'):
-                    signature_algorithm = acc['key']['signatureAlgorithm']
-                if acc.get('key', {}).get('hashAlgorithm'):
-                    hash_algorithm = acc['key']['hashAlgorithm']
-        if not address:
-            accounts_path = os.path.join(self.flow_dir, 'accounts', 'flow-production.json')
-            if os.path.exists(accounts_path):
-                with open(accounts_path) as f:
-                    cfg = json.load(f)
-                if cfg.get('accounts', {}).get('mainnet-agfarms'):
-                    acc = cfg['accounts']['mainnet-agfarms']
-                    address = str(acc.get('address', ''))
-                    if acc.get('key') and isinstance(acc['key'].get('index'), int):
-                        key_id = acc['key']['index']
-                    if acc.get('key', {}).get('signatureAlgorithm'):
-                        signature_algorithm = acc['key']['signatureAlgorithm']
-                    if acc.get('key', {}).get('hashAlgorithm'):
-                        hash_algorithm = acc['key']['hashAlgorithm']
-        if not address:
+        record = self._accounts.get('mainnet-agfarms')
+        if record is None:
             raise RuntimeError('Service account address not found in flow.json or flow-production.json')
         self._service_account = {
-            'address': address if address.startswith('0x') else f'0x{address}',
+            'address': record.address,
             'key': key,
-            'keyId': key_id,
-            'signatureAlgorithm': signature_algorithm,
-            'hashAlgorithm': hash_algorithm
+            'keyId': record.key_id or 0,
+            'signatureAlgorithm': record.signature_algorithm or 'ECDSA_secp256k1',
+            'hashAlgorithm': record.hash_algorithm or 'SHA2_256'
         }
         return self._service_account
 
-    def _load_account_by_name(self, account_name: str) -> Dict[str, Any]:
-        if account_name == 'mainnet-agfarms':
-            return self._load_service_account()
+    def _is_service_account(self, val: Any) -> bool:
+        if not val or val == 'mainnet-agfarms':
+            return True
+        if isinstance(val, str) and len(val.replace('0x', '')) == 16:
+            try:
+                svc_address = self._load_service_account()['address']
+            except RuntimeError:
+                return False
+            return val.replace('0x', '').lower() == svc_address.replace('0x', '').lower()
+        return False
+
+    async def _get_proposal_key_pool(self, network: str) -> ProposalKeyPool:
+        pool = self._proposal_key_pools.get(network)
+        if pool is None:
+            svc = self._load_service_account()
+            signer = self._service_signer()
+            pool = ProposalKeyPool(
+                svc['address'],
+                default_key_id=svc['keyId'],
+                public_key=signer.key.get_verifying_key().to_string(),
+                key_indices=self._proposal_key_ranges[0],
+                reserved=self._proposal_key_ranges[1]
+            )
+            self._proposal_key_pools[network] = pool
+        if pool.should_discover():
+            async with self._get_discovery_lock():
+                if pool.should_discover():
+                    try:
+                        async with self._client(network) as client:
+                            account = await client.get_account_at_latest_block(address=Address.from_hex(pool.address).bytes)
+                        pool.load(account.keys)
+                    except Exception as e:
+                        pool.discovery_failed()
+                        print(f'Proposal key discovery failed for {pool.address}, using keys {pool.keys}, retrying in {pool.retry_in():.0f}s: {e}')
+        return pool
+
+    def _get_discovery_lock(self) -> asyncio.Lock:
+        if self._discovery_lock is None:
+            self._discovery_lock = asyncio.Lock()
+        return self._discovery_lock
+
+    def _read_account_key(self, account_name: str) -> str:
         key_path = os.path.join(self.flow_dir, 'accounts', 'pkeys', f'{account_name}.pkey')
         if not os.path.exists(key_path):
             raise RuntimeError(f'Private key file not found for account {account_name}: {key_path}')
-        key = open(key_path, 'r').read().strip()
-        address = None
-        key_id = 0
-        signature_algorithm = 'ECDSA_P256'
-        hash_algorithm = 'SHA3_256'
-        flow_json_path = os.path.join(self.flow_dir, 'flow.json')
-        if os.path.exists(flow_json_path):
-            with open(flow_json_path) as f:
-                cfg = json.load(f)
-            if cfg.get('accounts', {}).get(account_name):
-                acc = cfg['accounts'][account_name]
-                address = str(acc.get('address', ''))
-                if acc.get('key') and isinstance(acc['key'].get('index'), int):
-                    key_id = acc['key']['index']
-                if acc.get('key', {}).get('signatureAlgorithm'):
-                    signature_algorithm = acc['key']['signatureAlgorithm']
-                if acc.get('key', {}).get('hashAlgorithm'):
-                    hash_algorithm = acc['key']['hashAlgorithm']
-        if not address:
-            accounts_path = os.path.join(self.flow_dir, 'accounts', 'flow-production.json')
-            if os.path.exists(accounts_path):
-                with open(accounts_path) as f:
-                    cfg = json.load(f)
-                if cfg.get('accounts', {}).get(account_name):
-                    acc = cfg['accounts'][account_name]
-                    address = str(acc.get('address', ''))
-                    if acc.get('key') and isinstance(acc['key'].get('index'), int):
-                        key_id = acc['key']['index']
-                    if acc.get('key', {}).get('signatureAlgorithm'):
-                        signature_algorithm = acc['key']['signatureAlgorithm']
-                    if acc.get('key', {}).get('hashAlgorithm'):
-                        hash_algorithm = acc['key']['hashAlgorithm']
-        if not address:
+        return open(key_path, 'r').read().strip()
+
+    def _service_signer(self) -> InMemorySigner:
+        svc = self._load_service_account()
+        return self._signers.get(svc['address'], svc['keyId'], svc['signatureAlgorithm'], svc['hashAlgorithm'], load_key=lambda: svc['key'])
+
+    def _account_signer(self, account_name: str) -> tuple[Address, int, InMemorySigner]:
+        if account_name == 'mainnet-agfarms':
+            svc = self._load_service_account()
+            return (Address.from_hex(svc['address']), svc['keyId'], self._service_signer())
+        record = self._accounts.get(account_name)
+        if record is None:
             raise RuntimeError(f'Account {account_name} not found in flow.json or flow-production.json')
-        return {
-            'address': address if address.startswith('0x') else f'0x{address}',
-            'key': key,
-            'keyId': key_id,
-            'signatureAlgorithm': signature_algorithm,
-            'hashAlgorithm': hash_algorithm
-        }
+        key_id = record.key_id or 0
+        signer = self._signers.get(
+            record.address, key_id,
+            record.signature_algorithm or 'ECDSA_P256', record.hash_algorithm or 'SHA3_256',
+            load_key=lambda: self._read_account_key(account_name)
+        )
+        return (Address.from_hex(record.address), key_id, signer)
+
+    def invalidate_signer(self, address: str, key_id: Optional[int] = None) -> int:
+        if self._service_account is not None and address.lower().replace('0x', '') == self._service_account['address'].lower().replace('0x', ''):
+            self._service_account = None
+        return self._signers.invalidate(address, key_id)
+
+    def _prewarm_signers(self) -> None:
+        try:
+            self._service_signer()
+        except RuntimeError:
+            pass
 
     def _create_signer(self, private_key_hex: str, signature_algo: str, hash_algo: str) -> InMemorySigner:
-        hash_map = {'SHA2_256': HashAlgo.SHA2_256, 'SHA3_256': HashAlgo.SHA3_256}
-        sign_map = {'ECDSA_P256': SignAlgo.ECDSA_P256, 'ECDSA_secp256k1': SignAlgo.ECDSA_secp256k1}
         return InMemorySigner(
-            hash_algo=hash_map.get(hash_algo, HashAlgo.SHA2_256),
-            sign_algo=sign_map.get(signature_algo, SignAlgo.ECDSA_secp256k1),
+            hash_algo=HASH_ALGOS.get(hash_algo, HashAlgo.SHA2_256),
+            sign_algo=SIGN_ALGOS.get(signature_algo, SignAlgo.ECDSA_secp256k1),
             private_key_hex=private_key_hex
         )
 
-    def _read_cadence(self, path: str) -> str:
-        full = path if os.path.isabs(path) else os.path.join(self.flow_dir, path)
-        with open(full, 'r') as f:
-            return f.read()
+    def _read_cadence(self, path: str, network: str = 'mainnet') -> str:
+        return self._templates.code(path, network)
 
-    def _build_args(self, args: Optional[List[Any]]) -> List[Value]:
+    def _build_args(self, args: Optional[List[Any]], path: Optional[str] = None) -> List[Value]:
+        template = self._templates.peek(path) if path else None
+        if template is not None and template.params is not None:
+            return template.encode(list(args or []))
         return [_to_cadence_arg(a) for a in (args or [])]
 
-    def execute_script(self, script_path: str, args: Optional[List[Any]] = None, network: str = 'mainnet') -> Dict[str, Any]:
-        return asyncio.run(self._execute_script_async(script_path, args or [], network))
+    # Script results keep UFix64/Fix64 as float unless the caller opts into
+    # fixed_point='decimal' (exact) or 'int' (raw fixed-point units).
+    def execute_script(self, script_path: str, args: Optional[List[Any]] = None, network: str = 'mainnet', fixed_point: str = 'float') -> Dict[str, Any]:
+        return self._run(self._execute_script_async(script_path, args or [], network, fixed_point=fixed_point))
+
+    async def aexecute_script(self, script_path: str, args: Optional[List[Any]] = None, network: str = 'mainnet', fixed_point: str = 'float') -> Dict[str, Any]:
+        return await self._on_loop(self._execute_script_async(script_path, args or [], network, fixed_point=fixed_point))
+
+    def gather_scripts(self, requests: List[Any], max_concurrency: int = DEFAULT_SCRIPT_CONCURRENCY, fixed_point: str = 'float') -> List[Dict[str, Any]]:
+        return self._run(self._gather_scripts_async(requests, max_concurrency, fixed_point=fixed_point))
+
+    async def agather_scripts(self, requests: List[Any], max_concurrency: int = DEFAULT_SCRIPT_CONCURRENCY, fixed_point: str = 'float') -> List[Dict[str, Any]]:
+        return await self._on_loop(self._gather_scripts_async(requests, max_concurrency, fixed_point=fixed_point))
+
+    def execute_script_at_block(self, script_path: str, args: Optional[List[Any]] = None, network: str = 'mainnet', block_height: Optional[int] = None, block_id: Optional[str] = None, fixed_point: str = 'float') -> Dict[str, Any]:
+        return self._run(self._execute_script_async(script_path, args or [], network, *_block_ref(block_height, block_id), fixed_point=fixed_point))
+
+    async def aexecute_script_at_block(self, script_path: str, args: Optional[List[Any]] = None, network: str = 'mainnet', block_height: Optional[int] = None, block_id: Optional[str] = None, fixed_point: str = 'float') -> Dict[str, Any]:
+        return await self._on_loop(self._execute_script_async(script_path, args or [], network, *_block_ref(block_height, block_id), fixed_point=fixed_point))
+
+    @contextmanager
+    def snapshot(self, network: str = 'mainnet', block_height: Optional[int] = None) -> Iterator['ScriptSnapshot']:
+        height = block_height if block_height is not None else self._run(self._latest_sealed_height(network))
+        yield ScriptSnapshot(self, network, height)
+
+    @asynccontextmanager
+    async def asnapshot(self, network: str = 'mainnet', block_height: Optional[int] = None) -> AsyncIterator['ScriptSnapshot']:
+        height = block_height if block_height is not None else await self._on_loop(self._latest_sealed_height(network))
+        yield ScriptSnapshot(self, network, height)
+
+    def get_balances(self, addresses: List[str], token: str = 'bait', network: str = 'mainnet', block_height: Optional[int] = None, batch_size: int = BALANCE_BATCH_SIZE) -> Dict[str, Any]:
+        return self._run(self._get_balances_async(addresses, token, network, block_height, batch_size))
+
+    async def aget_balances(self, addresses: List[str], token: str = 'bait', network: str = 'mainnet', block_height: Optional[int] = None, batch_size: int = BALANCE_BATCH_SIZE) -> Dict[str, Any]:
+        return await self._on_loop(self._get_balances_async(addresses, token, network, block_height, batch_size))
+
+    async def _get_balances_async(self, addresses: List[str], token: str, network: str, block_height: Optional[int], batch_size: int) -> Dict[str, Any]:
+        started = time.time()
+        script_path = BALANCE_SCRIPTS.get(token.lower())
+        if script_path is None:
+            raise ValueError(f"Invalid token '{token}'; expected one of {', '.join(BALANCE_SCRIPTS)}")
+        balances, calls, errors = await self._run_address_batches(script_path, addresses, network, block_height, batch_size)
+        return {
+            'success': not errors,
+            'data': balances,
+            'token': token.lower(),
+            'block_height': block_height,
+            'script_calls': calls,
+            'error_message': '; '.join(errors[:5]) if errors else None,
+            'execution_time': time.time() - started
+        }
+
+    def get_wallet_health(self, addresses: List[str], network: str = 'mainnet', block_height: Optional[int] = None, batch_size: int = WALLET_HEALTH_BATCH_SIZE) -> Dict[str, Any]:
+        return self._run(self._get_wallet_health_async(addresses, network, block_height, batch_size))
 
-    async def _execute_script_async(self, script_path: str, args: List[Any], network: str) -> Dict[str, Any]:
+    async def aget_wallet_health(self, addresses: List[str], network: str = 'mainnet', block_height: Optional[int] = None, batch_size: int = WALLET_HEALTH_BATCH_SIZE) -> Dict[str, Any]:
+        return await self._on_loop(self._get_wallet_health_async(addresses, network, block_height, batch_size))
+
+    async def _get_wallet_health_async(self, addresses: List[str], network: str, block_height: Optional[int], batch_size: int) -> Dict[str, Any]:
         started = time.time()
-        host, port = _get_access_node(network)
-        code = self._read_cadence(script_path)
-        cadence_args = self._build_args(args)
-        script = Script(code=code, arguments=cadence_args)
+        raw, calls, errors = await self._run_address_batches(WALLET_HEALTH_SCRIPT, addresses, network, block_height, batch_size)
+        return {
+            'success': not errors,
+            'data': {address: _wallet_health_record(address, h) for address, h in raw.items()},
+            'block_height': block_height,
+            'script_calls': calls,
+            'error_message': '; '.join(errors[:5]) if errors else None,
+            'execution_time': time.time() - started
+        }
+
+    def get_contract_state(self, network: str = 'mainnet') -> Dict[str, Any]:
+        return self._run(self._get_contract_state_async(network))
+
+    async def aget_contract_state(self, network: str = 'mainnet') -> Dict[str, Any]:
+        return await self._on_loop(self._get_contract_state_async(network))
+
+    async def _get_contract_state_async(self, network: str) -> Dict[str, Any]:
+        address = self._templates.aliases(network).get('BaitCoin')
+        if address is None:
+            return _script_failure(ValueError(f'No {network} address for contract BaitCoin'), f'flow_py execute_script {CONTRACT_STATE_SCRIPT}', time.time())
+        result = await self._execute_script_async(CONTRACT_STATE_SCRIPT, [f'0x{address}'], network)
+        state = result.get('data')
+        if not result.get('success') or not isinstance(state, dict):
+            return result
+        supply, reserve = state.get('baitTotalSupply'), state.get('usdfReserve')
+        return {**result, 'data': {
+            'contract_address': f'0x{address}',
+            'bait_total_supply': supply,
+            'usdf_reserve': reserve,
+            'usdf_vault_path': state.get('usdfVaultPath'),
+            'reserve_ratio': reserve / supply if reserve is not None and supply else None,
+            'token_info': state.get('tokenInfo') or {}
+        }}
+
+    async def _run_address_batches(self, script_path: str, addresses: List[str], network: str, block_height: Optional[int], batch_size: int) -> tuple[Dict[str, Any], int, List[str]]:
+        unique = list(dict.fromkeys(_normalize_address(a) for a in addresses))
+        merged: Dict[str, Any] = {}
+        errors: List[str] = []
+        semaphore = asyncio.Semaphore(DEFAULT_SCRIPT_CONCURRENCY)
+        calls = 0
+
+        async def run_chunk(chunk: List[str]) -> None:
+            nonlocal calls
+            async with semaphore:
+                calls += 1
+                if block_height is None:
+                    r = await self._execute_script_async(script_path, [chunk], network)
+                else:
+                    r = await self._execute_script_async(script_path, [chunk], network, block_height)
+            if r.get('success'):
+                merged.update(r.get('data') or {})
+            elif len(chunk) > 1 and 'computation' in (r.get('error_message') or '').lower():
+                # Over the script computation limit: split and retry both halves.
+                mid = len(chunk) // 2
+                await asyncio.gather(run_chunk(chunk[:mid]), run_chunk(chunk[mid:]))
+            else:
+                errors.append(r.get('error_message') or 'Unknown error')
+
+        size = max(1, batch_size)
+        await asyncio.gather(*(run_chunk(unique[i:i + size]) for i in range(0, len(unique), size)))
+        return merged, calls, errors
+
+    def query(self, network: str = 'mainnet') -> CompositeQuery:
+        return CompositeQuery(self, network)
+
+    def execute_query(self, query: CompositeQuery) -> Dict[str, Any]:
+        return self._run(self._execute_query_async(query))
+
+    async def aexecute_query(self, query: CompositeQuery) -> Dict[str, Any]:
+        return await self._on_loop(self._execute_query_async(query))
+
+    async def _execute_query_async(self, query: CompositeQuery, use_cache: bool = True) -> Dict[str, Any]:
+        started = time.time()
+        command = f"flow_py execute_query {','.join(name for name, _ in query.shape)}"
+        try:
+            if not len(query):
+                raise ValueError('Query has no reads')
+            template = self._query_shapes.template(query.shape)
+            code = template.code(query.network, self._templates.aliases(query.network))
+            cadence_args = template.encode(query.args)
+        except Exception as e:
+            return _script_failure(e, command, started)
+        result = await self._run_script(code, template.content_hash, cadence_args, query.network, command, started, query.block_height, use_cache=use_cache)
+        if result.get('success'):
+            data = result.get('data') or {}
+            result = {**result, 'data': {name: data.get(name) for name, _ in query.shape}}
+        return result
+
+    async def _latest_sealed_height(self, network: str) -> int:
+        block = await self._read(network, lambda client: client.get_latest_block(is_sealed=True))
+        self._reference_blocks.update(network, block.id, block.height)
+        return block.height
+
+    async def _gather_scripts_async(self, requests: List[Any], max_concurrency: int, block_height: Optional[int] = None, network: Optional[str] = None, fixed_point: str = 'float') -> List[Dict[str, Any]]:
+        semaphore = asyncio.Semaphore(max(1, max_concurrency))
+
+        async def run_one(req: Any) -> Dict[str, Any]:
+            script_path, args, req_network = _script_request(req)
+            async with semaphore:
+                if block_height is None:
+                    return await self._execute_script_async(script_path, args, network or req_network, fixed_point=fixed_point)
+                return await self._execute_script_async(script_path, args, network or req_network, block_height, fixed_point=fixed_point)
+
+        return list(await asyncio.gather(*(run_one(r) for r in requests)))
+
+    async def _execute_script_async(self, script_path: str, args: List[Any], network: str, block_height: Optional[int] = None, block_id: Optional[bytes] = None, fixed_point: str = 'decimal') -> Dict[str, Any]:
+        started = time.time()
+        command = f'flow_py execute_script {script_path}'
+        try:
+            code = self._read_cadence(script_path, network)
+            cadence_args = self._build_args(args, script_path)
+            template = self._templates.peek(script_path)
+            content_hash = template.content_hash if template is not None else hashlib.sha256(code.encode()).hexdigest()
+        except Exception as e:
+            return _script_failure(e, command, started)
+        return await self._run_script(code, content_hash, cadence_args, network, command, started, block_height, block_id, fixed_point=fixed_point)
+
+    async def _run_script(self, code: str, content_hash: str, cadence_args: List[Value], network: str, command: str, started: float, block_height: Optional[int] = None, block_id: Optional[bytes] = None, use_cache: bool = True, fixed_point: str = 'decimal') -> Dict[str, Any]:
+        # use_cache=False always reads the chain: no cached result and no joining a read already in flight.
+        pinned = block_height is not None or block_id is not None
         try:
-            async with flow_client(host=host, port=port) as client:
-                result = await client.execute_script(script=script)
+            script_key = (content_hash, tuple(encode_arguments(cadence_args)), network, block_height, block_id, fixed_point)
+            cache_key = None
+            if pinned and use_cache:
+                cached = self._script_cache.get_pinned(script_key)
+                if cached is not None:
+                    return {**cached, 'execution_time': time.time() - started, 'cached': True}
+            elif use_cache and self._script_cache.enabled:
+                cache_key = script_key[:3] + (fixed_point,)
+                height = self._reference_blocks.height(network)
+                cached = self._script_cache.get(cache_key, height)
+                if cached is not None:
+                    return {**cached, 'execution_time': time.time() - started, 'cached': True}
+                addresses = addresses_in(cadence_args)
+                versions = self._script_cache.versions(network, addresses)
+            script = Script(code=code, arguments=cadence_args)
+            read = lambda: self._read(network, lambda client: client.execute_script(script=script, at_block_id=block_id, at_block_height=block_height), hedge=True)
+            result = await (self._script_flights.do(script_key, read) if use_cache else read())
             elapsed = time.time() - started
-            data = result
-            if hasattr(result, '__class__') and result.__class__.__name__ == 'UFix64':
-                data = result.value / UFIX64_FACTOR
-            elif hasattr(result, 'value'):
-                data = result.value / UFIX64_FACTOR if result.__class__.__name__ == 'UFix64' else result.value
-            elif hasattr(result, 'fields') and result.fields:
-                f0 = result.fields[0]
-                data = f0.value / UFIX64_FACTOR if f0.__class__.__name__ == 'UFix64' else (f0.value if hasattr(f0, 'value') else str(f0))
-            return {
+            data = decode_cadence(result, fixed_point)
+            response = {
                 'success': True,
                 'stdout': '',
                 'stderr': '',
@@ -201,49 +594,50 @@ class FlowPyAdapter:
                 'data': data,
                 'transaction_id': None,
                 'execution_time': elapsed,
-                'command': f'flow_py execute_script {script_path}'
+                'command': command
             }
+            if pinned:
+                response['block_height'] = block_height
+                response['block_id'] = block_id.hex() if block_id is not None else None
+                if use_cache:
+                    self._script_cache.put_pinned(script_key, response)
+            elif cache_key is not None:
+                self._script_cache.put(cache_key, response, addresses, versions, height)
+            return response
         except Exception as e:
-            elapsed = time.time() - started
-            return {
-                'success': False,
-                'stdout': '',
-                'stderr': str(e),
-                'returncode': 1,
-                'data': None,
-                'transaction_id': None,
-                'error_message': str(e),
-                'execution_time': elapsed,
-                'command': f'flow_py execute_script {script_path}'
-            }
+            return _script_failure(e, command, started)
 
-    def send_transaction(self, transaction_path: str, args: Optional[List[Any]] = None, roles: Optional[Dict[str, Any]] = None, network: str = 'mainnet', proposer_wallet_id: Optional[str] = None, payer_wallet_id: Optional[str] = None, authorizer_wallet_ids: Optional[List[str]] = None) -> Dict[str, Any]:
-        roles = roles or {}
-        if not roles and (proposer_wallet_id or payer_wallet_id or authorizer_wallet_ids):
-            roles = {
-                'proposer': proposer_wallet_id or payer_wallet_id,
-                'payer': payer_wallet_id or proposer_wallet_id,
-                'authorizer': authorizer_wallet_ids if authorizer_wallet_ids else (proposer_wallet_id or payer_wallet_id)
-            }
-        return asyncio.run(self._send_transaction_async(transaction_path, args or [], roles, {}, network, proposer_wallet_id, payer_wallet_id, authorizer_wallet_ids))
-
-    def send_transaction_with_private_key(self, transaction_path: str, args: Optional[List[Any]] = None, roles: Optional[Dict[str, Any]] = None, network: str = 'mainnet', private_keys: Optional[Dict[str, str]] = None, proposer_wallet_id: Optional[str] = None, payer_wallet_id: Optional[str] = None, authorizer_wallet_ids: Optional[List[str]] = None) -> Dict[str, Any]:
-        roles = roles or {}
-        if not roles and (proposer_wallet_id or payer_wallet_id or authorizer_wallet_ids):
-            roles = {
-                'proposer': proposer_wallet_id or payer_wallet_id,
-                'payer': payer_wallet_id or proposer_wallet_id,
-                'authorizer': authorizer_wallet_ids if authorizer_wallet_ids else (proposer_wallet_id or payer_wallet_id)
-            }
-        return asyncio.run(self._send_transaction_async(transaction_path, args or [], roles, private_keys or {}, network, proposer_wallet_id, payer_wallet_id, authorizer_wallet_ids))
+    def send_transaction(self, transaction_path: str, args: Optional[List[Any]] = None, roles: Optional[Dict[str, Any]] = None, network: str = 'mainnet', proposer_wallet_id: Optional[str] = None, payer_wallet_id: Optional[str] = None, authorizer_wallet_ids: Optional[List[str]] = None, finality: str = 'sealed') -> Dict[str, Any]:
+        roles = _build_roles(roles, proposer_wallet_id, payer_wallet_id, authorizer_wallet_ids)
+        _check_finality(finality)
+        return self._run(self._send_transaction_async(transaction_path, args or [], roles, {}, network, proposer_wallet_id, payer_wallet_id, authorizer_wallet_ids, finality))
+
+    def send_transaction_with_private_key(self, transaction_path: str, args: Optional[List[Any]] = None, roles: Optional[Dict[str, Any]] = None, network: str = 'mainnet', private_keys: Optional[Dict[str, str]] = None, proposer_wallet_id: Optional[str] = None, payer_wallet_id: Optional[str] = None, authorizer_wallet_ids: Optional[List[str]] = None, finality: str = 'sealed') -> Dict[str, Any]:
+        roles = _build_roles(roles, proposer_wallet_id, payer_wallet_id, authorizer_wallet_ids)
+        _check_finality(finality)
+        return self._run(self._send_transaction_async(transaction_path, args or [], roles, private_keys or {}, network, proposer_wallet_id, payer_wallet_id, authorizer_wallet_ids, finality))
+
+    async def asend_transaction(self, transaction_path: str, args: Optional[List[Any]] = None, roles: Optional[Dict[str, Any]] = None, network: str = 'mainnet', private_keys: Optional[Dict[str, str]] = None, proposer_wallet_id: Optional[str] = None, payer_wallet_id: Optional[str] = None, authorizer_wallet_ids: Optional[List[str]] = None, finality: str = 'sealed') -> Dict[str, Any]:
+        roles = _build_roles(roles, proposer_wallet_id, payer_wallet_id, authorizer_wallet_ids)
+        _check_finality(finality)
+        return await self._on_loop(self._send_transaction_async(transaction_path, args or [], roles, private_keys or {}, network, proposer_wallet_id, payer_wallet_id, authorizer_wallet_ids, finality))
+
+    async def _send_transaction_async(self, transaction_path: str, args: List[Any], roles: Dict[str, Any], private_keys: Dict[str, str], network: str, proposer_wallet_id: Optional[str], payer_wallet_id: Optional[str], authorizer_wallet_ids: Optional[List[str]], finality: str = 'sealed') -> Dict[str, Any]:
+        return await self._execute_transaction(transaction_path, args, roles, private_keys, network, finality=finality)
 
-    async def _send_transaction_async(self, transaction_path: str, args: List[Any], roles: Dict[str, Any], private_keys: Dict[str, str], network: str, proposer_wallet_id: Optional[str], payer_wallet_id: Optional[str], authorizer_wallet_ids: Optional[List[str]]) -> Dict[str, Any]:
-        async with self._get_tx_lock():
-            return await self._execute_transaction(transaction_path, args, roles, private_keys, network)
+    @asynccontextmanager
+    async def _proposer_slot(self, network: str, proposer: Any, resolve: Optional[Callable[[], tuple]] = None) -> AsyncIterator[Optional[int]]:
+        if self._is_service_account(proposer):
+            pool = await self._get_proposal_key_pool(network)
+            async with pool.lease() as key_id:
+                yield key_id
+        else:
+            addr, key_id, _ = resolve()
+            async with self._proposer_locks.hold(addr.hex(), key_id):
+                yield None
 
-    async def _execute_transaction(self, transaction_path: str, args: List[Any], roles: Dict[str, Any], private_keys: Dict[str, str], network: str) -> Dict[str, Any]:
+    async def _execute_transaction(self, transaction_path: str, args: List[Any], roles: Dict[str, Any], private_keys: Dict[str, str], network: str, finality: str = 'sealed') -> Dict[str, Any]:
         started = time.time()
-        host, port = _get_access_node(network)
         svc = self._load_service_account()
 
         def _get_private_key(addr: str) -> Optional[str]:
@@ -254,96 +648,102 @@ class FlowPyAdapter:
                     return v
             return None
 
-        def resolve_account(val: Any) -> tuple[Address, int, InMemorySigner]:
+        def resolve_account(val: Any, service_key_id: Optional[int]) -> tuple[Address, int, InMemorySigner]:
+            addr, key_id, signer = _resolve_account(val)
+            if service_key_id is not None and addr.hex() == Address.from_hex(svc['address']).hex():
+                key_id = service_key_id
+            return (addr, key_id, signer)
+
+        def _resolve_account(val: Any) -> tuple[Address, int, InMemorySigner]:
             if not val:
-                addr = Address.from_hex(svc['address'])
-                signer = self._create_signer(svc['key'], svc['signatureAlgorithm'], svc['hashAlgorithm'])
-                return (addr, svc['keyId'], signer)
+                return (Address.from_hex(svc['address']), svc['keyId'], self._service_signer())
             if isinstance(val, str):
                 pk = _get_private_key(val)
                 if pk:
                     addr = Address.from_hex(val if val.startswith('0x') else f'0x{val}')
-                    signer = self._create_signer(pk, 'ECDSA_P256', 'SHA3_256')
+                    signer = self._signers.get(addr.hex(), 0, 'ECDSA_P256', 'SHA3_256', private_key_hex=pk)
                     return (addr, 0, signer)
-                acc = self._load_account_by_name(val)
-                addr = Address.from_hex(acc['address'])
-                signer = self._create_signer(acc['key'], acc['signatureAlgorithm'], acc['hashAlgorithm'])
-                return (addr, acc['keyId'], signer)
+                return self._account_signer(val)
             raise ValueError(f'Invalid authorization value: {val}')
 
-        proposer_addr, proposer_key_id, proposer_signer = resolve_account(roles.get('proposer'))
-        payer_addr, payer_key_id, payer_signer = resolve_account(roles.get('payer'))
-        auth_list = roles.get('authorizer')
-        if isinstance(auth_list, list):
-            authorizers = [resolve_account(a) for a in auth_list]
-        elif auth_list:
-            authorizers = [resolve_account(auth_list)]
-        else:
-            authorizers = [(proposer_addr, proposer_key_id, proposer_signer)]
-
-        code = self._read_cadence(transaction_path)
-        cadence_args = self._build_args(args)
+        def resolve_subject(subject: str) -> str:
+            if subject == 'contract':
+                return f"0x{self._templates.aliases(network)['BaitCoin']}"
+            val = roles.get(subject)
+            if subject == 'authorizer':
+                val = (val[0] if isinstance(val, list) and val else val) or roles.get('proposer')
+            return _resolve_account(val)[0].hex_with_prefix()
 
         try:
-            async with flow_client(host=host, port=port) as client:
-                block = await client.get_latest_block(is_sealed=True)
-                proposer_account = await client.get_account_at_latest_block(address=proposer_addr.bytes)
-                seq_num = proposer_account.keys[proposer_key_id].sequence_number if proposer_key_id < len(proposer_account.keys) else proposer_account.keys[0].sequence_number
-
-                tx = Tx(
-                    code=code,
-                    reference_block_id=block.id,
-                    payer=payer_addr,
-                    proposal_key=ProposalKey(
-                        key_address=proposer_addr,
-                        key_id=proposer_key_id,
-                        key_sequence_number=seq_num
-                    )
-                ).with_gas_limit(9999).add_arguments(*cadence_args)
-
-                for auth_addr, auth_key_id, auth_signer in authorizers:
-                    tx = tx.add_authorizers(auth_addr)
-
-                seen = set()
-                for auth_addr, auth_key_id, auth_signer in authorizers:
-                    key = (auth_addr.hex(), auth_key_id)
-                    if key not in seen:
-                        seen.add(key)
-                        if auth_addr == payer_addr and auth_key_id == payer_key_id:
-                            tx = tx.with_envelope_signature(auth_addr, auth_key_id, auth_signer)
-                        else:
-                            tx = tx.with_payload_signature(auth_addr, auth_key_id, auth_signer)
-                payer_key = (payer_addr.hex(), payer_key_id)
-                if payer_key not in seen:
-                    tx = tx.with_envelope_signature(payer_addr, payer_key_id, payer_signer)
-
-                response = await client.send_transaction(transaction=tx.to_signed_grpc())
-                tx_id = response.id.hex()
-
-                result = await client.get_transaction_result(id=response.id)
-                wait_start = time.time()
-                while result.status != 4 and (time.time() - wait_start) < 120:
-                    await asyncio.sleep(1)
-                    result = await client.get_transaction_result(id=response.id)
-                elapsed = time.time() - started
-                if result.status == 4:
+            code = self._read_cadence(transaction_path, network)
+            cadence_args = self._build_args(args, transaction_path)
+            profile_key = self._profile_key(transaction_path)
+            gas_limit = self._computation.gas_limit(*profile_key)
+            if TX_PREFLIGHT:
+                failures = await self._preflight(transaction_path, args, network, resolve_subject)
+                if failures:
+                    message = '; '.join(f['message'] for f in failures)
                     return {
-                        'success': True,
+                        'success': False,
                         'stdout': '',
-                        'stderr': '',
-                        'returncode': 0,
-                        'data': {'id': tx_id, 'status': result.status},
-                        'transaction_id': tx_id,
-                        'execution_time': elapsed,
+                        'stderr': message,
+                        'returncode': 1,
+                        'error_message': message,
+                        'error_type': 'preflight',
+                        'preflight': failures,
+                        'transaction_id': None,
+                        'execution_time': time.time() - started,
                         'command': f'flow_py send_transaction {transaction_path}'
                     }
+
+            async def sign(gas_limit: int) -> tuple:
+                async with self._proposer_slot(network, roles.get('proposer'), lambda: _resolve_account(roles.get('proposer'))) as service_key_id:
+                    proposer = resolve_account(roles.get('proposer'), service_key_id)
+                    payer = resolve_account(roles.get('payer'), service_key_id)
+                    auth_list = roles.get('authorizer')
+                    if isinstance(auth_list, list):
+                        authorizers = [resolve_account(a, service_key_id) for a in auth_list]
+                    elif auth_list:
+                        authorizers = [resolve_account(auth_list, service_key_id)]
+                    else:
+                        authorizers = [proposer]
+                    response, seq_num = await self._sign_and_submit(network, code, cadence_args, proposer, payer, authorizers, gas_limit)
+                return response, seq_num, (proposer, payer, authorizers), time.time()
+
+            submission, result = await self._submit_metered(network, sign, FINALITY_STATUS[finality], profile_key, gas_limit)
+            response, seq_num, (proposer, payer, authorizers), submitted_at = submission
+            tx_id = response.id.hex()
+            elapsed = time.time() - started
+            status = result.status if result is not None else FINALITY_STATUS['submitted']
+            touched = _touched_addresses(cadence_args, proposer, payer, authorizers)
+            if status < 4 and status != 5:
+                # Not final yet: the seal watcher settles it. It only observes this id and never
+                # re-signs, since the caller already has a result for it.
+                self._confirm_seal_later(network, submission, touched, profile_key)
+            else:
+                self._script_cache.invalidate(network, touched)
+                self._record_computation(profile_key, result)
+            error_message = result.error_message if result is not None else ''
+            if status >= FINALITY_STATUS[finality] and status != 5 and not error_message:
                 return {
-                    'success': False,
-                    'error_message': f'Transaction status: {result.status}',
+                    'success': True,
+                    'stdout': '',
+                    'stderr': '',
+                    'returncode': 0,
+                    'data': {'id': tx_id, 'status': status, 'finality': finality, 'events': _event_dicts(result)},
                     'transaction_id': tx_id,
                     'execution_time': elapsed,
-                    'stderr': f'Transaction status: {result.status}'
+                    'command': f'flow_py send_transaction {transaction_path}'
                 }
+            error_message = error_message or f'Transaction status: {status}'
+            return {
+                'success': False,
+                'data': {'id': tx_id, 'status': status, 'finality': finality, 'events': _event_dicts(result)},
+                'error_message': error_message,
+                'transaction_id': tx_id,
+                'execution_time': elapsed,
+                'stderr': error_message
+            }
         except Exception as e:
             elapsed = time.time() - started
             return {
@@ -357,23 +757,170 @@ class FlowPyAdapter:
                 'command': f'flow_py send_transaction {transaction_path}'
             }
 
+    async def _submit_pipelined(self, network: str, sign: Callable[[], Awaitable[tuple]], target_status: int) -> tuple[tuple, Any]:
+        """Submit via ``sign`` and wait for ``target_status``, re-signing after sequence number mismatches.
+
+        ``sign`` returns (response, seq_num, (proposer, payer, authorizers), submitted_at).
+        A mismatch explained by the key's queue (the tracker rolled this
+        submission back after an earlier one failed before execution, or earlier
+        submissions were still in flight) is re-signed once those earlier
+        submissions are final, up to SEQUENCE_RESIGN_LIMIT times; any other
+        mismatch gets SEQUENCE_MISMATCH_RETRIES. Re-signing only follows the old
+        submission's own final result, so it can never execute twice, and only
+        happens while the caller is still waiting here.
+        """
+        retries = {'mismatch': 0, 'resigned': 0}
+        submission = None
+        while True:
+            if submission is None:
+                try:
+                    submission = await sign()
+                except Exception as e:
+                    if self._is_resubmittable(e) and retries['mismatch'] < SEQUENCE_MISMATCH_RETRIES:
+                        retries['mismatch'] += 1
+                        continue
+                    raise
+            response, seq_num, parties, submitted_at = submission
+            if target_status <= FINALITY_STATUS['submitted']:
+                return submission, None
+            result = await self._await_status(network, response.id, target_status, submitted_at)
+            proposer_addr, proposer_key_id, _ = parties[0]
+            rolled_back = self._sequences.rolled_back(response.id)
+            earlier = self._sequences.pending_before(proposer_addr.hex(), proposer_key_id, seq_num)
+            if not self._settle_sequence(network, proposer_addr, proposer_key_id, seq_num, result, response.id):
+                return submission, result
+            if (rolled_back or earlier) and retries['resigned'] < SEQUENCE_RESIGN_LIMIT:
+                retries['resigned'] += 1
+                # Earlier submissions decide which number is next: re-sign once they are final.
+                await self._sequences.wait_settled(proposer_addr.hex(), proposer_key_id, earlier)
+            elif retries['mismatch'] < SEQUENCE_MISMATCH_RETRIES:
+                retries['mismatch'] += 1
+            else:
+                return submission, result
+            submission = None
+
+    async def _submit_metered(self, network: str, sign: Callable[[int], Awaitable[tuple]], target_status: int, profile_key: tuple, gas_limit: int) -> tuple[tuple, Any]:
+        """``_submit_pipelined`` at a derived ``gas_limit``, resubmitted once at the default limit if it runs out.
+
+        The failed transaction is final and its sequence number spent, so the
+        resubmission cannot execute it twice.
+        """
+        submission, result = await self._submit_pipelined(network, lambda: sign(gas_limit), target_status)
+        if result is None or result.status < FINALITY_STATUS['executed'] or result.status == 5 or not is_computation_limit_error(result.error_message):
+            return submission, result
+        default_limit = self._computation.default_limit
+        if gas_limit >= default_limit:
+            return submission, result
+        self._computation.record_limit_exceeded(*profile_key, gas_limit=gas_limit)
+        print(f'{profile_key[0]} ran out of computation at gas limit {gas_limit}; resubmitting at {default_limit}')
+        return await self._submit_pipelined(network, lambda: sign(default_limit), target_status)
+
+    async def _preflight(self, transaction_path: str, args: List[Any], network: str, resolve_subject: Callable[[str], str]) -> List[Dict[str, Any]]:
+        checks = checks_for(transaction_path)
+        template = self._templates.peek(transaction_path)
+        if not checks or template is None or template.params is None:
+            return []
+        try:
+            bound = bind_checks(checks, [p.name for p in template.params], args, resolve_subject)
+        except Exception as e:
+            print(f'Preflight for {os.path.basename(transaction_path)} skipped: {e}')
+            return []
+        query = CompositeQuery(self, network)
+        for b in bound:
+            query.add(b['name'], b['check'].read, b['address'])
+        # A cached or shared read may predate a credit from another process and reject a valid transaction.
+        result = await self._execute_query_async(query, use_cache=False)
+        if not result.get('success'):
+            # Preflight is advisory: if it cannot run, the chain still has the final say.
+            print(f"Preflight for {os.path.basename(transaction_path)} could not run: {result.get('error_message')}")
+            return []
+        return evaluate(bound, result['data'])
+
+    async def _sign_and_submit(self, network: str, code: str, cadence_args: List[Value], proposer: tuple, payer: tuple, authorizers: List[tuple], gas_limit: int = DEFAULT_GAS_LIMIT) -> tuple[Any, int]:
+        proposer_addr, proposer_key_id, _ = proposer
+        payer_addr, payer_key_id, payer_signer = payer
+        async with self._client(network, 'transaction') as client:
+            reference_block_id = await self._reference_block(client, network)
+            seq_num = await self._sequence_number(client, proposer_addr, proposer_key_id)
+
+            tx = Tx(
+                code=code,
+                reference_block_id=reference_block_id,
+                payer=payer_addr,
+                proposal_key=ProposalKey(
+                    key_address=proposer_addr,
+                    key_id=proposer_key_id,
+                    key_sequence_number=seq_num
+                )
+            ).with_gas_limit(gas_limit).add_arguments(*cadence_args)
+
+            for auth_addr, auth_key_id, auth_signer in authorizers:
+                tx = tx.add_authorizers(auth_addr)
+
+            seen = set()
+            for auth_addr, auth_key_id, auth_signer in authorizers:
+                key = (auth_addr.hex(), auth_key_id)
+                if key not in seen:
+                    seen.add(key)
+                    if auth_addr == payer_addr and auth_key_id == payer_key_id:
+                        tx = tx.with_envelope_signature(auth_addr, auth_key_id, auth_signer)
+                    else:
+                        tx = tx.with_payload_signature(auth_addr, auth_key_id, auth_signer)
+            payer_key = (payer_addr.hex(), payer_key_id)
+            if payer_key not in seen:
+                tx = tx.with_envelope_signature(payer_addr, payer_key_id, payer_signer)
+
+            response = await self._submit(client, tx, network, proposer_addr, proposer_key_id, seq_num)
+        self._script_cache.touch(network, _touched_addresses(cadence_args, proposer, payer, authorizers))
+        return response, seq_num
+
+    def proposal_keys(self, network: str = 'mainnet', refresh: bool = False) -> List[int]:
+        async def discover() -> List[int]:
+            pool = await self._get_proposal_key_pool(network)
+            if refresh:
+                pool.reset()
+                pool = await self._get_proposal_key_pool(network)
+            return pool.keys
+        return self._run(discover())
+
+    def add_proposal_keys(self, count: int, network: str = 'mainnet') -> Dict[str, Any]:
+        svc = self._load_service_account()
+        signer = self._service_signer()
+        sign_algo = SIGN_ALGOS.get(svc['signatureAlgorithm'], SignAlgo.ECDSA_secp256k1)
+        hash_algo = HASH_ALGOS.get(svc['hashAlgorithm'], HashAlgo.SHA2_256)
+        args = [
+            Array([UInt8(b) for b in signer.key.get_verifying_key().to_string()]),
+            UInt8(sign_algo.get_cadence_enum_value()),
+            UInt8(hash_algo.value),
+            Int(count)
+        ]
+        result = self.send_transaction(
+            'cadence/transactions/addProposalKeys.cdc', args,
+            roles={'proposer': 'mainnet-agfarms', 'authorizer': 'mainnet-agfarms', 'payer': 'mainnet-agfarms'},
+            network=network
+        )
+        if result.get('success'):
+            result['proposal_keys'] = self.proposal_keys(network, refresh=True)
+        return result
+
     def get_transaction(self, transaction_id: str, network: str = 'mainnet') -> Dict[str, Any]:
-        return asyncio.run(self._get_transaction_async(transaction_id, network))
+        return self._run(self._get_transaction_async(transaction_id, network))
+
+    async def aget_transaction(self, transaction_id: str, network: str = 'mainnet') -> Dict[str, Any]:
+        return await self._on_loop(self._get_transaction_async(transaction_id, network))
 
     async def _get_transaction_async(self, transaction_id: str, network: str) -> Dict[str, Any]:
         started = time.time()
-        host, port = _get_access_node(network)
         tx_id_bytes = bytes.fromhex(transaction_id.replace('0x', ''))
         try:
-            async with flow_client(host=host, port=port) as client:
-                result = await client.get_transaction_result(id=tx_id_bytes)
-                elapsed = time.time() - started
-                return {
-                    'success': result.status == 4,
-                    'data': {'status': result.status},
-                    'transaction_id': transaction_id,
-                    'execution_time': elapsed
-                }
+            result = await self._read(network, lambda client: client.get_transaction_result(id=tx_id_bytes))
+            elapsed = time.time() - started
+            return {
+                'success': result.status == 4,
+                'data': {'status': result.status},
+                'transaction_id': transaction_id,
+                'execution_time': elapsed
+            }
         except Exception as e:
             elapsed = time.time() - started
             return {
@@ -384,26 +931,27 @@ class FlowPyAdapter:
             }
 
     def get_account(self, address: str, network: str = 'mainnet') -> Dict[str, Any]:
-        return asyncio.run(self._get_account_async(address, network))
+        return self._run(self._get_account_async(address, network))
+
+    async def aget_account(self, address: str, network: str = 'mainnet') -> Dict[str, Any]:
+        return await self._on_loop(self._get_account_async(address, network))
 
     async def _get_account_async(self, address: str, network: str) -> Dict[str, Any]:
         started = time.time()
-        host, port = _get_access_node(network)
         addr = address if address.startswith('0x') else f'0x{address}'
         try:
-            async with flow_client(host=host, port=port) as client:
-                account = await client.get_account_at_latest_block(address=Address.from_hex(addr).bytes)
-                elapsed = time.time() - started
-                return {
-                    'success': True,
-                    'data': {
-                        'address': account.address.hex(),
-                        'balance': account.balance,
-                        'keys': [{'index': k.id, 'sequence_number': k.sequence_number} for k in account.keys],
-                        'contracts': dict(account.contracts)
-                    },
-                    'execution_time': elapsed
-                }
+            account = await self._read(network, lambda client: client.get_account_at_latest_block(address=Address.from_hex(addr).bytes))
+            elapsed = time.time() - started
+            return {
+                'success': True,
+                'data': {
+                    'address': account.address.hex(),
+                    'balance': account.balance,
+                    'keys': [{'index': k.index, 'sequence_number': k.sequence_number, 'weight': k.weight, 'revoked': k.revoked} for k in account.keys],
+                    'contracts': dict(account.contracts)
+                },
+                'execution_time': elapsed
+            }
         except Exception as e:
             elapsed = time.time() - started
             return {
@@ -412,12 +960,125 @@ class FlowPyAdapter:
                 'execution_time': elapsed
             }
 
+    async def _sequence_number(self, client: Any, address: Address, key_id: int) -> int:
+        async def fetch() -> int:
+            account = await client.get_account_at_latest_block(address=address.bytes)
+            for k in account.keys:
+                if k.index == key_id:
+                    return k.sequence_number
+            return account.keys[0].sequence_number
+        return await self._sequences.current(address.hex(), key_id, fetch)
+
+    async def _reference_block(self, client: Any, network: str) -> bytes:
+        return await self._reference_blocks.get(network, lambda: client.get_latest_block(is_sealed=True))
+
+    async def _refresh_reference_blocks(self) -> None:
+        for network in self._reference_blocks.networks():
+            try:
+                async with self._client(network) as client:
+                    await self._reference_blocks.refresh(network, lambda: client.get_latest_block(is_sealed=True))
+            except Exception:
+                self._reference_blocks.stats['refresh_errors'] += 1
+
+    def _is_resubmittable(self, exc: BaseException) -> bool:
+        return is_sequence_mismatch(str(exc)) or is_expired_error(str(exc))
+
+    async def _submit(self, client: Any, tx: Tx, network: str, proposer_addr: Address, proposer_key_id: int, seq_num: int) -> Any:
+        try:
+            response = await client.send_transaction(transaction=tx.to_signed_grpc())
+        except Exception as e:
+            if not self._sequences.in_flight(proposer_addr.hex(), proposer_key_id):
+                self._sequences.invalidate(proposer_addr.hex(), proposer_key_id, mismatch=is_sequence_mismatch(str(e)))
+            if is_expired_error(str(e)):
+                self._reference_blocks.invalidate(network)
+            raise
+        self._sequences.submitted(proposer_addr.hex(), proposer_key_id, seq_num, response.id)
+        return response
+
+    async def _await_status(self, network: str, tx_id: bytes, target_status: int, submitted_at: Optional[float] = None) -> Any:
+        return await self._tx_tracker.wait(network, tx_id, target_status, submitted_at=submitted_at)
+
+    def _confirm_seal_later(self, network: str, submission: tuple, touched: FrozenSet[str] = frozenset(), profile_key: Optional[tuple] = None) -> None:
+        task = asyncio.get_running_loop().create_task(self._confirm_seal(network, submission, touched, profile_key))
+        self._seal_tasks.add(task)
+        task.add_done_callback(self._seal_tasks.discard)
+
+    async def _confirm_seal(self, network: str, submission: tuple, touched: FrozenSet[str] = frozenset(), profile_key: Optional[tuple] = None) -> None:
+        response, seq_num, parties, submitted_at = submission
+        proposer_addr, proposer_key_id, _ = parties[0]
+        tx_id = response.id.hex()
+        try:
+            result = await self._await_status(network, response.id, FINALITY_STATUS['sealed'], submitted_at)
+            doomed = self._sequences.rolled_back(response.id)
+            mismatch = self._settle_sequence(network, proposer_addr, proposer_key_id, seq_num, result, response.id)
+            self._record_computation(profile_key, result)
+            # A rolled-back transaction never ran; whether to send it again is the caller's call.
+            rolled_back = mismatch or (doomed and result.status != 4)
+            outcome = {'status': result.status, 'error_message': result.error_message, 'sealed': result.status == 4 and not rolled_back, 'rolled_back': rolled_back}
+        except Exception as e:
+            outcome = {'status': None, 'error_message': str(e), 'sealed': False}
+        self._script_cache.invalidate(network, touched)
+        self._record_seal(tx_id, outcome)
+
+    def _record_computation(self, profile_key: Optional[tuple], result: Any) -> None:
+        if profile_key is None or result is None or result.status != FINALITY_STATUS['sealed']:
+            return
+        name, content_hash = profile_key
+        error_message = getattr(result, 'error_message', None)
+        if is_computation_limit_error(error_message):
+            self._computation.record_limit_exceeded(name, content_hash)
+            return
+        # Failed transactions stop early, so only successful runs describe a template's cost.
+        effort = execution_effort(getattr(result, 'events', None)) if not error_message else None
+        if effort is not None:
+            self._computation.record(name, effort, content_hash)
+
+    def computation_profile(self) -> Dict[str, Any]:
+        return self._computation.metrics()
+
+    def gas_limit_for(self, transaction_path: str) -> int:
+        return self._computation.gas_limit(*self._profile_key(transaction_path))
+
+    def _profile_key(self, transaction_path: str) -> tuple:
+        template = self._templates.peek(transaction_path)
+        return (os.path.basename(transaction_path), template.content_hash if template is not None else None)
+
+    def _record_seal(self, tx_id: str, outcome: Dict[str, Any]) -> None:
+        outcome['confirmed_at'] = time.time()
+        self._seal_outcomes[tx_id] = outcome
+        while len(self._seal_outcomes) > SEAL_OUTCOME_HISTORY:
+            self._seal_outcomes.popitem(last=False)
+        for callback in self._seal_callbacks.pop(tx_id, []):
+            asyncio.get_running_loop().run_in_executor(None, callback, tx_id, dict(outcome))
+
+    def seal_outcome(self, tx_id: str) -> Optional[Dict[str, Any]]:
+        outcome = self._seal_outcomes.get(tx_id)
+        return dict(outcome) if outcome is not None else None
+
+    def when_sealed(self, tx_id: str, callback: Callable[[str, Dict[str, Any]], Any]) -> None:
+        def register() -> None:
+            if tx_id in self._seal_outcomes:
+                self._loop_thread.loop.run_in_executor(None, callback, tx_id, dict(self._seal_outcomes[tx_id]))
+            else:
+                self._seal_callbacks.setdefault(tx_id, []).append(callback)
+        self._loop_thread.loop.call_soon_threadsafe(register)
+
+    def _settle_sequence(self, network: str, proposer_addr: Address, proposer_key_id: int, seq_num: int, result: Any, ref: Optional[bytes] = None) -> bool:
+        mismatch = is_sequence_mismatch(getattr(result, 'error_message', None))
+        if result.status == 5:
+            self._reference_blocks.invalidate(network)
+        if mismatch or result.status == 5:
+            self._sequences.settle(proposer_addr.hex(), proposer_key_id, seq_num, consumed=False, mismatch=mismatch, ref=ref)
+            return mismatch
+        if result.status >= 3:
+            self._sequences.settle(proposer_addr.hex(), proposer_key_id, seq_num, ref=ref)
+        return False
+
     def create_account(self, auth_id: str, network: str = 'mainnet') -> Dict[str, Any]:
-        return asyncio.run(self._create_account_async(auth_id, network))
+        return self._run(self._create_account_async(auth_id, network))
 
     async def _create_account_async(self, auth_id: str, network: str) -> Dict[str, Any]:
         started = time.time()
-        host, port = _get_access_node(network)
         svc = self._load_service_account()
         import secrets
         seed = secrets.token_hex(32)
@@ -426,69 +1087,63 @@ class FlowPyAdapter:
         private_key_hex = signer.key.to_string().hex()
         public_key_hex = public_key_bytes.hex()
         try:
-            async with self._get_tx_lock():
-                async with flow_client(host=host, port=port) as client:
-                    block = await client.get_latest_block(is_sealed=True)
-                    payer_addr = Address.from_hex(svc['address'])
-                    payer_signer = self._create_signer(svc['key'], svc['signatureAlgorithm'], svc['hashAlgorithm'])
-                    proposer_account = await client.get_account_at_latest_block(address=payer_addr.bytes)
-                    key_id = svc.get('keyId', 0)
-                    seq_num = proposer_account.keys[key_id].sequence_number if key_id < len(proposer_account.keys) else proposer_account.keys[0].sequence_number
-                    code = self._read_cadence('cadence/transactions/createAccount.cdc')
-                    cadence_args = [Array([UInt8(b) for b in public_key_bytes])]
-                    tx = Tx(
-                        code=code,
-                        reference_block_id=block.id,
-                        payer=payer_addr,
-                        proposal_key=ProposalKey(key_address=payer_addr, key_id=key_id, key_sequence_number=seq_num)
-                    ).with_gas_limit(9999).add_arguments(*cadence_args).add_authorizers(payer_addr).with_envelope_signature(payer_addr, key_id, payer_signer)
-                    response = await client.send_transaction(transaction=tx.to_signed_grpc())
-                    tx_id = response.id.hex()
-                    result = await client.get_transaction_result(id=response.id)
-                    wait_start = time.time()
-                    while result.status != 4 and (time.time() - wait_start) < 120:
-                        await asyncio.sleep(1)
-                        result = await client.get_transaction_result(id=response.id)
-                    elapsed = time.time() - started
-                    if result.status != 4:
-                        return {'success': False, 'error_message': f'Transaction status: {result.status}', 'transaction_id': tx_id, 'execution_time': elapsed}
-                    new_address = None
-                    for ev in getattr(result, 'events', []) or []:
-                        if 'AccountCreated' not in str(getattr(ev, 'type', '')):
-                            continue
-                        try:
-                            val = getattr(ev, 'value', None)
-                            if val is not None and hasattr(val, 'fields'):
-                                addr_val = val.fields.get('address') or (val.field_order and val.fields.get(val.field_order[0]))
-                                if addr_val is not None and hasattr(addr_val, 'hex'):
-                                    new_address = addr_val.hex()
+            payer_addr = Address.from_hex(svc['address'])
+            payer_signer = self._service_signer()
+            code = self._read_cadence('cadence/transactions/createAccount.cdc', network)
+            cadence_args = [Array([UInt8(b) for b in public_key_bytes])]
+            profile_key = self._profile_key('cadence/transactions/createAccount.cdc')
+            gas_limit = self._computation.gas_limit(*profile_key)
+
+            async def sign(gas_limit: int) -> tuple:
+                async with self._proposer_slot(network, svc['address']) as key_id:
+                    proposer = (payer_addr, key_id, payer_signer)
+                    response, seq_num = await self._sign_and_submit(network, code, cadence_args, proposer, proposer, [proposer], gas_limit)
+                return response, seq_num, (proposer, proposer, [proposer]), time.time()
+
+            (response, _, _, _), result = await self._submit_metered(network, sign, FINALITY_STATUS['sealed'], profile_key, gas_limit)
+            tx_id = response.id.hex()
+            self._script_cache.invalidate(network, [payer_addr])
+            self._record_computation(profile_key, result)
+            elapsed = time.time() - started
+            if result.status != 4:
+                return {'success': False, 'error_message': f'Transaction status: {result.status}', 'transaction_id': tx_id, 'execution_time': elapsed}
+            new_address = None
+            for ev in getattr(result, 'events', []) or []:
+                if 'AccountCreated' not in str(getattr(ev, 'type', '')):
+                    continue
+                try:
+                    val = getattr(ev, 'value', None)
+                    if val is not None and hasattr(val, 'fields'):
+                        addr_val = val.fields.get('address') or (val.field_order and val.fields.get(val.field_order[0]))
+                        if addr_val is not None and hasattr(addr_val, 'hex'):
+                            new_address = addr_val.hex()
+                            break
+                    payload = getattr(ev, 'payload', b'')
+                    if isinstance(payload, bytes):
+                        decoded = json.loads(payload.decode('utf-8'))
+                        v = decoded.get('value', {})
+                        fields = v.get('fields', [])
+                        for f in fields:
+                            if f.get('name') == 'address' or not new_address:
+                                fv = f.get('value', {})
+                                addr_str = fv.get('value', fv) if isinstance(fv, dict) else fv
+                                if isinstance(addr_str, str) and addr_str.startswith('0x') and len(addr_str) == 18:
+                                    new_address = addr_str
                                     break
-                            payload = getattr(ev, 'payload', b'')
-                            if isinstance(payload, bytes):
-                                decoded = json.loads(payload.decode('utf-8'))
-                                v = decoded.get('value', {})
-                                fields = v.get('fields', [])
-                                for f in fields:
-                                    if f.get('name') == 'address' or not new_address:
-                                        fv = f.get('value', {})
-                                        addr_str = fv.get('value', fv) if isinstance(fv, dict) else fv
-                                        if isinstance(addr_str, str) and addr_str.startswith('0x') and len(addr_str) == 18:
-                                            new_address = addr_str
-                                            break
-                        except Exception:
-                            pass
-                    if not new_address:
-                        return {'success': False, 'error_message': 'Could not parse AccountCreated event', 'transaction_id': tx_id, 'execution_time': elapsed}
-                    if new_address and not new_address.startswith('0x'):
-                        new_address = '0x' + new_address
-                    return {
-                        'success': True,
-                        'address': new_address,
-                        'private_key_hex': private_key_hex,
-                        'public_key_hex': public_key_hex,
-                        'transaction_id': tx_id,
-                        'execution_time': elapsed
-                    }
+                except Exception:
+                    pass
+            if not new_address:
+                return {'success': False, 'error_message': 'Could not parse AccountCreated event', 'transaction_id': tx_id, 'execution_time': elapsed}
+            if new_address and not new_address.startswith('0x'):
+                new_address = '0x' + new_address
+            return {
+                'success': True,
+                'address': new_address,
+                'private_key_hex': private_key_hex,
+                'public_key_hex': public_key_hex,
+                'transaction_id': tx_id,
+                'execution_time': elapsed
+            }
         except Exception as e:
             elapsed = time.time() - started
             return {'success': False, 'error_message': str(e), 'transaction_id': None, 'execution_time': elapsed}
@@ -0,0 +1,203 @@
+import hashlib
+import re
+import threading
+from collections import OrderedDict
+from string import Template
+from typing import Any, Dict, List, Optional, Tuple
+
+from flow_cadence_registry import CadenceTemplate, Encoder
+
+SHAPE_CACHE_SIZE = 256
+
+_NAME_RE = re.compile(r'^[A-Za-z_][A-Za-z0-9_]*$')
+
+
+class QueryRead:
+    """One kind of read a composite query can include.
+
+    ``expr`` is a Cadence expression of type ``returns`` in which ``$<param>``
+    stands for each parameter; ``helper`` is an optional function declaration
+    the expression calls, emitted once per generated script.
+    """
+
+    __slots__ = ('params', 'returns', 'imports', 'expr', 'helper')
+
+    def __init__(self, params: List[Tuple[str, str]], returns: str, imports: List[str], expr: str, helper: Optional[str] = None):
+        self.params = params
+        self.returns = returns
+        self.imports = imports
+        self.expr = Template(expr)
+        self.helper = helper
+
+
+READS: Dict[str, QueryRead] = {
+    'bait_balance': QueryRead(
+        [('address', 'Address')], 'UFix64?', ['FungibleToken', 'BaitCoin'],
+        'getAccount($address).capabilities.borrow<&{FungibleToken.Balance}>(BaitCoin.VaultPublicPath)?.balance'
+    ),
+    'flow_balance': QueryRead(
+        [('address', 'Address')], 'UFix64?', ['FungibleToken', 'FlowToken'],
+        'getAccount($address).capabilities.borrow<&{FungibleToken.Balance}>(/public/flowTokenBalance)?.balance'
+    ),
+    'bait_capabilities': QueryRead(
+        [('address', 'Address')], '[String]', ['FungibleToken', 'BaitCoin'],
+        'baitCapabilities($address)',
+        '''access(all) fun baitCapabilities(_ address: Address): [String] {
+    let account = getAccount(address)
+    let capabilities: [String] = []
+    if account.capabilities.get<&BaitCoin.Vault>(BaitCoin.VaultPublicPath).check() {
+        capabilities.append("BAIT Vault: ".concat(BaitCoin.VaultPublicPath.toString()))
+    }
+    if account.capabilities.get<&{FungibleToken.Receiver}>(BaitCoin.ReceiverPublicPath).check() {
+        capabilities.append("BAIT Receiver: ".concat(BaitCoin.ReceiverPublicPath.toString()))
+    }
+    if account.capabilities.get<&{FungibleToken.Balance}>(BaitCoin.VaultPublicPath).check() {
+        capabilities.append("BAIT Balance: ".concat(BaitCoin.VaultPublicPath.toString()))
+    }
+    return capabilities
+}'''
+    ),
+    'bait_vault_balance': QueryRead(
+        [('address', 'Address')], 'UFix64?', ['BaitCoin'],
+        'getAuthAccount<auth(BorrowValue) &Account>($address).storage.borrow<&BaitCoin.Vault>(from: BaitCoin.VaultStoragePath)?.balance'
+    ),
+    'bait_receiver': QueryRead(
+        [('address', 'Address')], 'Bool', ['FungibleToken', 'BaitCoin'],
+        'getAccount($address).capabilities.get<&{FungibleToken.Receiver}>(BaitCoin.ReceiverPublicPath).check()'
+    ),
+    'bait_admin': QueryRead(
+        [('address', 'Address')], 'Bool', ['BaitCoin'],
+        'getAuthAccount<auth(BorrowValue) &Account>($address).storage.borrow<&BaitCoin.Admin>(from: /storage/baitCoinAdmin) != nil'
+    ),
+    'usdf_vault_balance': QueryRead(
+        [('address', 'Address')], 'UFix64?', ['FungibleToken'],
+        'getAuthAccount<auth(BorrowValue) &Account>($address).storage.borrow<&{FungibleToken.Vault}>(from: /storage/usdfVault)?.balance'
+    ),
+    'usdf_receiver': QueryRead(
+        [('address', 'Address')], 'Bool', ['FungibleToken'],
+        'getAccount($address).capabilities.get<&{FungibleToken.Receiver}>(/public/usdfReceiver).check()'
+    ),
+    'contract_usdf_reserve': QueryRead(
+        [('address', 'Address')], 'UFix64?', ['FungibleToken'],
+        'getAuthAccount<auth(BorrowValue) &Account>($address).storage.borrow<&{FungibleToken.Vault}>(from: /storage/EVMVMBridgedToken_2aabea2058b5ac2d339b163c6ab6f2b6d53aabedVault)?.balance'
+    ),
+    'bait_total_supply': QueryRead([], 'UFix64', ['BaitCoin'], 'BaitCoin.totalSupply'),
+    'flow_total_supply': QueryRead([], 'UFix64', ['FlowToken'], 'FlowToken.totalSupply'),
+    'storage_used': QueryRead([('address', 'Address')], 'UInt64', [], 'getAccount($address).storage.used'),
+}
+
+Shape = Tuple[Tuple[str, str], ...]
+
+
+def generate_script(shape: Shape) -> str:
+    imports: List[str] = []
+    helpers: List[str] = []
+    params: List[str] = []
+    lines: List[str] = []
+    for i, (name, kind) in enumerate(shape):
+        read = READS[kind]
+        for contract in read.imports:
+            if contract not in imports:
+                imports.append(contract)
+        if read.helper and read.helper not in helpers:
+            helpers.append(read.helper)
+        names = {}
+        for param, type_str in read.params:
+            names[param] = f'r{i}_{param}'
+            params.append(f'{names[param]}: {type_str}')
+        lines.append(f'    result.insert(key: "{name}", {read.expr.substitute(names)})')
+    parts = [''.join(f'import "{c}"\n' for c in imports)] if imports else []
+    parts.extend(f'{h}\n' for h in helpers)
+    parts.append(
+        f'access(all) fun main({", ".join(params)}): {{String: AnyStruct}} {{\n'
+        '    let result: {String: AnyStruct} = {}\n'
+        + ''.join(f'{line}\n' for line in lines)
+        + '    return result\n'
+        '}\n'
+    )
+    return '\n'.join(parts)
+
+
+class QueryShapeCache:
+    """Generated composite scripts, keyed by their shape (read names and kinds).
+
+    Arguments are script parameters rather than literals, so every query of the
+    same shape reuses one template, one content hash and one per-network code.
+    """
+
+    def __init__(self, fallback: Optional[Encoder] = None, max_shapes: int = SHAPE_CACHE_SIZE):
+        self.fallback = fallback
+        self.max_shapes = max(1, max_shapes)
+        self._templates: 'OrderedDict[Shape, CadenceTemplate]' = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {'hits': 0, 'generated': 0, 'evictions': 0}
+
+    def template(self, shape: Shape) -> CadenceTemplate:
+        with self._lock:
+            template = self._templates.get(shape)
+            if template is not None:
+                self._templates.move_to_end(shape)
+                self.stats['hits'] += 1
+                return template
+        source = generate_script(shape)
+        template = CadenceTemplate(f'<query {hashlib.sha256(source.encode()).hexdigest()[:12]}>', source, self.fallback)
+        with self._lock:
+            self._templates[shape] = template
+            self.stats['generated'] += 1
+            while len(self._templates) > self.max_shapes:
+                self._templates.popitem(last=False)
+                self.stats['evictions'] += 1
+        return template
+
+    def metrics(self) -> Dict[str, Any]:
+        return {'shapes': len(self._templates), **self.stats}
+
+
+class CompositeQuery:
+    """Named reads collected into one generated script and one round trip.
+
+        result = adapter.query().add('bait', 'bait_balance', addr).add('supply', 'bait_total_supply').execute()
+        result['data']  # {'bait': Decimal(...), 'supply': Decimal(...)}
+
+    A read that finds nothing (no vault, no capability) yields None under its
+    name rather than failing the whole query.
+    """
+
+    def __init__(self, adapter: Any, network: str = 'mainnet', block_height: Optional[int] = None):
+        self._adapter = adapter
+        self.network = network
+        self.block_height = block_height
+        self._reads: List[Tuple[str, str]] = []
+        self._args: List[Any] = []
+
+    def add(self, name: str, kind: str, *args: Any) -> 'CompositeQuery':
+        read = READS.get(kind)
+        if read is None:
+            raise ValueError(f"Unknown read '{kind}'; expected one of {', '.join(READS)}")
+        if not _NAME_RE.match(name):
+            raise ValueError(f'Invalid read name {name!r}')
+        if any(name == existing for existing, _ in self._reads):
+            raise ValueError(f"Duplicate read name '{name}'")
+        if len(args) != len(read.params):
+            expected = ', '.join(f'{p}: {t}' for p, t in read.params)
+            raise ValueError(f'{kind} expects {len(read.params)} argument(s) ({expected}), got {len(args)}')
+        self._reads.append((name, kind))
+        self._args.extend(args)
+        return self
+
+    @property
+    def shape(self) -> Shape:
+        return tuple(self._reads)
+
+    @property
+    def args(self) -> List[Any]:
+        return list(self._args)
+
+    def __len__(self) -> int:
+        return len(self._reads)
+
+    def execute(self) -> Dict[str, Any]:
+        return self._adapter.execute_query(self)
+
+    async def aexecute(self) -> Dict[str, Any]:
+        return await self._adapter.aexecute_query(self)
@@ -0,0 +1,115 @@
+import asyncio
+import os
+import time
+from typing import Any, Dict, Optional, Tuple
+
+from grpclib.const import Status
+from grpclib.exceptions import GRPCError
+
+DEFAULT_RATES = {
+    'script': (float(os.getenv('FLOW_SCRIPT_RATE_LIMIT', '20')), float(os.getenv('FLOW_SCRIPT_RATE_LIMIT_MAX', '100'))),
+    'transaction': (float(os.getenv('FLOW_TRANSACTION_RATE_LIMIT', '20')), float(os.getenv('FLOW_TRANSACTION_RATE_LIMIT_MAX', '100'))),
+}
+MIN_RATE = 1.0
+DECREASE_FACTOR = 0.5
+INCREASE_STEP = 1.0
+ADJUST_INTERVAL = 1.0
+
+
+def is_throttled(exc: BaseException) -> bool:
+    return isinstance(exc, GRPCError) and exc.status == Status.RESOURCE_EXHAUSTED
+
+
+class TokenBucket:
+    """Token bucket whose rate adapts AIMD-style to access node throttling.
+
+    ``acquire`` reserves a token and then sleeps off any deficit, so callers
+    queue on time rather than on a lock. While callers are being delayed and
+    calls succeed, the rate grows by ``INCREASE_STEP`` at most once per
+    ``ADJUST_INTERVAL`` up to ``max_rate``; a RESOURCE_EXHAUSTED answer halves
+    it (again at most once per interval).
+    """
+
+    def __init__(self, rate: float, max_rate: float, min_rate: float = MIN_RATE):
+        self.min_rate = min_rate
+        self.max_rate = max(rate, max_rate)
+        self.rate = max(min_rate, rate)
+        self.tokens = self.rate
+        self._updated_at = time.monotonic()
+        self._increased_at = self._updated_at
+        self._decreased_at = float('-inf')
+        self._constrained = False
+        self.stats = {'acquired': 0, 'delayed': 0, 'throttled': 0, 'decreases': 0}
+
+    def _refill(self, now: float) -> None:
+        self.tokens = min(self.rate, self.tokens + (now - self._updated_at) * self.rate)
+        self._updated_at = now
+
+    def reserve(self) -> float:
+        now = time.monotonic()
+        self._refill(now)
+        self.tokens -= 1
+        self.stats['acquired'] += 1
+        if self.tokens >= 0:
+            return 0.0
+        self.stats['delayed'] += 1
+        self._constrained = True
+        return -self.tokens / self.rate
+
+    async def acquire(self) -> None:
+        delay = self.reserve()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    def succeeded(self) -> None:
+        now = time.monotonic()
+        if self._constrained and self.rate < self.max_rate and now - self._increased_at >= ADJUST_INTERVAL:
+            self._refill(now)
+            self.rate = min(self.max_rate, self.rate + INCREASE_STEP)
+            self._increased_at = now
+            self._constrained = False
+
+    def throttled(self) -> None:
+        now = time.monotonic()
+        self.stats['throttled'] += 1
+        if now - self._decreased_at < ADJUST_INTERVAL:
+            return
+        self._refill(now)
+        self.rate = max(self.min_rate, self.rate * DECREASE_FACTOR)
+        self.tokens = min(self.tokens, 0.0)
+        self._decreased_at = now
+        self._increased_at = now
+        self.stats['decreases'] += 1
+
+
+class AdaptiveRateLimiter:
+    """Token buckets per (access node, call class), shared by every adapter call."""
+
+    def __init__(self, rates: Optional[Dict[str, Tuple[float, float]]] = None):
+        self.rates = dict(rates or DEFAULT_RATES)
+        self._buckets: Dict[Tuple[Tuple[str, int], str], TokenBucket] = {}
+
+    def bucket(self, endpoint: Tuple[str, int], kind: str) -> TokenBucket:
+        key = (endpoint, kind)
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            rate, max_rate = self.rates.get(kind) or self.rates['script']
+            bucket = TokenBucket(rate, max_rate)
+            self._buckets[key] = bucket
+        return bucket
+
+    async def acquire(self, endpoint: Tuple[str, int], kind: str) -> None:
+        await self.bucket(endpoint, kind).acquire()
+
+    def observe(self, endpoint: Tuple[str, int], kind: str, exc: Optional[BaseException] = None) -> None:
+        bucket = self.bucket(endpoint, kind)
+        if exc is None:
+            bucket.succeeded()
+        elif is_throttled(exc):
+            bucket.throttled()
+
+    def metrics(self) -> Dict[str, Any]:
+        return {
+            f'{host}:{port}/{kind}': {'rate': round(b.rate, 2), 'max_rate': b.max_rate, 'tokens': round(b.tokens, 2), **b.stats}
+            for ((host, port), kind), b in self._buckets.items()
+        }
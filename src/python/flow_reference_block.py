@@ -0,0 +1,73 @@
+import asyncio
+import re
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+DEFAULT_MAX_AGE = 60.0
+
+_EXPIRED_PATTERNS = (
+    re.compile(r'expired', re.IGNORECASE),
+    re.compile(r'reference block', re.IGNORECASE),
+)
+
+
+def is_expired_error(message: Optional[str]) -> bool:
+    if not message:
+        return False
+    return any(p.search(message) for p in _EXPIRED_PATTERNS)
+
+
+class ReferenceBlockCache:
+    """Most recent sealed block id per network, used as tx reference_block_id.
+
+    A background task keeps entries fresh; readers only fetch inline when an
+    entry is missing or older than ``max_age`` (a reference block is valid for
+    ~600 blocks, so a few seconds of staleness is harmless).
+    """
+
+    def __init__(self, max_age: float = DEFAULT_MAX_AGE):
+        self.max_age = max_age
+        self._blocks: Dict[str, Tuple[bytes, int, float]] = {}
+        self._locks: Dict[str, asyncio.Lock] = {}
+        self.stats = {'hits': 0, 'misses': 0, 'refreshes': 0, 'forced': 0, 'refresh_errors': 0}
+
+    def networks(self) -> List[str]:
+        return list(self._blocks.keys())
+
+    def height(self, network: str) -> Optional[int]:
+        entry = self._blocks.get(network)
+        return entry[1] if entry is not None else None
+
+    def update(self, network: str, block_id: bytes, height: int) -> None:
+        current = self._blocks.get(network)
+        if current is not None and current[1] > height:
+            return
+        self._blocks[network] = (block_id, height, time.time())
+
+    def invalidate(self, network: str) -> None:
+        if self._blocks.pop(network, None) is not None:
+            self.stats['forced'] += 1
+
+    async def get(self, network: str, fetch: Callable[[], Awaitable[Any]]) -> bytes:
+        entry = self._blocks.get(network)
+        if entry is not None and time.time() - entry[2] <= self.max_age:
+            self.stats['hits'] += 1
+            return entry[0]
+        lock = self._locks.setdefault(network, asyncio.Lock())
+        async with lock:
+            entry = self._blocks.get(network)
+            if entry is None or time.time() - entry[2] > self.max_age:
+                self.stats['misses'] += 1
+                await self.refresh(network, fetch)
+                entry = self._blocks[network]
+            return entry[0]
+
+    async def refresh(self, network: str, fetch: Callable[[], Awaitable[Any]]) -> None:
+        block = await fetch()
+        self.update(network, block.id, block.height)
+        self.stats['refreshes'] += 1
+
+    def metrics(self) -> Dict[str, Any]:
+        now = time.time()
+        blocks = {network: {'height': height, 'age': round(now - fetched_at, 3)} for network, (_, height, fetched_at) in self._blocks.items()}
+        return {'blocks': blocks, 'max_age': self.max_age, **self.stats}
@@ -0,0 +1,195 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, FrozenSet, Hashable, Iterable, Optional, Tuple
+
+from flow_py_sdk.cadence import Address, Array, Dictionary, Optional as OptionalValue
+
+DEFAULT_MAX_BLOCKS = int(os.getenv('FLOW_SCRIPT_CACHE_MAX_BLOCKS', '3'))
+DEFAULT_MAX_AGE_MS = float(os.getenv('FLOW_SCRIPT_CACHE_MAX_AGE_MS', '3000'))
+DEFAULT_MAX_ENTRIES = int(os.getenv('FLOW_SCRIPT_CACHE_SIZE', '4096'))
+DEFAULT_MAX_PINNED = int(os.getenv('FLOW_PINNED_SCRIPT_CACHE_SIZE', '16384'))
+PENDING_WRITE_HOLD = 60.0
+
+ScriptKey = Tuple[str, Tuple[bytes, ...], str]
+
+
+def addresses_in(values: Iterable[Any]) -> FrozenSet[str]:
+    found = set()
+    stack = list(values)
+    while stack:
+        v = stack.pop()
+        if isinstance(v, Address):
+            found.add(v.hex())
+        elif isinstance(v, Array):
+            stack.extend(v.value)
+        elif isinstance(v, OptionalValue) and v.value is not None:
+            stack.append(v.value)
+        elif isinstance(v, Dictionary):
+            for kv in v.value:
+                stack.append(kv.key)
+                stack.append(kv.value)
+    return frozenset(found)
+
+
+def _normalize(address: Any) -> str:
+    if isinstance(address, Address):
+        return address.hex()
+    return str(address).lower().replace('0x', '').zfill(16)
+
+
+class _Entry:
+    __slots__ = ('result', 'network', 'addresses', 'height', 'stored_at')
+
+    def __init__(self, result: Dict[str, Any], network: str, addresses: FrozenSet[str], height: Optional[int], stored_at: float):
+        self.result = result
+        self.network = network
+        self.addresses = addresses
+        self.height = height
+        self.stored_at = stored_at
+
+
+class ScriptResultCache:
+    """Read-through cache of successful script results.
+
+    Keyed by (template hash, encoded arguments, network). An entry is served
+    while it is younger than ``max_age_ms`` and, when the sealed height is
+    known, no more than ``max_blocks`` sealed blocks old; either bound set to
+    0 disables caching. Transactions ``touch`` the addresses they involve:
+    matching entries are dropped and those addresses are not cached again until
+    the transaction is final (``invalidate``) or ``PENDING_WRITE_HOLD`` passes.
+    A per-address version guards against a read that started before a write
+    storing its stale result after it.
+
+    Results of scripts pinned to a block height or id are immutable and live in
+    a separate LRU (``get_pinned``/``put_pinned``) with no expiry at all.
+    """
+
+    def __init__(self, max_blocks: int = DEFAULT_MAX_BLOCKS, max_age_ms: float = DEFAULT_MAX_AGE_MS, max_entries: int = DEFAULT_MAX_ENTRIES, max_pinned: int = DEFAULT_MAX_PINNED):
+        self.max_blocks = max_blocks
+        self.max_age = max_age_ms / 1000.0
+        self.max_entries = max(1, max_entries)
+        self._entries: 'OrderedDict[ScriptKey, _Entry]' = OrderedDict()
+        self._by_address: Dict[Tuple[str, str], set] = {}
+        self._versions: Dict[Tuple[str, str], int] = {}
+        self._pending: Dict[Tuple[str, str], float] = {}
+        self.max_pinned = max(1, max_pinned)
+        self._pinned: 'OrderedDict[Hashable, Dict[str, Any]]' = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {'hits': 0, 'misses': 0, 'stores': 0, 'expired': 0, 'invalidated': 0, 'evictions': 0, 'skipped': 0, 'pinned_hits': 0, 'pinned_misses': 0}
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_blocks > 0 and self.max_age > 0
+
+    def get(self, key: ScriptKey, height: Optional[int] = None) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.stats['misses'] += 1
+                return None
+            stale = time.monotonic() - entry.stored_at > self.max_age
+            if not stale and height is not None and entry.height is not None:
+                stale = height - entry.height > self.max_blocks
+            if stale:
+                self._drop(key)
+                self.stats['expired'] += 1
+                self.stats['misses'] += 1
+                return None
+            self._entries.move_to_end(key)
+            self.stats['hits'] += 1
+            return entry.result
+
+    def get_pinned(self, key: Hashable) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            result = self._pinned.get(key)
+            if result is None:
+                self.stats['pinned_misses'] += 1
+                return None
+            self._pinned.move_to_end(key)
+            self.stats['pinned_hits'] += 1
+            return result
+
+    def put_pinned(self, key: Hashable, result: Dict[str, Any]) -> None:
+        with self._lock:
+            self._pinned[key] = result
+            self._pinned.move_to_end(key)
+            while len(self._pinned) > self.max_pinned:
+                self._pinned.popitem(last=False)
+
+    def versions(self, network: str, addresses: FrozenSet[str]) -> Tuple[int, ...]:
+        return tuple(self._versions.get((network, a), 0) for a in sorted(addresses))
+
+    def put(self, key: ScriptKey, result: Dict[str, Any], addresses: FrozenSet[str], versions: Tuple[int, ...], height: Optional[int] = None) -> bool:
+        network = key[2]
+        now = time.monotonic()
+        with self._lock:
+            if self.versions(network, addresses) != versions or any(self._pending.get((network, a), 0) > now for a in addresses):
+                self.stats['skipped'] += 1
+                return False
+            if key in self._entries:
+                self._drop(key)
+            self._entries[key] = _Entry(result, network, addresses, height, now)
+            for a in addresses:
+                self._by_address.setdefault((network, a), set()).add(key)
+            self.stats['stores'] += 1
+            while len(self._entries) > self.max_entries:
+                self._drop(next(iter(self._entries)))
+                self.stats['evictions'] += 1
+            return True
+
+    def _drop(self, key: ScriptKey) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        for a in entry.addresses:
+            keys = self._by_address.get((entry.network, a))
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._by_address[(entry.network, a)]
+
+    def _invalidate(self, network: str, addresses: Iterable[Any], pending_until: Optional[float]) -> int:
+        dropped = 0
+        with self._lock:
+            for a in {_normalize(a) for a in addresses}:
+                slot = (network, a)
+                self._versions[slot] = self._versions.get(slot, 0) + 1
+                if pending_until is None:
+                    self._pending.pop(slot, None)
+                else:
+                    self._pending[slot] = pending_until
+                for key in list(self._by_address.get(slot, ())):
+                    self._drop(key)
+                    dropped += 1
+            if len(self._pending) > self.max_entries:
+                now = time.monotonic()
+                self._pending = {slot: until for slot, until in self._pending.items() if until > now}
+            self.stats['invalidated'] += dropped
+        return dropped
+
+    def touch(self, network: str, addresses: Iterable[Any], hold: float = PENDING_WRITE_HOLD) -> int:
+        return self._invalidate(network, addresses, time.monotonic() + hold)
+
+    def invalidate(self, network: str, addresses: Iterable[Any]) -> int:
+        return self._invalidate(network, addresses, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._by_address.clear()
+            self._pinned.clear()
+
+    def metrics(self) -> Dict[str, Any]:
+        lookups = self.stats['hits'] + self.stats['misses']
+        now = time.monotonic()
+        return {
+            'size': len(self._entries),
+            'pinned_size': len(self._pinned),
+            'max_blocks': self.max_blocks,
+            'max_age_ms': self.max_age * 1000,
+            'hit_ratio': round(self.stats['hits'] / lookups, 4) if lookups else None,
+            'pending_write_addresses': sum(1 for until in self._pending.values() if until > now),
+            **self.stats
+        }
@@ -0,0 +1,131 @@
+import asyncio
+import re
+from typing import Any, Awaitable, Callable, Dict, Hashable, List, Optional, Set, Tuple
+
+SETTLE_WAIT_TIMEOUT = 600.0
+
+_MISMATCH_PATTERNS = (
+    re.compile(r'sequence number', re.IGNORECASE),
+    re.compile(r'error code: 1007', re.IGNORECASE),
+)
+
+
+def is_sequence_mismatch(message: Optional[str]) -> bool:
+    if not message:
+        return False
+    return any(p.search(message) for p in _MISMATCH_PATTERNS)
+
+
+class SequenceTracker:
+    """Local proposal key sequence numbers, keyed by (address, key_id).
+
+    Numbers are fetched from chain once and then advanced locally after each
+    accepted submission, so a transaction needs no account lookup before signing.
+    Callers must hold the proposer slot for the key (lease or lock) between
+    ``current`` and ``submitted``; the slot can be released as soon as the
+    access node accepts the transaction, so several transactions with
+    consecutive numbers may be in flight on one key. When one of them fails
+    before execution its number was never consumed, and ``settle`` rewinds the
+    key so the next submission reuses it. Every submission still in flight
+    behind the failed number is marked ``rolled_back``: its mismatch is expected
+    and it should be re-signed once its own result is final.
+    """
+
+    def __init__(self):
+        self._seq: Dict[Tuple[str, int], int] = {}
+        self._locks: Dict[Tuple[str, int], asyncio.Lock] = {}
+        self._in_flight: Dict[Tuple[str, int], Dict[Hashable, int]] = {}
+        self._rolled_back: Set[Hashable] = set()
+        self._waiters: Dict[Hashable, asyncio.Event] = {}
+        self.stats = {'hits': 0, 'resyncs': 0, 'mismatches': 0, 'rewinds': 0, 'rolled_back': 0}
+
+    @staticmethod
+    def _key(address: str, key_id: int) -> Tuple[str, int]:
+        return (address.lower().replace('0x', ''), int(key_id))
+
+    def peek(self, address: str, key_id: int) -> Optional[int]:
+        return self._seq.get(self._key(address, key_id))
+
+    async def current(self, address: str, key_id: int, fetch: Callable[[], Awaitable[int]]) -> int:
+        key = self._key(address, key_id)
+        if key in self._seq:
+            self.stats['hits'] += 1
+            return self._seq[key]
+        lock = self._locks.setdefault(key, asyncio.Lock())
+        async with lock:
+            if key not in self._seq:
+                self._seq[key] = await fetch()
+                self.stats['resyncs'] += 1
+            return self._seq[key]
+
+    def advance(self, address: str, key_id: int) -> None:
+        key = self._key(address, key_id)
+        if key in self._seq:
+            self._seq[key] += 1
+
+    def submitted(self, address: str, key_id: int, seq: int, ref: Optional[Hashable] = None) -> None:
+        """Record an accepted submission; ``ref`` (the transaction id) tells apart submissions reusing a number."""
+        key = self._key(address, key_id)
+        self._seq[key] = seq + 1
+        self._in_flight.setdefault(key, {})[ref if ref is not None else object()] = seq
+
+    def in_flight(self, address: str, key_id: int) -> int:
+        return len(self._in_flight.get(self._key(address, key_id), ()))
+
+    def rolled_back(self, ref: Hashable) -> bool:
+        return ref in self._rolled_back
+
+    def pending_before(self, address: str, key_id: int, seq: int) -> List[Hashable]:
+        return [ref for ref, pending_seq in self._in_flight.get(self._key(address, key_id), {}).items() if pending_seq < seq]
+
+    async def wait_settled(self, address: str, key_id: int, refs: List[Hashable], timeout: float = SETTLE_WAIT_TIMEOUT) -> bool:
+        """Wait until every submission in ``refs`` has a final result; False if ``timeout`` ran out first."""
+        pending = self._in_flight.get(self._key(address, key_id), {})
+        events = [self._waiters.setdefault(ref, asyncio.Event()) for ref in refs if ref in pending]
+        try:
+            await asyncio.wait_for(asyncio.gather(*(e.wait() for e in events)), timeout)
+        except asyncio.TimeoutError:
+            return False
+        return True
+
+    def settle(self, address: str, key_id: int, seq: int, consumed: bool = True, mismatch: bool = False, ref: Optional[Hashable] = None) -> None:
+        key = self._key(address, key_id)
+        pending = self._in_flight.get(key)
+        if pending is not None:
+            if ref is None or ref not in pending:
+                ref = next((r for r, s in pending.items() if s == seq), None)
+            if ref is not None:
+                del pending[ref]
+                self._rolled_back.discard(ref)
+                waiter = self._waiters.pop(ref, None)
+                if waiter is not None:
+                    waiter.set()
+            if not pending:
+                del self._in_flight[key]
+        if consumed:
+            return
+        if mismatch and not self.in_flight(address, key_id):
+            self.invalidate(address, key_id, mismatch=True)
+            return
+        if mismatch:
+            self.stats['mismatches'] += 1
+        self.rewind(address, key_id, seq)
+
+    def rewind(self, address: str, key_id: int, seq: int) -> None:
+        key = self._key(address, key_id)
+        if key in self._seq and self._seq[key] > seq:
+            self._seq[key] = seq
+            self.stats['rewinds'] += 1
+        for ref, pending_seq in self._in_flight.get(key, {}).items():
+            if pending_seq > seq and ref not in self._rolled_back:
+                self._rolled_back.add(ref)
+                self.stats['rolled_back'] += 1
+
+    def invalidate(self, address: str, key_id: int, mismatch: bool = False) -> None:
+        self._seq.pop(self._key(address, key_id), None)
+        if mismatch:
+            self.stats['mismatches'] += 1
+
+    def metrics(self) -> Dict[str, Any]:
+        in_flight = sum(len(pending) for pending in self._in_flight.values())
+        return {'tracked_keys': len(self._seq), 'in_flight': in_flight, **self.stats}
@@ -0,0 +1,93 @@
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from flow_py_sdk.signer import InMemorySigner
+
+DEFAULT_MAX_SIGNERS = int(os.getenv('FLOW_SIGNER_CACHE_SIZE', '1024'))
+DEFAULT_SIGNER_TTL = float(os.getenv('FLOW_SIGNER_CACHE_TTL', '3600'))
+
+SignerKey = Tuple[str, int, str, str]
+
+
+class _CachedSigner:
+    __slots__ = ('signer', 'fingerprint', 'expires_at')
+
+    def __init__(self, signer: InMemorySigner, fingerprint: Optional[bytes], expires_at: float):
+        self.signer = signer
+        self.fingerprint = fingerprint
+        self.expires_at = expires_at
+
+
+def _fingerprint(private_key_hex: str) -> bytes:
+    return hashlib.sha256(private_key_hex.encode()).digest()
+
+
+class SignerCache:
+    """Bounded LRU of ready InMemorySigners keyed by (address, key index, algorithms).
+
+    Entries expire after ``ttl`` seconds so rotated key files are picked up, and
+    can be dropped explicitly with ``invalidate``. When the caller already holds
+    the private key (wallet keys from the database) a fingerprint of it is
+    compared, so a rotated key never signs with the old signer.
+    """
+
+    def __init__(self, factory: Callable[[str, str, str], InMemorySigner], max_size: int = DEFAULT_MAX_SIGNERS, ttl: float = DEFAULT_SIGNER_TTL):
+        self._factory = factory
+        self.max_size = max(1, max_size)
+        self.ttl = ttl
+        self._entries: 'OrderedDict[SignerKey, _CachedSigner]' = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {'hits': 0, 'misses': 0, 'evictions': 0, 'expired': 0, 'rotations': 0}
+
+    @staticmethod
+    def _key(address: str, key_id: int, signature_algo: str, hash_algo: str) -> SignerKey:
+        return (address.lower().replace('0x', ''), int(key_id), signature_algo, hash_algo)
+
+    def get(self, address: str, key_id: int, signature_algo: str, hash_algo: str, load_key: Optional[Callable[[], str]] = None, private_key_hex: Optional[str] = None) -> InMemorySigner:
+        key = self._key(address, key_id, signature_algo, hash_algo)
+        fingerprint = _fingerprint(private_key_hex) if private_key_hex is not None else None
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if entry.expires_at <= now:
+                    self.stats['expired'] += 1
+                elif fingerprint is not None and entry.fingerprint != fingerprint:
+                    self.stats['rotations'] += 1
+                else:
+                    self._entries.move_to_end(key)
+                    self.stats['hits'] += 1
+                    return entry.signer
+            self.stats['misses'] += 1
+        if private_key_hex is None:
+            if load_key is None:
+                raise ValueError(f'No private key available for {address} key {key_id}')
+            private_key_hex = load_key()
+            fingerprint = _fingerprint(private_key_hex)
+        signer = self._factory(private_key_hex, signature_algo, hash_algo)
+        with self._lock:
+            self._entries[key] = _CachedSigner(signer, fingerprint, now + self.ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.stats['evictions'] += 1
+        return signer
+
+    def invalidate(self, address: str, key_id: Optional[int] = None) -> int:
+        addr = address.lower().replace('0x', '')
+        with self._lock:
+            stale = [k for k in self._entries if k[0] == addr and (key_id is None or k[1] == key_id)]
+            for k in stale:
+                del self._entries[k]
+        return len(stale)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def metrics(self) -> Dict[str, Any]:
+        return {'size': len(self._entries), 'max_size': self.max_size, 'ttl': self.ttl, **self.stats}
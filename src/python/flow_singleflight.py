@@ -0,0 +1,34 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable
+
+
+class SingleFlight:
+    """Coalesces identical concurrent calls into one in-flight request.
+
+    The first caller for a key starts ``fn``; callers arriving while it runs
+    await the same task and get the same result or exception. The task is
+    shielded, so a caller that gives up (timeout, cancellation) does not cancel
+    the request for the others. Nothing is kept once the call completes.
+    """
+
+    def __init__(self):
+        self._calls: Dict[Hashable, asyncio.Task] = {}
+        self.stats = {'calls': 0, 'leaders': 0, 'shared': 0}
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        self.stats['calls'] += 1
+        task = self._calls.get(key)
+        if task is None:
+            self.stats['leaders'] += 1
+            task = asyncio.ensure_future(fn())
+            self._calls[key] = task
+            task.add_done_callback(lambda t: self._calls.pop(key, None) if self._calls.get(key) is t else None)
+        else:
+            self.stats['shared'] += 1
+        return await asyncio.shield(task)
+
+    def in_flight(self) -> int:
+        return len(self._calls)
+
+    def metrics(self) -> Dict[str, Any]:
+        return {'in_flight': self.in_flight(), **self.stats}
@@ -0,0 +1,152 @@
+import asyncio
+import time
+from collections import deque
+from typing import Any, AsyncContextManager, Callable, Deque, Dict, List, Optional, Tuple
+
+EXPIRED_STATUS = 5
+DEFAULT_TICK = 0.5
+DEFAULT_MAX_POLLS_PER_TICK = 10
+DEFAULT_MAX_INTERVAL = 4.0
+DEFAULT_TIMEOUT = 120.0
+SAMPLE_WINDOW = 200
+
+
+class _Pending:
+    __slots__ = ('tx_id', 'submitted_at', 'waiters', 'next_poll_at', 'late_polls', 'last_result', 'reached')
+
+    def __init__(self, tx_id: bytes, submitted_at: float, next_poll_at: float):
+        self.tx_id = tx_id
+        self.submitted_at = submitted_at
+        self.waiters: List[Tuple[int, asyncio.Future]] = []
+        self.next_poll_at = next_poll_at
+        self.late_polls = 0
+        self.last_result: Any = None
+        self.reached = 0
+
+
+class TransactionStatusTracker:
+    """Single poller per network that resolves every in-flight transaction wait.
+
+    Callers ``await wait(network, tx_id, target_status)``; the tracker polls the
+    outstanding ids on one schedule, at most ``max_polls_per_tick`` results per
+    tick, so access node QPS is bounded by time rather than by how many
+    transactions are in flight. Each id is first polled around the observed
+    median time to reach the awaited status, then with a short backoff.
+    The SDK exposes no streaming subscription, so polling is the only source.
+    """
+
+    def __init__(self, client_factory: Callable[[str], AsyncContextManager[Any]], tick: float = DEFAULT_TICK, max_polls_per_tick: int = DEFAULT_MAX_POLLS_PER_TICK, max_interval: float = DEFAULT_MAX_INTERVAL, timeout: float = DEFAULT_TIMEOUT):
+        self._client_factory = client_factory
+        self.tick = tick
+        self.max_polls_per_tick = max(1, max_polls_per_tick)
+        self.max_interval = max_interval
+        self.timeout = timeout
+        self._pending: Dict[str, Dict[bytes, _Pending]] = {}
+        self._pollers: Dict[str, asyncio.Task] = {}
+        self._samples: Dict[int, Deque[float]] = {}
+        self.stats = {'waits': 0, 'polls': 0, 'poll_errors': 0, 'resolved': 0, 'timeouts': 0}
+
+    def expected_time(self, status: int, quantile: float = 0.5) -> Optional[float]:
+        samples = self._samples.get(status)
+        if not samples:
+            return None
+        ordered = sorted(samples)
+        return ordered[min(len(ordered) - 1, int(quantile * len(ordered)))]
+
+    def in_flight(self) -> int:
+        return sum(len(entries) for entries in self._pending.values())
+
+    async def wait(self, network: str, tx_id: bytes, target_status: int, timeout: Optional[float] = None, submitted_at: Optional[float] = None) -> Any:
+        now = time.time()
+        entries = self._pending.setdefault(network, {})
+        entry = entries.get(tx_id)
+        if entry is None:
+            entry = _Pending(tx_id, submitted_at or now, float('inf'))
+            entries[tx_id] = entry
+        if entry.last_result is not None and self._satisfies(entry.last_result, target_status):
+            return entry.last_result
+        future = asyncio.get_running_loop().create_future()
+        entry.waiters.append((target_status, future))
+        entry.next_poll_at = min(entry.next_poll_at, self._next_poll_at(entry, now))
+        self.stats['waits'] += 1
+        self._ensure_poller(network)
+        try:
+            return await asyncio.wait_for(asyncio.shield(future), timeout if timeout is not None else self.timeout)
+        except asyncio.TimeoutError:
+            self.stats['timeouts'] += 1
+            self._drop_waiter(network, entry, future)
+            if entry.last_result is not None:
+                return entry.last_result
+            return await self._fetch(network, tx_id)
+
+    @staticmethod
+    def _satisfies(result: Any, target_status: int) -> bool:
+        return result.status >= target_status
+
+    def _drop_waiter(self, network: str, entry: _Pending, future: asyncio.Future) -> None:
+        entry.waiters = [(t, f) for t, f in entry.waiters if f is not future]
+        if not entry.waiters:
+            self._pending.get(network, {}).pop(entry.tx_id, None)
+
+    def _next_poll_at(self, entry: _Pending, now: float) -> float:
+        targets = [t for t, _ in entry.waiters if t > entry.reached]
+        if targets:
+            expected = self.expected_time(min(targets))
+            if expected is not None and now < entry.submitted_at + expected:
+                return entry.submitted_at + expected
+        return now + min(self.max_interval, self.tick * (2 ** min(entry.late_polls, 4)))
+
+    def _ensure_poller(self, network: str) -> None:
+        task = self._pollers.get(network)
+        if task is None or task.done():
+            self._pollers[network] = asyncio.get_running_loop().create_task(self._poll(network))
+
+    async def _poll(self, network: str) -> None:
+        entries = self._pending.get(network, {})
+        while entries:
+            await asyncio.sleep(self.tick)
+            now = time.time()
+            due = sorted((e for e in entries.values() if e.next_poll_at <= now), key=lambda e: e.next_poll_at)[:self.max_polls_per_tick]
+            if not due:
+                continue
+            results = await asyncio.gather(*(self._fetch(network, e.tx_id) for e in due), return_exceptions=True)
+            now = time.time()
+            for entry, result in zip(due, results):
+                self.stats['polls'] += 1
+                if result is None or isinstance(result, BaseException):
+                    self.stats['poll_errors'] += 1
+                else:
+                    self._observe(entry, result, now)
+                if entry.waiters:
+                    entry.late_polls += 1
+                    entry.next_poll_at = self._next_poll_at(entry, now)
+                else:
+                    entries.pop(entry.tx_id, None)
+
+    async def _fetch(self, network: str, tx_id: bytes) -> Any:
+        # One borrow per RPC, so the access node rate limiter is charged for every poll.
+        async with self._client_factory(network) as client:
+            return await client.get_transaction_result(id=tx_id)
+
+    def _observe(self, entry: _Pending, result: Any, now: float) -> None:
+        entry.last_result = result
+        status = int(result.status)
+        if entry.reached < status < EXPIRED_STATUS:
+            for reached in range(entry.reached + 1, status + 1):
+                self._samples.setdefault(reached, deque(maxlen=SAMPLE_WINDOW)).append(now - entry.submitted_at)
+            entry.reached = status
+            entry.late_polls = 0
+        remaining = []
+        for target, future in entry.waiters:
+            if future.done():
+                continue
+            if status >= target or status == EXPIRED_STATUS:
+                future.set_result(result)
+                self.stats['resolved'] += 1
+            else:
+                remaining.append((target, future))
+        entry.waiters = remaining
+
+    def metrics(self) -> Dict[str, Any]:
+        expected = {status: {'p50': self.expected_time(status, 0.5), 'p90': self.expected_time(status, 0.9)} for status in sorted(self._samples)}
+        return {'in_flight': self.in_flight(), 'max_polls_per_tick': self.max_polls_per_tick, 'tick': self.tick, 'expected_seconds': expected, **self.stats}
@@ -12,7 +12,6 @@ import json
 import os
 import signal
 import threading
-import time
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
 from pathlib import Path
@@ -29,6 +28,9 @@ SYNC_INTERVAL = int(os.getenv('SYNC_INTERVAL', '300'))
 SUPABASE_URL = os.getenv('SUPABASE_URL')
 SUPABASE_SERVICE_KEY = os.getenv('SUPABASE_SERVICE_ROLE_KEY')
 
+def _normalize_address(address):
+    return f"0x{str(address).lower().replace('0x', '').zfill(16)}"
+
 class WalletSyncService:
     def __init__(self):
         self.flow_dir = Path("flow") if os.path.exists("flow") else Path("/app/flow")
@@ -50,6 +52,9 @@ class WalletSyncService:
             'vaults_already_exist': 0,
             'vault_creation_errors': 0,
             'flow_balance_checks': 0,
+            'health_probe_calls': 0,
+            'health_probe_errors': 0,
+            'capabilities_published': 0,
             'flow_funding_needed': 0,
             'flow_funding_success': 0,
             'flow_funding_errors': 0
@@ -61,13 +66,6 @@ class WalletSyncService:
         self.thread_accounts = {}
         self.thread_lock = threading.Lock()
         
-        # Rate limiting
-        self.last_script_time = 0
-        self.last_transaction_time = 0
-        self.script_interval = 0.2
-        self.transaction_interval = 0.02
-        self.rate_limit_lock = threading.Lock()
-        
         # File operations lock
         self.file_lock = threading.Lock()
         
@@ -89,25 +87,6 @@ class WalletSyncService:
             # Always use the main service account since it's the only one that exists
             return "mainnet-agfarms"
     
-    def _rate_limit(self, request_type):
-        with self.rate_limit_lock:
-            current_time = time.time()
-            if request_type == 'script':
-                last_time = self.last_script_time
-                interval = self.script_interval
-                self.last_script_time = current_time
-            else:
-                last_time = self.last_transaction_time
-                interval = self.transaction_interval
-                self.last_transaction_time = current_time
-            
-            time_since_last = current_time - last_time
-            if time_since_last < interval:
-                sleep_time = interval - time_since_last
-                if self.shutdown_event.wait(timeout=sleep_time):
-                    return False
-            return True
-        
     def _init_supabase(self):
         if not SUPABASE_URL or not SUPABASE_SERVICE_KEY:
             raise ValueError("Missing Supabase configuration")
@@ -267,31 +246,6 @@ class WalletSyncService:
         """Ensure a wallet record exists in the database for the given auth_id"""
         return self.supabase.table('wallet').select('*').eq('auth_id', auth_id).execute().data[0]
     
-    def _check_flow_balance(self, flow_address):
-        if not self.running:
-            raise RuntimeError("Service is not running")
-            
-        address = flow_address if flow_address.startswith('0x') else f'0x{flow_address}'
-        
-        result = self.flow_adapter.execute_script(
-            script_path="cadence/scripts/checkFlowBalance.cdc",
-            args=[address],
-            network="mainnet"
-        )
-        
-        print(f"🔍 DEBUG: Flow balance result for {address}: {result}")
-        
-        if not result.get('success', False):
-            raise RuntimeError(f"Flow balance script failed for {address}: {result.get('error_message', 'Unknown error')}")
-        
-        balance_data = result.get('data')
-        print(f"🔍 DEBUG: Balance data for {address}: {balance_data}")
-        
-        try:
-            return float(balance_data)
-        except (ValueError, TypeError) as e:
-            raise RuntimeError(f"Could not parse balance string '{balance_data}' for {address}: {e}")
-    
     def _fund_wallet(self, flow_address, amount=0.1, thread_id=None):
         if thread_id is None:
             thread_id = threading.current_thread().ident
@@ -310,49 +264,6 @@ class WalletSyncService:
         
         return result.get('success', False)
     
-    def _check_bait_vault(self, flow_address):
-        address = flow_address if flow_address.startswith('0x') else f'0x{flow_address}'
-        
-        result = self.flow_adapter.execute_script(
-            script_path="cadence/scripts/checkBaitBalance.cdc",
-            args=[address],
-            network="mainnet"
-        )
-        
-        print(f"🔍 DEBUG: Bait vault check result for {address}: {result}")
-        
-        return result.get('success', False)
-    
-    def _check_bait_balance(self, flow_address):
-        address = flow_address if flow_address.startswith('0x') else f'0x{flow_address}'
-        
-        result = self.flow_adapter.execute_script(
-            script_path="cadence/scripts/checkBaitBalance.cdc",
-            args=[address],
-            network="mainnet"
-        )
-        
-        print(f"🔍 DEBUG: Bait balance result for {address}: {result}")
-        
-        if not result.get('success', False):
-            raise RuntimeError(f"Bait balance script failed for {address}: {result.get('error_message', 'Unknown error')}")
-        
-        data = result.get('data')
-        print(f"🔍 DEBUG: Bait balance data for {address}: {data}")
-        
-        if data is None:
-            raise RuntimeError(f"No balance data returned for {address}")
-        
-        if isinstance(data, (int, float)):
-            return float(data)
-        elif isinstance(data, str):
-            try:
-                return float(data)
-            except ValueError as e:
-                raise RuntimeError(f"Could not parse bait balance string '{data}' for {address}: {e}")
-        else:
-            raise RuntimeError(f"Unexpected balance data type for {address}: {type(data)}")
-    
     def _publish_bait_balance_capability(self, flow_address, auth_id, thread_id=None):
         if thread_id is None:
             thread_id = threading.current_thread().ident
@@ -401,7 +312,21 @@ class WalletSyncService:
             pkey_file.write_text(private_key)
         return True
     
-    def _process_wallet(self, wallet):
+    def _probe_wallets(self, wallets):
+        """Fetch on-chain health for every wallet with batched checkWalletHealth.cdc calls"""
+        addresses = [w['flow_address'] for w in wallets if w.get('flow_address')]
+        if not addresses:
+            return {}
+        result = self.flow_adapter.get_wallet_health(addresses, network=NETWORK)
+        with self.stats_lock:
+            self.stats['health_probe_calls'] += result.get('script_calls', 0)
+        if not result.get('success'):
+            print(f"⚠️  Wallet health probe incomplete: {result.get('error_message')}")
+        health = result.get('data') or {}
+        print(f"🔍 Probed {len(health)}/{len(addresses)} wallets in {result.get('script_calls', 0)} script calls ({result.get('execution_time', 0):.2f}s)")
+        return health
+    
+    def _process_wallet(self, wallet, health=None):
         if not self.running:
             return None
             
@@ -424,68 +349,48 @@ class WalletSyncService:
         
         self._ensure_pkey_file(auth_id, wallet['flow_private_key'])
         
-        # Check FLOW balance
-        flow_balance = self._check_flow_balance(wallet['flow_address'])
-        with self.stats_lock:
-            self.stats['flow_balance_checks'] += 1
-        
-        # Check BaitCoin balance (this will tell us if vault exists and capability is published)
-        try:
-            bait_balance = self._check_bait_balance(wallet['flow_address'])
-            # Balance check succeeded - vault exists and capability is published
-            bait_vault_exists = True
-            cap_published = True
-        except RuntimeError as e:
-            # Balance check failed - either vault doesn't exist or capability isn't published
-            print(f"🔧 Bait balance check failed for {auth_id}: {e}")
-            print(f"🔧 Attempting to publish BaitCoin balance capability for {auth_id}...")
+        if health is None:
+            # The probe batch covering this wallet failed; leave on-chain fixes for the next pass
+            print(f"⚠️  No health record for {wallet['flow_address']}, skipping on-chain checks")
+            with self.stats_lock:
+                self.stats['health_probe_errors'] += 1
+            flow_balance = None
+            bait_vault_exists = False
+        else:
+            flow_balance = float(health['flow_balance'])
+            bait_vault_exists = health['bait_vault']
+            cap_published = health['bait_receiver'] and health['bait_balance_capability']
+            with self.stats_lock:
+                self.stats['flow_balance_checks'] += 1
             
-            if self._publish_bait_balance_capability(wallet['flow_address'], auth_id, thread_id):
-                print(f"✓ BaitCoin balance capability published for {auth_id}")
-                # Try balance check again
-                try:
-                    bait_balance = self._check_bait_balance(wallet['flow_address'])
-                    bait_vault_exists = True
-                    cap_published = True
-                except RuntimeError as e2:
-                    print(f"❌ Balance check still failed after publishing capability: {e2}")
-                    bait_vault_exists = False
-                    cap_published = False
-                    bait_balance = None
-            else:
-                # Publishing failed - vault probably doesn't exist
-                print(f"🔧 Publishing failed, creating BaitCoin vault for {auth_id}...")
+            print(f"📊 {wallet['flow_address']}")
+            print(f"   FLOW balance: {flow_balance}")
+            print(f"   Bait vault: {bait_vault_exists}")
+            print(f"   Cap published: {cap_published}")
+            print(f"   Bait balance: {health['bait_balance'] if health['bait_balance'] is not None else 'UNREADABLE'}")
+            print(f"   Storage: {health['storage_used']}/{health['storage_capacity']} bytes")
+            
+            if not bait_vault_exists:
+                print(f"🔧 Creating BaitCoin vault for {auth_id}...")
                 if self._create_bait_vault(wallet['flow_address'], auth_id, thread_id):
                     print(f"✓ BaitCoin vault created for {auth_id}")
                     with self.stats_lock:
                         self.stats['vaults_created'] += 1
-                    # Try balance check after vault creation
-                    try:
-                        bait_balance = self._check_bait_balance(wallet['flow_address'])
-                        bait_vault_exists = True
-                        cap_published = True
-                    except RuntimeError as e3:
-                        print(f"❌ Balance check failed after vault creation: {e3}")
-                        bait_vault_exists = True
-                        cap_published = False
-                        bait_balance = None
                 else:
                     print(f"❌ Failed to create BaitCoin vault for {auth_id}")
                     with self.stats_lock:
                         self.stats['vault_creation_errors'] += 1
-                    bait_vault_exists = False
-                    cap_published = False
-                    bait_balance = None
-        
-        # Log wallet status
-        print(f"📊 {wallet['flow_address']}")
-        print(f"   FLOW balance: {flow_balance}")
-        print(f"   Bait vault: {bait_vault_exists}")
-        print(f"   Cap published: {cap_published}")
-        print(f"   Bait balance: {bait_balance if bait_balance is not None else 'ERROR'}")
+            elif not cap_published:
+                print(f"🔧 Publishing BaitCoin balance capability for {auth_id}...")
+                if self._publish_bait_balance_capability(wallet['flow_address'], auth_id, thread_id):
+                    print(f"✓ BaitCoin balance capability published for {auth_id}")
+                    with self.stats_lock:
+                        self.stats['capabilities_published'] += 1
+                else:
+                    print(f"❌ Failed to publish BaitCoin balance capability for {auth_id}")
         
         # Fund FLOW if needed
-        if flow_balance < 0.075:
+        if flow_balance is not None and flow_balance < 0.075:
             print(f"💸 FLOW balance below 0.075, funding with 0.1 FLOW...")
             with self.stats_lock:
                 self.stats['flow_funding_needed'] += 1
@@ -526,14 +431,16 @@ class WalletSyncService:
         production_config = {"accounts": {}}
         
         # Use multiple threads while respecting Flow rate limits
-        # The _rate_limit method will handle the actual rate limiting
+        # FlowPyAdapter's per-node token buckets handle the actual rate limiting
         max_workers = min(3, len(wallets))  # Use up to 10 threads or number of wallets, whichever is smaller
         
+        health = self._probe_wallets(wallets)
+        
         print(f"🧵 Using {max_workers} threads to process wallets with rate limiting")
         
         with ThreadPoolExecutor(max_workers=max_workers) as executor:
             future_to_wallet = {
-                executor.submit(self._process_wallet, wallet): wallet 
+                executor.submit(self._process_wallet, wallet, health.get(_normalize_address(wallet.get('flow_address') or ''))): wallet 
                 for wallet in wallets
             }
             
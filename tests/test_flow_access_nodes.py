@@ -0,0 +1,115 @@
+import asyncio
+from contextlib import asynccontextmanager
+
+import pytest
+from grpclib.const import Status
+from grpclib.exceptions import GRPCError
+
+from flow_access_nodes import AccessNodeSet, access_nodes_for, parse_endpoints
+
+A = ('node-a', 9000)
+B = ('node-b', 9000)
+
+
+def _factory(behaviour):
+    @asynccontextmanager
+    async def client(host, port):
+        yield (host, port, behaviour)
+    return client
+
+
+async def _call(client):
+    host, port, behaviour = client
+    return await behaviour[(host, port)]()
+
+
+def test_parse_endpoints_and_env(monkeypatch):
+    assert parse_endpoints('a.example:9000, b.example ,') == [('a.example', 9000), ('b.example', 9000)]
+    monkeypatch.setenv('FLOW_ACCESS_NODES_MAINNET', 'x:1,y:2')
+    assert access_nodes_for('mainnet') == [('x', 1), ('y', 2)]
+    assert access_nodes_for('emulator') == [('127.0.0.1', 3569)]
+
+
+def test_failover_on_unavailable_and_cooldown():
+    async def down():
+        raise GRPCError(Status.UNAVAILABLE, 'down')
+
+    async def up():
+        return 'ok'
+
+    nodes = AccessNodeSet('mainnet', [A, B], _factory({A: down, B: up}))
+    assert asyncio.run(nodes.call(_call)) == 'ok'
+    assert nodes.stats['failovers'] == 1
+    assert nodes.pick().endpoint == B
+    assert nodes.metrics()['nodes']['node-a:9000']['down'] is True
+
+
+def test_application_errors_are_not_retried():
+    calls = []
+
+    async def fails():
+        calls.append(1)
+        raise ValueError('cadence error')
+
+    nodes = AccessNodeSet('mainnet', [A, B], _factory({A: fails, B: fails}))
+    with pytest.raises(ValueError):
+        asyncio.run(nodes.call(_call))
+    assert len(calls) == 1
+
+
+def test_prefers_lower_latency_node():
+    async def slow():
+        await asyncio.sleep(0.03)
+        return 'a'
+
+    async def fast():
+        return 'b'
+
+    nodes = AccessNodeSet('mainnet', [A, B], _factory({A: slow, B: fast}))
+
+    async def run():
+        for _ in range(5):
+            await nodes.call(_call)
+
+    asyncio.run(run())
+    assert nodes.pick().endpoint == B
+    assert nodes._nodes[0].ewma > nodes._nodes[1].ewma
+
+
+def test_hedged_read_returns_faster_node():
+    async def stuck():
+        await asyncio.sleep(5)
+        return 'a'
+
+    async def fast():
+        return 'b'
+
+    nodes = AccessNodeSet('mainnet', [A, B], _factory({A: stuck, B: fast}), hedge_min_delay=0.01)
+    for _ in range(20):
+        nodes._latencies.append(0.01)
+    first = nodes._nodes[0]
+
+    async def run():
+        return await asyncio.wait_for(nodes._hedged(first, _call, (A,)), 1)
+
+    assert asyncio.run(run()) == 'b'
+    assert nodes.stats['hedged'] == 1
+    assert nodes.stats['hedge_wins'] == 1
+    assert first.in_flight == 0
+    assert first.ewma > 0
+
+
+def test_throttled_read_backs_off_and_fails_over():
+    from flow_rate_limiter import AdaptiveRateLimiter
+
+    async def throttled():
+        raise GRPCError(Status.RESOURCE_EXHAUSTED, 'rate limited')
+
+    async def up():
+        return 'ok'
+
+    limiter = AdaptiveRateLimiter({'script': (10, 20)})
+    nodes = AccessNodeSet('mainnet', [A, B], _factory({A: throttled, B: up}), limiter=limiter)
+    assert asyncio.run(nodes.call(_call)) == 'ok'
+    assert limiter.metrics()['node-a:9000/script']['rate'] == 5
+    assert limiter.metrics()['node-b:9000/script']['acquired'] == 1
@@ -0,0 +1,61 @@
+import json
+import os
+
+from flow_account_directory import AccountDirectory
+
+
+def _write(path, accounts):
+    with open(path, 'w') as f:
+        json.dump({'accounts': accounts}, f)
+
+
+def test_lookup_by_name_and_address_with_file_priority(tmp_path):
+    flow_json = tmp_path / 'flow.json'
+    production = tmp_path / 'flow-production.json'
+    _write(flow_json, {
+        'e1': {'address': '179b6b1cb6755e31', 'key': '9f99'},
+        'shared': {'address': '0x01cf0e2f2f715450', 'key': {'type': 'file', 'location': 'shared.pkey', 'index': 2}}
+    })
+    _write(production, {
+        'shared': {'address': 'f8d6e0586b0a20c7'},
+        'wallet-1': {'address': '941947eccc6e9de4', 'key': {'type': 'file', 'location': 'accounts/pkeys/wallet-1.pkey', 'signatureAlgorithm': 'ECDSA_P256', 'hashAlgorithm': 'SHA3_256'}}
+    })
+    directory = AccountDirectory([str(flow_json), str(production)])
+
+    shared = directory.get('shared')
+    assert shared.address == '0x01cf0e2f2f715450'
+    assert shared.key_id == 2
+    assert directory.get('e1').key_id is None
+    wallet = directory.find_by_address('941947ECCC6E9DE4')
+    assert wallet.name == 'wallet-1'
+    assert wallet.signature_algorithm == 'ECDSA_P256'
+    assert directory.get('missing') is None
+    assert len(directory) == 3
+
+
+def test_reloads_only_when_file_changes(tmp_path):
+    production = tmp_path / 'flow-production.json'
+    _write(production, {'a': {'address': '941947eccc6e9de4'}})
+    directory = AccountDirectory([str(production)], check_interval=0)
+    assert directory.get('a') is not None
+    directory.get('a')
+    assert directory.stats['loads'] == 1
+
+    _write(production, {'a': {'address': '941947eccc6e9de4'}, 'b': {'address': '707efe31dd949d3b'}})
+    st = os.stat(production)
+    os.utime(production, (st.st_atime, st.st_mtime + 5))
+    assert directory.get('b').address == '0x707efe31dd949d3b'
+    assert directory.stats['loads'] == 2
+
+
+def test_keeps_previous_index_when_rewrite_is_partial(tmp_path):
+    production = tmp_path / 'flow-production.json'
+    _write(production, {'a': {'address': '941947eccc6e9de4'}})
+    directory = AccountDirectory([str(production)], check_interval=0)
+    assert directory.get('a') is not None
+
+    production.write_text('{"accounts": {"a": ')
+    st = os.stat(production)
+    os.utime(production, (st.st_atime, st.st_mtime + 5))
+    assert directory.get('a') is not None
+    assert directory.stats['load_errors'] == 1
@@ -0,0 +1,57 @@
+import time
+from decimal import Decimal
+
+import pytest
+from flow_py_sdk.cadence import (
+    Address, Array, Bool, Dictionary, Event, Fix64, Int, KeyValuePair, Optional, Path, Resource, String, Struct,
+    UFix64, UInt64, Void
+)
+
+from flow_cadence_decoder import decode_cadence
+
+
+def test_decodes_scalars_exactly():
+    assert decode_cadence(UFix64(150_000_000)) == Decimal('1.5')
+    assert decode_cadence(UFix64(1)) == Decimal('0.00000001')
+    assert decode_cadence(Fix64(-250_000_000)) == Decimal('-2.5')
+    assert decode_cadence(UFix64(150_000_000), fixed_point='int') == 150_000_000
+    assert decode_cadence(UFix64(150_000_000), fixed_point='float') == 1.5
+    assert decode_cadence(UInt64(2 ** 63)) == 2 ** 63
+    assert decode_cadence(String('bait')) == 'bait'
+    assert decode_cadence(Bool(False)) is False
+    assert decode_cadence(Void()) is None
+    assert decode_cadence(Address.from_hex('0xed2202de80195438')) == '0xed2202de80195438'
+    assert decode_cadence(Path('public', 'baitBalance')) == '/public/baitBalance'
+    with pytest.raises(ValueError):
+        decode_cadence(UFix64(1), fixed_point='str')
+
+
+def test_decodes_nested_containers_and_composites():
+    value = Struct('A.ed2202de80195438.BaitCoin.Info', [
+        ('owner', Address.from_hex('0x01')),
+        ('balances', Dictionary([KeyValuePair(String('bait'), UFix64(100_000_000)), KeyValuePair(String('flow'), UFix64(0))])),
+        ('tags', Array([String('a'), Optional(None), Optional(Int(3))])),
+        ('vault', Resource('A.1.Vault', [('uuid', UInt64(7))])),
+    ])
+    assert decode_cadence(value) == {
+        'owner': '0x0000000000000001',
+        'balances': {'bait': Decimal('1'), 'flow': Decimal('0')},
+        'tags': ['a', None, 3],
+        'vault': {'uuid': 7},
+    }
+    event = Event('A.1.BaitCoin.TokensDeposited', [('amount', UFix64(5)), ('to', Optional(Address.from_hex('0x02')))])
+    assert decode_cadence(event) == {'amount': Decimal('0.00000005'), 'to': '0x0000000000000002'}
+
+
+def test_decodes_large_results_quickly():
+    entries = 10_000
+    value = Dictionary([
+        KeyValuePair(Address.from_hex(f'0x{i:016x}'), Struct('A.1.S', [('balance', UFix64(i)), ('active', Bool(True))]))
+        for i in range(entries)
+    ])
+    started = time.perf_counter()
+    decoded = decode_cadence(value)
+    elapsed = time.perf_counter() - started
+    assert len(decoded) == entries
+    assert decoded[f'0x{entries - 1:016x}'] == {'balance': Decimal(entries - 1).scaleb(-8), 'active': True}
+    assert elapsed < 2.0
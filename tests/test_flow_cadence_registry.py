@@ -0,0 +1,96 @@
+import json
+import os
+from decimal import Decimal
+
+import pytest
+from flow_py_sdk.cadence import Address, Array, Dictionary, Optional, String, UFix64, UInt8
+
+from flow_cadence_registry import CadenceRegistry, compile_encoder
+
+REPO_FLOW_DIR = os.path.join(os.path.dirname(__file__), '..', 'flow')
+
+
+def _write_flow_dir(tmp_path):
+    (tmp_path / 'cadence' / 'transactions').mkdir(parents=True)
+    (tmp_path / 'cadence' / 'scripts').mkdir(parents=True)
+    (tmp_path / 'flow.json').write_text(json.dumps({
+        'contracts': {'BaitCoin': {'source': 'cadence/contracts/BaitCoin.cdc', 'aliases': {'testnet': '0x01cf0e2f2f715450'}}},
+        'dependencies': {'FungibleToken': {'aliases': {'mainnet': 'f233dcee88fe0abe'}}},
+        'accounts': {'agfarms': {'address': 'ed2202de80195438'}},
+        'deployments': {'mainnet': {'agfarms': ['BaitCoin']}}
+    }))
+    (tmp_path / 'cadence' / 'transactions' / 'send.cdc').write_text(
+        'import "FungibleToken"\nimport "BaitCoin"\n\n// transaction(ignored: String)\ntransaction(to: Address, amount: UFix64, memo: String?) {\n}\n'
+    )
+    (tmp_path / 'cadence' / 'scripts' / 'balances.cdc').write_text(
+        'access(all) fun main(owners: [Address], limits: {String: UFix64}): UFix64 {\n  return 0.0\n}\n'
+    )
+
+
+def test_preloads_and_resolves_imports_per_network(tmp_path):
+    _write_flow_dir(tmp_path)
+    registry = CadenceRegistry(str(tmp_path))
+    assert registry.preload() == 2
+
+    code = registry.code('cadence/transactions/send.cdc', 'mainnet')
+    assert 'import FungibleToken from 0xf233dcee88fe0abe' in code
+    assert 'import BaitCoin from 0xed2202de80195438' in code
+    assert registry.code('cadence/transactions/send.cdc', 'mainnet') is code
+    with pytest.raises(ValueError, match='FungibleToken'):
+        registry.code('cadence/transactions/send.cdc', 'testnet')
+    assert registry.metrics()['loads'] == 2
+
+
+def test_encodes_arguments_from_schema(tmp_path):
+    _write_flow_dir(tmp_path)
+    registry = CadenceRegistry(str(tmp_path))
+    send = registry.get('cadence/transactions/send.cdc')
+    assert [(p.name, p.type) for p in send.params] == [('to', 'Address'), ('amount', 'UFix64'), ('memo', 'String?')]
+
+    to, amount, memo = send.encode(['ed2202de80195438', '0.1', None])
+    assert to == Address.from_hex('0xed2202de80195438')
+    assert amount == UFix64(10_000_000)
+    assert memo == Optional(None)
+    _, amount, memo = send.encode(['0x1', 1.5, 'hi'])
+    assert amount == UFix64(150_000_000)
+    assert memo == Optional(String('hi'))
+
+    with pytest.raises(ValueError, match='expects 3 argument'):
+        send.encode(['0x1', '1.0'])
+    with pytest.raises(ValueError, match='8 decimal places'):
+        send.encode(['0x1', '0.000000001', None])
+    with pytest.raises(ValueError, match='amount'):
+        send.encode(['0x1', '-1', None])
+
+    owners, limits = registry.get('cadence/scripts/balances.cdc').encode([['0x1', '0x2'], {'bait': Decimal('2')}])
+    assert isinstance(owners, Array) and len(owners.value) == 2
+    assert isinstance(limits, Dictionary)
+    assert limits.value[0].value == UFix64(200_000_000)
+
+
+def test_compile_encoder_passes_values_through_and_falls_back():
+    assert compile_encoder('[UInt8]')([1, 2]) == Array([UInt8(1), UInt8(2)])
+    assert compile_encoder('UInt8')(UInt8(3)) == UInt8(3)
+    assert compile_encoder('SomeStruct', fallback=lambda v: String(str(v)))('x') == String('x')
+    with pytest.raises(TypeError):
+        compile_encoder('SomeStruct')('x')
+
+
+def test_reload_reparses_only_changed_files(tmp_path):
+    _write_flow_dir(tmp_path)
+    registry = CadenceRegistry(str(tmp_path))
+    registry.preload()
+    before = registry.get('cadence/scripts/balances.cdc')
+    (tmp_path / 'cadence' / 'transactions' / 'send.cdc').write_text('transaction(amount: UFix64) {\n}\n')
+    registry.reload()
+    assert registry.get('cadence/scripts/balances.cdc') is before
+    assert [p.name for p in registry.get('cadence/transactions/send.cdc').params] == ['amount']
+    assert registry.metrics()['parses'] == 3
+
+
+def test_repo_templates_all_parse():
+    registry = CadenceRegistry(REPO_FLOW_DIR)
+    assert registry.preload() > 0
+    send_bait = registry.get('cadence/transactions/sendBait.cdc')
+    assert [p.type for p in send_bait.params] == ['Address', 'UFix64']
+    assert 'import "BaitCoin"' not in registry.code('cadence/transactions/createAllVault.cdc', 'mainnet')
@@ -0,0 +1,83 @@
+import asyncio
+
+import pytest
+
+from flow_channel_pool import FlowChannelPool
+
+
+def test_client_reuses_channel_on_same_loop():
+    pool = FlowChannelPool(size=2)
+
+    async def borrow_twice():
+        async with pool.client('127.0.0.1', 3569) as first:
+            pass
+        async with pool.client('127.0.0.1', 3569) as second:
+            pass
+        return first, second
+
+    first, second = asyncio.run(borrow_twice())
+    assert first is second
+    assert pool.stats['created'] == 1
+    assert pool.stats['borrowed'] == 2
+
+
+def test_client_grows_to_pool_size_under_concurrency():
+    pool = FlowChannelPool(size=2)
+
+    async def borrow_nested():
+        async with pool.client('127.0.0.1', 3569) as a:
+            async with pool.client('127.0.0.1', 3569) as b:
+                async with pool.client('127.0.0.1', 3569) as c:
+                    return a, b, c
+
+    a, b, c = asyncio.run(borrow_nested())
+    assert a is not b
+    assert c in (a, b)
+    assert pool.stats['created'] == 2
+
+
+def test_connection_failure_discards_channel():
+    pool = FlowChannelPool(size=1)
+
+    async def fail_then_borrow():
+        with pytest.raises(ConnectionRefusedError):
+            async with pool.client('127.0.0.1', 3569):
+                raise ConnectionRefusedError()
+        async with pool.client('127.0.0.1', 3569):
+            pass
+
+    asyncio.run(fail_then_borrow())
+    assert pool.stats['reconnects'] == 1
+    assert pool.stats['created'] == 2
+
+
+def test_grpc_status_keeps_channel():
+    from grpclib.const import Status
+    from grpclib.exceptions import GRPCError
+    pool = FlowChannelPool(size=1)
+
+    async def fail_then_borrow():
+        for exc in (GRPCError(Status.UNAVAILABLE, 'overloaded'), GRPCError(Status.DEADLINE_EXCEEDED, 'slow script'), asyncio.TimeoutError()):
+            with pytest.raises(type(exc)):
+                async with pool.client('127.0.0.1', 3569) as client:
+                    raise exc
+        async with pool.client('127.0.0.1', 3569) as again:
+            pass
+        return client, again
+
+    first, again = asyncio.run(fail_then_borrow())
+    assert first is again
+    assert pool.stats['reconnects'] == 0
+    assert pool.stats['created'] == 1
+
+
+def test_release_loop_closes_channels():
+    pool = FlowChannelPool(size=1)
+
+    async def borrow_and_release():
+        async with pool.client('127.0.0.1', 3569):
+            pass
+        pool.release_loop(asyncio.get_running_loop())
+
+    asyncio.run(borrow_and_release())
+    assert pool.metrics()['open_channels'] == {'127.0.0.1:3569': 0}
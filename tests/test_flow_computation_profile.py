@@ -0,0 +1,89 @@
+from types import SimpleNamespace
+
+from flow_py_sdk.cadence import UFix64
+
+from flow_computation_profile import MAX_GAS_LIMIT, ComputationProfile, execution_effort, is_computation_limit_error
+
+
+def _fees_event(effort):
+    return SimpleNamespace(type='A.f919ee77447b7497.FlowFees.FeesDeducted', value=SimpleNamespace(fields={'amount': UFix64(1000), 'executionEffort': UFix64(effort)}))
+
+
+def test_execution_effort_reads_fees_deducted_event():
+    events = [SimpleNamespace(type='A.1654653399040a61.FlowToken.TokensWithdrawn', value=SimpleNamespace(fields={})), _fees_event(42)]
+    assert execution_effort(events) == 42
+    assert execution_effort([]) is None
+    assert execution_effort(None) is None
+
+
+def test_computation_limit_error_detection():
+    assert is_computation_limit_error('[Error Code: 1110] computation exceeds limit (100)')
+    assert not is_computation_limit_error('[Error Code: 1101] cadence runtime error')
+    assert not is_computation_limit_error(None)
+
+
+def test_gas_limit_uses_default_until_enough_samples():
+    profile = ComputationProfile(min_samples=3, headroom=1.5, floor=10, default_limit=9999)
+    profile.record('sendBait.cdc', 40, 'h1')
+    profile.record('sendBait.cdc', 60, 'h1')
+    assert profile.gas_limit('sendBait.cdc', 'h1') == 9999
+    profile.record('sendBait.cdc', 80, 'h1')
+    assert profile.gas_limit('sendBait.cdc', 'h1') == 120
+    assert profile.percentile('sendBait.cdc', 50) == 60
+    assert profile.gas_limit('createAllVault.cdc') == 9999
+
+
+def test_gas_limit_is_bounded_by_floor_and_network_maximum():
+    profile = ComputationProfile(min_samples=1, headroom=2.0, floor=100)
+    profile.record('tiny.cdc', 5)
+    profile.record('huge.cdc', 9000)
+    assert profile.gas_limit('tiny.cdc') == 100
+    assert profile.gas_limit('huge.cdc') == MAX_GAS_LIMIT
+
+
+def test_window_keeps_only_recent_samples():
+    profile = ComputationProfile(window=3, min_samples=1, headroom=1.0, floor=1)
+    for computation in (1000, 10, 20, 30):
+        profile.record('sendBait.cdc', computation)
+    assert profile.gas_limit('sendBait.cdc') == 30
+    assert profile.metrics()['templates']['sendBait.cdc']['recorded'] == 4
+
+
+def test_changed_source_and_limit_exceeded_reset_samples():
+    profile = ComputationProfile(min_samples=1, headroom=1.0, floor=1, default_limit=9999)
+    profile.record('sendBait.cdc', 50, 'h1')
+    assert profile.gas_limit('sendBait.cdc', 'h2') == 9999
+    profile.record('sendBait.cdc', 70, 'h2')
+    assert profile.gas_limit('sendBait.cdc', 'h2') == 70
+    profile.record_limit_exceeded('sendBait.cdc', 'h2')
+    assert profile.gas_limit('sendBait.cdc', 'h2') == 9999
+    entry = profile.metrics()['templates']['sendBait.cdc']
+    assert entry['resets'] == 1 and entry['limit_exceeded'] == 1 and entry['samples'] == 0
+
+
+def test_metrics_report_percentiles():
+    profile = ComputationProfile(min_samples=1, headroom=1.0, floor=1)
+    for computation in range(1, 101):
+        profile.record('adminMintBait.cdc', computation)
+    entry = profile.metrics()['templates']['adminMintBait.cdc']
+    assert (entry['min'], entry['p50'], entry['p95'], entry['p99'], entry['max']) == (1, 50, 95, 99, 100)
+    assert entry['gas_limit'] == 99
+
+
+def test_high_variance_templates_keep_the_default_limit():
+    profile = ComputationProfile(min_samples=3, headroom=1.5, floor=10, default_limit=9999, max_spread=4)
+    for computation in (40, 50, 60):
+        profile.record('sendBait.cdc', computation)
+    assert profile.gas_limit('sendBait.cdc') == 90
+    profile.record('sendBait.cdc', 400)
+    assert profile.gas_limit('sendBait.cdc') == 9999
+
+
+def test_limit_exceeded_raises_the_template_floor():
+    profile = ComputationProfile(min_samples=1, headroom=1.5, floor=10, default_limit=9999)
+    profile.record('sendBait.cdc', 40)
+    assert profile.gas_limit('sendBait.cdc') == 60
+    profile.record_limit_exceeded('sendBait.cdc')
+    profile.record('sendBait.cdc', 40)
+    assert profile.gas_limit('sendBait.cdc') == 90
+    assert profile.metrics()['templates']['sendBait.cdc']['floor'] == 90
@@ -0,0 +1,71 @@
+import asyncio
+import threading
+
+import pytest
+
+from flow_event_loop import FlowEventLoopThread
+
+
+def test_run_executes_on_single_shared_loop():
+    loop_thread = FlowEventLoopThread()
+
+    async def current_loop():
+        return asyncio.get_running_loop()
+
+    seen = []
+    threads = [threading.Thread(target=lambda: seen.append(loop_thread.run(current_loop()))) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    loop_thread.stop()
+    assert len(seen) == 4
+    assert len({id(loop) for loop in seen}) == 1
+
+
+def test_run_from_loop_thread_raises():
+    loop_thread = FlowEventLoopThread()
+
+    async def nested():
+        return loop_thread.run(asyncio.sleep(0))
+
+    with pytest.raises(RuntimeError):
+        loop_thread.run(nested())
+    loop_thread.stop()
+
+
+def test_every_schedules_periodic_task():
+    loop_thread = FlowEventLoopThread()
+    calls = threading.Event()
+
+    async def tick():
+        calls.set()
+
+    loop_thread.every(0.01, tick)
+    loop_thread.start()
+    assert calls.wait(timeout=2)
+    loop_thread.stop()
+
+
+def test_every_during_startup_schedules_job_once():
+    loop_thread = FlowEventLoopThread()
+    calls = []
+    first = threading.Event()
+
+    async def tick():
+        calls.append(1)
+        first.set()
+
+    original_main = loop_thread._main
+
+    def slow_main():
+        # Register the job after start() created the thread but before the loop read its jobs.
+        loop_thread.every(0.05, tick)
+        original_main()
+
+    loop_thread._main = slow_main
+    loop_thread.start()
+    assert first.wait(timeout=2)
+    loop_thread.run(asyncio.sleep(0.07))
+    loop_thread.stop()
+    assert len(loop_thread._tasks) == 1
@@ -0,0 +1,31 @@
+from decimal import Decimal
+
+import pytest
+
+from flow_preflight import bind_checks, checks_for, evaluate
+
+
+def _bound_send_bait(amount='5.0'):
+    roles = {'authorizer': '0x00000000000000aa', 'contract': '0xed2202de80195438'}
+    return bind_checks(checks_for('cadence/transactions/sendBait.cdc'), ['to', 'amount'], ['0x00000000000000bb', amount], roles.__getitem__)
+
+
+def test_bind_checks_resolves_roles_and_parameters():
+    bound = _bound_send_bait()
+    assert [(b['name'], b['address'], b['required']) for b in bound] == [
+        ('bait_vault_balance_0', '0x00000000000000aa', Decimal('5.0')),
+        ('bait_receiver_1', '0x00000000000000bb', None),
+    ]
+    assert checks_for('cadence/transactions/createAccount.cdc') == []
+    with pytest.raises(KeyError):
+        bind_checks(checks_for('swapBaitForFusd.cdc'), ['baitAmount'], ['1.0'], {'authorizer': '0x01'}.__getitem__)
+
+
+def test_evaluate_reports_shortfall_missing_vault_and_receiver():
+    bound = _bound_send_bait()
+    assert evaluate(bound, {'bait_vault_balance_0': Decimal('5'), 'bait_receiver_1': True}) == []
+    failures = evaluate(bound, {'bait_vault_balance_0': Decimal('4.99999999'), 'bait_receiver_1': False})
+    assert [(f['check'], f['reason']) for f in failures] == [('bait_vault_balance', 'insufficient'), ('bait_receiver', 'missing')]
+    assert failures[0]['required'] == Decimal('5.0')
+    failures = evaluate(bound, {'bait_vault_balance_0': None, 'bait_receiver_1': True})
+    assert [(f['check'], f['reason']) for f in failures] == [('bait_vault_balance', 'missing')]
@@ -0,0 +1,126 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from flow_proposal_keys import ProposalKeyPool, ProposerLocks, parse_key_indices, proposal_key_ranges
+
+SERVICE_KEY = b'\x01' * 64
+
+
+def _key(index, weight=1000, revoked=False, public_key=SERVICE_KEY):
+    return SimpleNamespace(index=index, weight=weight, revoked=revoked, public_key=public_key)
+
+
+def test_parse_key_indices():
+    assert parse_key_indices('') == []
+    assert parse_key_indices('3, 1,2,,1') == [1, 2, 3]
+    assert parse_key_indices('1-3, 7') == [1, 2, 3, 7]
+
+
+def test_load_keeps_only_full_weight_matching_keys():
+    pool = ProposalKeyPool('f1ab99c82dee3526', public_key=SERVICE_KEY)
+    keys = pool.load([
+        _key(0), _key(1, weight=500), _key(2, revoked=True),
+        _key(3, public_key=b'\x02' * 64), _key(4)
+    ])
+    assert keys == [0, 4]
+
+
+def test_load_falls_back_to_default_key():
+    pool = ProposalKeyPool('f1ab99c82dee3526', default_key_id=7, public_key=SERVICE_KEY)
+    assert pool.load([_key(0, weight=1)]) == [7]
+
+
+def test_lease_hands_out_distinct_keys_and_waits_when_exhausted():
+    pool = ProposalKeyPool('f1ab99c82dee3526', key_indices=[0, 1])
+    held = []
+
+    async def worker():
+        async with pool.lease() as key_id:
+            assert key_id not in held
+            held.append(key_id)
+            await asyncio.sleep(0.01)
+            held.remove(key_id)
+            return key_id
+
+    async def main():
+        return await asyncio.gather(*(worker() for _ in range(5)))
+
+    used = asyncio.run(main())
+    assert set(used) == {0, 1}
+    assert pool.stats['leases'] == 5
+    assert pool.stats['waits'] >= 1
+    assert pool.metrics()['free'] == 2
+
+
+def test_proposer_locks_serialise_only_shared_keys():
+    locks = ProposerLocks()
+    active = {}
+    peak = {}
+
+    async def worker(address):
+        async with locks.hold(address, 0):
+            active[address] = active.get(address, 0) + 1
+            peak[address] = max(peak.get(address, 0), active[address])
+            peak['total'] = max(peak.get('total', 0), sum(v for k, v in active.items()))
+            await asyncio.sleep(0.01)
+            active[address] -= 1
+
+    async def main():
+        await asyncio.gather(*(worker(a) for a in ['0xaa', 'AA', '0xbb', '0xcc']))
+
+    asyncio.run(main())
+    assert peak['total'] >= 2
+    assert locks.stats['contended'] == 1
+    assert locks.metrics()['active'] == 0
+
+
+def test_failed_discovery_leases_default_key_and_retries_with_backoff():
+    pool = ProposalKeyPool('f1ab99c82dee3526', default_key_id=2, public_key=SERVICE_KEY)
+    assert pool.should_discover()
+    pool.discovery_failed()
+    assert pool.keys == [2]
+    assert not pool.loaded and not pool.should_discover()
+    assert 0 < pool.retry_in() <= 1.0
+    pool.discovery_failed()
+    assert 1.0 < pool.retry_in() <= 2.0
+
+    async def lease():
+        async with pool.lease() as key_id:
+            return key_id
+
+    assert asyncio.run(lease()) == 2
+    pool._retry_at = 0.0
+    assert pool.should_discover()
+    assert pool.load([_key(0), _key(1)]) == [0, 1]
+    assert pool.loaded and not pool.should_discover()
+    assert pool.stats['discovery_failures'] == 2
+
+
+def test_overlapping_proposal_key_ranges_are_rejected(monkeypatch):
+    monkeypatch.setenv('FLOW_SERVICE_PROPOSAL_KEYS', '1-4')
+    monkeypatch.setenv('FLOW_RESERVED_PROPOSAL_KEYS', '0,5')
+    assert proposal_key_ranges() == ([1, 2, 3, 4], [0, 5])
+    monkeypatch.setenv('FLOW_RESERVED_PROPOSAL_KEYS', '0,4')
+    with pytest.raises(ValueError):
+        proposal_key_ranges()
+    with pytest.raises(ValueError):
+        ProposalKeyPool('f1ab99c82dee3526', key_indices=[1, 2], reserved=[2])
+
+
+def test_reserved_keys_are_never_leased():
+    pool = ProposalKeyPool('f1ab99c82dee3526', default_key_id=0, public_key=SERVICE_KEY, reserved=[0])
+    assert pool.load([_key(0), _key(1), _key(2)]) == [1, 2]
+    assert pool.metrics()['reserved'] == [0]
+
+    only_reserved = ProposalKeyPool('f1ab99c82dee3526', default_key_id=0, public_key=SERVICE_KEY, reserved=[0])
+    only_reserved.discovery_failed()
+    assert only_reserved.keys == []
+
+    async def lease():
+        async with only_reserved.lease() as key_id:
+            return key_id
+
+    with pytest.raises(RuntimeError):
+        asyncio.run(lease())
@@ -1,6 +1,20 @@
+import asyncio
+import threading
+import time
+from contextlib import asynccontextmanager
+from decimal import Decimal
+from types import SimpleNamespace
 from unittest.mock import patch, AsyncMock
 
+import pytest
+from flow_py_sdk.account_key import AccountKey
+from flow_py_sdk.cadence import Address, Array, Bool, Dictionary, KeyValuePair, Optional, String, Struct, UFix64
+from flow_py_sdk.signer import HashAlgo, SignAlgo
+
 import flow_py_adapter
+from flow_computation_profile import ComputationProfile
+from flow_py_adapter import _get_access_node, _to_cadence_arg
+from flow_query_builder import CompositeQuery
 
 
 def test_adapter_init_default_repo_root():
@@ -17,7 +31,6 @@ def test_adapter_init_custom_repo_root():
 
 
 def test_execute_script_delegates_to_async():
-    import asyncio
     adapter = flow_py_adapter.FlowPyAdapter(repo_root='/nonexistent')
     with patch.object(adapter, '_execute_script_async', new_callable=AsyncMock) as mock_async:
         mock_async.return_value = {'success': True, 'data': 42}
@@ -28,22 +41,17 @@ def test_execute_script_delegates_to_async():
 
 
 def test_to_cadence_arg_address():
-    from flow_py_adapter import _to_cadence_arg
-    from flow_py_sdk.cadence import Address
     result = _to_cadence_arg('0x179b6b1cb6755e31')
     assert isinstance(result, Address)
     assert result.hex_with_prefix() == '0x179b6b1cb6755e31'
 
 
 def test_to_cadence_arg_ufix64():
-    from flow_py_adapter import _to_cadence_arg
-    from flow_py_sdk.cadence import UFix64
     result = _to_cadence_arg('100.0')
     assert isinstance(result, UFix64)
 
 
 def test_get_access_node():
-    from flow_py_adapter import _get_access_node
     host, port = _get_access_node('mainnet')
     assert host == 'access.mainnet.nodes.onflow.org'
     assert port == 9000
@@ -53,3 +61,606 @@ def test_get_access_node():
     host, port = _get_access_node('emulator')
     assert host == '127.0.0.1'
     assert port == 3569
+
+
+def test_sync_calls_share_adapter_loop():
+    adapter = flow_py_adapter.FlowPyAdapter(repo_root='/nonexistent')
+    loops = []
+
+    async def record(*_args, **_kwargs):
+        loops.append(asyncio.get_running_loop())
+        return {'success': True}
+
+    with patch.object(adapter, '_execute_script_async', side_effect=record):
+        adapter.execute_script('script.cdc', [], 'mainnet')
+        adapter.execute_script('script.cdc', [], 'mainnet')
+    adapter.close()
+    assert loops[0] is loops[1]
+
+
+def test_gather_scripts_preserves_order_and_bounds_concurrency():
+    adapter = flow_py_adapter.FlowPyAdapter(repo_root='/nonexistent')
+    state = {'active': 0, 'peak': 0}
+
+    async def fake(script_path, args, network, **_kwargs):
+        state['active'] += 1
+        state['peak'] = max(state['peak'], state['active'])
+        await asyncio.sleep(0.01)
+        state['active'] -= 1
+        return {'success': True, 'data': args[0]}
+
+    with patch.object(adapter, '_execute_script_async', side_effect=fake):
+        results = adapter.gather_scripts([('s.cdc', [i]) for i in range(10)], max_concurrency=3)
+    adapter.close()
+    assert [r['data'] for r in results] == list(range(10))
+    assert state['peak'] == 3
+
+
+def test_aexecute_script_from_foreign_loop_runs_on_adapter_loop():
+    adapter = flow_py_adapter.FlowPyAdapter(repo_root='/nonexistent')
+    loops = []
+
+    async def record(*_args, **_kwargs):
+        loops.append(asyncio.get_running_loop())
+        return {'success': True, 'data': 1}
+
+    async def caller():
+        with patch.object(adapter, '_execute_script_async', side_effect=record):
+            return await adapter.aexecute_script('s.cdc', []), asyncio.get_running_loop()
+
+    result, caller_loop = asyncio.run(caller())
+    adapter.close()
+    assert result['data'] == 1
+    assert loops[0] is not caller_loop
+
+
+def test_submit_advances_and_mismatch_invalidates_sequence():
+    adapter = flow_py_adapter.FlowPyAdapter(repo_root='/nonexistent')
+    addr = Address.from_hex('0xf1ab99c82dee3526')
+    client = SimpleNamespace(send_transaction=AsyncMock(return_value=SimpleNamespace(id=b'\x01')))
+    tx = SimpleNamespace(to_signed_grpc=lambda: None)
+
+    async def main():
+        adapter._sequences._seq[('f1ab99c82dee3526', 0)] = 7
+        await adapter._submit(client, tx, 'mainnet', addr, 0, 7)
+        advanced = adapter._sequences.peek(addr.hex(), 0)
+        retry = adapter._settle_sequence('mainnet', addr, 0, 7, SimpleNamespace(status=4, error_message='[Error Code: 1007] invalid proposal key sequence number'))
+        return advanced, retry
+
+    advanced, retry = asyncio.run(main())
+    assert advanced == 8
+    assert retry is True
+    assert adapter._sequences.peek(addr.hex(), 0) is None
+    assert adapter._sequences.in_flight(addr.hex(), 0) == 0
+
+
+def test_when_sealed_fires_for_recorded_and_pending_outcomes():
+    adapter = flow_py_adapter.FlowPyAdapter(repo_root='/nonexistent')
+    seen = []
+    done = threading.Event()
+
+    def callback(tx_id, outcome):
+        seen.append((tx_id, outcome['sealed']))
+        if len(seen) == 2:
+            done.set()
+
+    async def record(tx_id):
+        adapter._record_seal(tx_id, {'status': 4, 'error_message': '', 'sealed': True})
+
+    adapter._run(record('aa'))
+    adapter.when_sealed('aa', callback)
+    adapter.when_sealed('bb', callback)
+    adapter._run(record('bb'))
+    assert done.wait(5)
+    adapter.close()
+    assert sorted(seen) == [('aa', True), ('bb', True)]
+
+
+def test_send_transaction_rejects_unknown_finality():
+    adapter = flow_py_adapter.FlowPyAdapter(repo_root='/nonexistent')
+    with pytest.raises(ValueError):
+        adapter.send_transaction('tx.cdc', [], finality='instant')
+
+
+def test_service_transactions_pipeline_on_one_proposal_key():
+    adapter = flow_py_adapter.FlowPyAdapter(repo_root='/nonexistent')
+    account_key, signer = AccountKey.from_seed(sign_algo=SignAlgo.ECDSA_P256, hash_algo=HashAlgo.SHA3_256, seed='11' * 32)
+    adapter._service_account = {'address': 'f1ab99c82dee3526', 'key': signer.key.to_string().hex(), 'signatureAlgorithm': 'ECDSA_P256', 'hashAlgorithm': 'SHA3_256', 'keyId': 0}
+    adapter._tx_tracker.tick = 0.01
+    sent = []
+
+    class FakeClient:
+        async def get_latest_block(self, is_sealed=True):
+            return SimpleNamespace(id=b'\x00' * 32, height=1)
+
+        async def get_account_at_latest_block(self, address):
+            return SimpleNamespace(keys=[SimpleNamespace(index=0, sequence_number=5, weight=1000, revoked=False, public_key=account_key.public_key)])
+
+        async def send_transaction(self, transaction):
+            sent.append(transaction.proposal_key.sequence_number)
+            return SimpleNamespace(id=bytes([len(sent)]))
+
+        async def get_transaction_result(self, id):
+            return SimpleNamespace(status=4 if len(sent) >= 2 else 1, error_message='', events=[])
+
+    @asynccontextmanager
+    async def fake_client(network, kind='script'):
+        yield FakeClient()
+
+    async def main():
+        return await asyncio.gather(*(adapter._execute_transaction('tx.cdc', [], {}, {}, 'mainnet') for _ in range(2)))
+
+    adapter._tx_tracker._client_factory = fake_client
+    with patch.object(adapter, '_client', side_effect=fake_client), patch.object(adapter, '_read_cadence', return_value='transaction {}'):
+        results = adapter._run(asyncio.wait_for(main(), 10))
+    adapter.close()
+    assert [r['success'] for r in results] == [True, True]
+    assert sent == [5, 6]
+
+
+def test_execute_script_is_cached_until_a_transaction_touches_the_address():
+    adapter = flow_py_adapter.FlowPyAdapter()
+    calls = []
+
+    async def fake_read(network, fn, hedge=False):
+        calls.append(network)
+        return UFix64(len(calls) * 100_000_000)
+
+    address = '0xed2202de80195438'
+    with patch.object(adapter, '_read', side_effect=fake_read):
+        first = adapter.execute_script('cadence/scripts/checkBaitBalance.cdc', [address])
+        second = adapter.execute_script('cadence/scripts/checkBaitBalance.cdc', [address])
+        adapter._script_cache.touch('mainnet', [address])
+        third = adapter.execute_script('cadence/scripts/checkBaitBalance.cdc', [address])
+    adapter.close()
+    assert len(calls) == 2
+    assert second['cached'] is True and second['data'] == first['data']
+    assert third['data'] == 2
+    assert adapter.metrics()['script_cache']['hits'] == 1
+
+
+def test_execute_script_returns_floats_unless_decimal_is_requested():
+    adapter = flow_py_adapter.FlowPyAdapter()
+    calls = []
+
+    async def fake_read(network, fn, hedge=False):
+        calls.append(network)
+        return UFix64(150_000_000)
+
+    address = '0xed2202de80195438'
+    with patch.object(adapter, '_read', side_effect=fake_read):
+        default = adapter.execute_script('cadence/scripts/checkBaitBalance.cdc', [address])
+        exact = adapter.execute_script('cadence/scripts/checkBaitBalance.cdc', [address], fixed_point='decimal')
+        again = adapter.execute_script('cadence/scripts/checkBaitBalance.cdc', [address])
+    adapter.close()
+    assert type(default['data']) is float and default['data'] == 1.5
+    assert exact['data'] == Decimal('1.5') and isinstance(exact['data'], Decimal)
+    assert again['cached'] is True and type(again['data']) is float
+    assert len(calls) == 2
+
+
+def test_concurrent_identical_scripts_share_one_read_without_cache():
+    adapter = flow_py_adapter.FlowPyAdapter()
+    adapter._script_cache.max_age = 0
+    calls = []
+
+    async def fake_read(network, fn, hedge=False):
+        calls.append(network)
+        await asyncio.sleep(0.02)
+        return UFix64(100_000_000)
+
+    requests = [('cadence/scripts/checkBaitBalance.cdc', ['0xed2202de80195438'], 'mainnet')] * 10
+    with patch.object(adapter, '_read', side_effect=fake_read):
+        results = adapter.gather_scripts(requests)
+    adapter.close()
+    assert len(calls) == 1
+    assert all(r['success'] and r['data'] == 1 for r in results)
+
+
+def test_snapshot_pins_reads_to_one_height_and_caches_them():
+    adapter = flow_py_adapter.FlowPyAdapter()
+    executed = []
+
+    class FakeClient:
+        async def get_latest_block(self, is_sealed=True):
+            return SimpleNamespace(id=b'\x01' * 32, height=1234)
+
+        async def execute_script(self, script, at_block_id=None, at_block_height=None):
+            executed.append(at_block_height)
+            return UFix64(250_000_000)
+
+    async def fake_read(network, fn, hedge=False):
+        return await fn(FakeClient())
+
+    requests = [('cadence/scripts/checkBaitBalance.cdc', [f'0x{i:016x}']) for i in range(1, 4)]
+    with patch.object(adapter, '_read', side_effect=fake_read):
+        with adapter.snapshot('mainnet') as snap:
+            first = snap.gather_scripts(requests)
+        with adapter.snapshot('mainnet', block_height=1234) as snap:
+            second = snap.gather_scripts(requests)
+        with pytest.raises(ValueError):
+            adapter.execute_script_at_block('cadence/scripts/checkBaitBalance.cdc', ['0x01'])
+    adapter.close()
+    assert executed == [1234, 1234, 1234]
+    assert all(r['block_height'] == 1234 and r['data'] == 2.5 for r in first)
+    assert all(r['cached'] for r in second)
+    assert adapter._reference_blocks.height('mainnet') == 1234
+
+
+def test_get_balances_chunks_and_splits_on_computation_limit():
+    adapter = flow_py_adapter.FlowPyAdapter(repo_root='/nonexistent')
+    chunks = []
+
+    async def fake(script_path, args, network, *pinned):
+        chunk = args[0]
+        chunks.append(len(chunk))
+        if len(chunk) > 4:
+            return {'success': False, 'error_message': 'computation exceeds limit (100000)'}
+        return {'success': True, 'data': {a: (None if a.endswith('7') else Decimal(1)) for a in chunk}}
+
+    addresses = [f'{i:016x}' for i in range(1, 13)] + ['0x0000000000000001']
+    with patch.object(adapter, '_execute_script_async', side_effect=fake):
+        result = adapter.get_balances(addresses, 'BAIT', batch_size=6)
+        with pytest.raises(ValueError):
+            adapter.get_balances(addresses, 'usdf')
+    adapter.close()
+    assert result['success'] is True
+    assert len(result['data']) == 12
+    assert result['data']['0x0000000000000007'] is None
+    assert sum(v for v in result['data'].values() if v is not None) == 11
+    assert sorted(chunks) == [3, 3, 3, 3, 6, 6]
+    assert result['script_calls'] == 6
+
+
+def test_balance_batch_scripts_have_list_schema():
+    adapter = flow_py_adapter.FlowPyAdapter()
+    for script_path in flow_py_adapter.BALANCE_SCRIPTS.values():
+        template = adapter._templates.get(script_path)
+        assert [(p.name, p.type) for p in template.params] == [('addresses', '[Address]')]
+    adapter.close()
+
+
+def test_composite_query_runs_all_reads_in_one_script():
+    adapter = flow_py_adapter.FlowPyAdapter()
+    scripts = []
+
+    class FakeClient:
+        async def execute_script(self, script, at_block_id=None, at_block_height=None):
+            scripts.append(script)
+            return Dictionary([
+                KeyValuePair(String('bait'), Optional(UFix64(150_000_000))),
+                KeyValuePair(String('flow'), Optional(None)),
+                KeyValuePair(String('caps'), Array([String('BAIT Vault: /public/baitCoinVault')])),
+                KeyValuePair(String('supply'), UFix64(1_000_000_000)),
+            ])
+
+    async def fake_read(network, fn, hedge=False):
+        return await fn(FakeClient())
+
+    address = '0xed2202de80195438'
+    with patch.object(adapter, '_read', side_effect=fake_read):
+        result = (adapter.query()
+                  .add('bait', 'bait_balance', address)
+                  .add('flow', 'flow_balance', address)
+                  .add('caps', 'bait_capabilities', address)
+                  .add('supply', 'bait_total_supply')
+                  .execute())
+        again = adapter.query().add('bait', 'bait_balance', address).add('flow', 'flow_balance', address).add('caps', 'bait_capabilities', address).add('supply', 'bait_total_supply').execute()
+    adapter.close()
+    assert len(scripts) == 1
+    assert 'import BaitCoin from 0xed2202de80195438' in scripts[0].code
+    assert len(scripts[0].arguments) == 3
+    assert result['success'] is True
+    assert result['data'] == {'bait': Decimal('1.5'), 'flow': None, 'caps': ['BAIT Vault: /public/baitCoinVault'], 'supply': Decimal('10')}
+    assert again['cached'] is True
+    assert adapter.metrics()['query_shapes']['hits'] == 1
+
+
+def test_get_wallet_health_builds_records_from_batched_probe():
+    adapter = flow_py_adapter.FlowPyAdapter()
+    calls = []
+
+    async def fake(script_path, args, network, *pinned):
+        calls.append((script_path, len(args[0])))
+        return {'success': True, 'data': {a: {
+            'flowBalance': Decimal('0.05'), 'availableFlowBalance': Decimal('0.049'),
+            'baitVault': a.endswith('1'), 'baitReceiver': a.endswith('1'), 'baitBalanceCapability': a.endswith('1'),
+            'baitBalance': Decimal('3') if a.endswith('1') else None, 'storageUsed': 1000, 'storageCapacity': 100000
+        } for a in args[0]}}
+
+    addresses = [f'0x{i:016x}' for i in range(1, 251)]
+    with patch.object(adapter, '_execute_script_async', side_effect=fake):
+        result = adapter.get_wallet_health(addresses, batch_size=100)
+    adapter.close()
+    assert result['success'] is True and result['script_calls'] == 3
+    assert {path for path, _ in calls} == {flow_py_adapter.WALLET_HEALTH_SCRIPT}
+    assert result['data']['0x0000000000000001'] == {
+        'address': '0x0000000000000001', 'flow_balance': Decimal('0.05'), 'available_flow_balance': Decimal('0.049'),
+        'bait_vault': True, 'bait_receiver': True, 'bait_balance_capability': True, 'bait_balance': Decimal('3'),
+        'storage_used': 1000, 'storage_capacity': 100000, 'healthy': True
+    }
+    assert result['data']['0x0000000000000002']['healthy'] is False
+
+
+def test_contract_state_is_a_cached_script_read():
+    adapter = flow_py_adapter.FlowPyAdapter()
+    scripts = []
+
+    class FakeClient:
+        async def execute_script(self, script, at_block_id=None, at_block_height=None):
+            scripts.append(script)
+            return Struct('s.ContractState', [
+                ('baitTotalSupply', UFix64(400_000_000)),
+                ('usdfReserve', Optional(UFix64(300_000_000))),
+                ('usdfVaultPath', Optional(String('/storage/baitCoinEVMUSDFVault'))),
+                ('tokenInfo', Dictionary([KeyValuePair(String('symbol'), String('BAIT'))])),
+            ])
+
+    async def fake_read(network, fn, hedge=False):
+        return await fn(FakeClient())
+
+    with patch.object(adapter, '_read', side_effect=fake_read):
+        first = adapter.get_contract_state()
+        second = adapter.get_contract_state()
+    adapter.close()
+    assert len(scripts) == 1
+    assert 'import BaitCoin from 0xed2202de80195438' in scripts[0].code
+    assert first['data'] == {
+        'contract_address': '0xed2202de80195438', 'bait_total_supply': Decimal(4), 'usdf_reserve': Decimal(3),
+        'usdf_vault_path': '/storage/baitCoinEVMUSDFVault', 'reserve_ratio': Decimal('0.75'), 'token_info': {'symbol': 'BAIT'}
+    }
+    assert second['cached'] is True
+
+
+def test_preflight_rejects_doomed_send_bait_before_signing():
+    adapter = flow_py_adapter.FlowPyAdapter()
+    _, signer = AccountKey.from_seed(sign_algo=SignAlgo.ECDSA_P256, hash_algo=HashAlgo.SHA3_256, seed='22' * 32)
+    sender = '0x00000000000000aa'
+    scripts = []
+
+    class FakeClient:
+        async def execute_script(self, script, at_block_id=None, at_block_height=None):
+            scripts.append(script)
+            return Dictionary([
+                KeyValuePair(String('bait_vault_balance_0'), Optional(UFix64(200_000_000))),
+                KeyValuePair(String('bait_receiver_1'), Bool(True)),
+            ])
+
+    async def fake_read(network, fn, hedge=False):
+        return await fn(FakeClient())
+
+    submit = AsyncMock()
+    with patch.object(adapter, '_read', side_effect=fake_read), patch.object(adapter, '_sign_and_submit', submit):
+        result = adapter.send_transaction_with_private_key(
+            'cadence/transactions/sendBait.cdc', ['0x00000000000000bb', 5.0],
+            roles={'proposer': sender, 'authorizer': [sender], 'payer': sender},
+            private_keys={sender: signer.key.to_string().hex()}
+        )
+    adapter.close()
+    assert len(scripts) == 1
+    assert submit.await_count == 0
+    assert result['success'] is False and result['error_type'] == 'preflight'
+    assert [(f['check'], f['reason'], f['value']) for f in result['preflight']] == [('bait_vault_balance', 'insufficient', Decimal(2))]
+
+
+def test_sealed_transactions_tune_the_template_gas_limit():
+    adapter = flow_py_adapter.FlowPyAdapter(repo_root='/nonexistent')
+    adapter._computation = ComputationProfile(min_samples=2, headroom=1.5, floor=10, default_limit=9999)
+    account_key, signer = AccountKey.from_seed(sign_algo=SignAlgo.ECDSA_P256, hash_algo=HashAlgo.SHA3_256, seed='33' * 32)
+    adapter._service_account = {'address': 'f1ab99c82dee3526', 'key': signer.key.to_string().hex(), 'signatureAlgorithm': 'ECDSA_P256', 'hashAlgorithm': 'SHA3_256', 'keyId': 0}
+    adapter._tx_tracker.tick = 0.01
+    limits = []
+    fees = SimpleNamespace(type='A.f919ee77447b7497.FlowFees.FeesDeducted', value=SimpleNamespace(fields={'executionEffort': UFix64(40)}))
+
+    class FakeClient:
+        async def get_latest_block(self, is_sealed=True):
+            return SimpleNamespace(id=b'\x00' * 32, height=1)
+
+        async def get_account_at_latest_block(self, address):
+            return SimpleNamespace(keys=[SimpleNamespace(index=0, sequence_number=len(limits), weight=1000, revoked=False, public_key=account_key.public_key)])
+
+        async def send_transaction(self, transaction):
+            limits.append(transaction.gas_limit)
+            return SimpleNamespace(id=bytes([len(limits)]))
+
+        async def get_transaction_result(self, id):
+            return SimpleNamespace(status=4, error_message='', events=[fees])
+
+    @asynccontextmanager
+    async def fake_client(network, kind='script'):
+        yield FakeClient()
+
+    async def main():
+        for _ in range(3):
+            await adapter._execute_transaction('cadence/transactions/tx.cdc', [], {}, {}, 'mainnet')
+
+    adapter._tx_tracker._client_factory = fake_client
+    with patch.object(adapter, '_client', side_effect=fake_client), patch.object(adapter, '_read_cadence', return_value='transaction {}'):
+        adapter._run(asyncio.wait_for(main(), 10))
+    adapter.close()
+    assert limits == [9999, 9999, 60]
+    assert adapter.gas_limit_for('cadence/transactions/tx.cdc') == 60
+    assert adapter.computation_profile()['templates']['tx.cdc']['p99'] == 40
+
+
+def test_transaction_out_of_computation_at_a_derived_limit_is_resubmitted_at_the_default():
+    adapter = flow_py_adapter.FlowPyAdapter(repo_root='/nonexistent')
+    adapter._computation = ComputationProfile(min_samples=2, headroom=1.5, floor=10, default_limit=9999)
+    adapter._computation.record('tx.cdc', 40)
+    adapter._computation.record('tx.cdc', 40)
+    account_key, signer = AccountKey.from_seed(sign_algo=SignAlgo.ECDSA_P256, hash_algo=HashAlgo.SHA3_256, seed='77' * 32)
+    adapter._service_account = {'address': 'f1ab99c82dee3526', 'key': signer.key.to_string().hex(), 'signatureAlgorithm': 'ECDSA_P256', 'hashAlgorithm': 'SHA3_256', 'keyId': 0}
+    adapter._tx_tracker.tick = 0.01
+    limits = []
+
+    class FakeClient:
+        async def get_latest_block(self, is_sealed=True):
+            return SimpleNamespace(id=b'\x00' * 32, height=1)
+
+        async def get_account_at_latest_block(self, address):
+            return SimpleNamespace(keys=[SimpleNamespace(index=0, sequence_number=0, weight=1000, revoked=False, public_key=account_key.public_key)])
+
+        async def send_transaction(self, transaction):
+            limits.append(transaction.gas_limit)
+            return SimpleNamespace(id=bytes([len(limits)]))
+
+        async def get_transaction_result(self, id):
+            if limits[id[0] - 1] < 100:
+                return SimpleNamespace(status=4, error_message='[Error Code: 1110] computation exceeds limit (60)', events=[])
+            return SimpleNamespace(status=4, error_message='', events=[])
+
+    @asynccontextmanager
+    async def fake_client(network, kind='script'):
+        yield FakeClient()
+
+    adapter._tx_tracker._client_factory = fake_client
+    with patch.object(adapter, '_client', side_effect=fake_client), patch.object(adapter, '_read_cadence', return_value='transaction {}'):
+        result = adapter._run(asyncio.wait_for(adapter._execute_transaction('cadence/transactions/tx.cdc', [], {}, {}, 'mainnet'), 10))
+    adapter.close()
+    assert limits == [60, 9999]
+    assert result['success'] is True and result['transaction_id'] == '02'
+    entry = adapter.computation_profile()['templates']['tx.cdc']
+    assert entry['limit_exceeded'] == 1 and entry['floor'] == 90
+
+
+def test_preflight_reads_fresh_state_past_a_cached_low_balance():
+    adapter = flow_py_adapter.FlowPyAdapter()
+    _, signer = AccountKey.from_seed(sign_algo=SignAlgo.ECDSA_P256, hash_algo=HashAlgo.SHA3_256, seed='44' * 32)
+    sender, recipient = '0x00000000000000aa', '0x00000000000000bb'
+    balance = {'value': 200_000_000}
+    reads = []
+
+    class FakeClient:
+        async def execute_script(self, script, at_block_id=None, at_block_height=None):
+            reads.append(script)
+            return Dictionary([
+                KeyValuePair(String('bait_vault_balance_0'), Optional(UFix64(balance['value']))),
+                KeyValuePair(String('bait_receiver_1'), Bool(True)),
+            ])
+
+    async def fake_read(network, fn, hedge=False):
+        return await fn(FakeClient())
+
+    submit = AsyncMock(side_effect=RuntimeError('submitted'))
+    with patch.object(adapter, '_read', side_effect=fake_read), patch.object(adapter, '_sign_and_submit', submit):
+        # Same shape and arguments as the sendBait preflight: the low balance is now in the script cache.
+        stale = CompositeQuery(adapter, 'mainnet').add('bait_vault_balance_0', 'bait_vault_balance', sender).add('bait_receiver_1', 'bait_receiver', recipient)
+        assert adapter.execute_query(stale)['data']['bait_vault_balance_0'] == 2
+        assert adapter.execute_query(stale)['cached'] is True
+        # Another process credits the sender without going through this adapter.
+        balance['value'] = 900_000_000
+        result = adapter.send_transaction_with_private_key(
+            'cadence/transactions/sendBait.cdc', [recipient, 5.0],
+            roles={'proposer': sender, 'authorizer': [sender], 'payer': sender},
+            private_keys={sender: signer.key.to_string().hex()}
+        )
+    adapter.close()
+    assert len(reads) == 2
+    assert result.get('error_type') != 'preflight'
+    assert submit.await_count == 1
+
+
+def _run_three_behind_expired_first(finality):
+    adapter = flow_py_adapter.FlowPyAdapter(repo_root='/nonexistent')
+    account_key, signer = AccountKey.from_seed(sign_algo=SignAlgo.ECDSA_P256, hash_algo=HashAlgo.SHA3_256, seed='55' * 32)
+    adapter._service_account = {'address': 'f1ab99c82dee3526', 'key': signer.key.to_string().hex(), 'signatureAlgorithm': 'ECDSA_P256', 'hashAlgorithm': 'SHA3_256', 'keyId': 0}
+    adapter._tx_tracker.tick = 0.01
+    chain = {'seq': 10, 'mismatches': 0}
+    sent, results = [], {}
+
+    def execute(tx_id):
+        # Transactions execute in submission order; the first one is never included and later expires.
+        for i, seq in sent[1:tx_id[0]]:
+            if i in results:
+                continue
+            if seq == chain['seq']:
+                chain['seq'] += 1
+                results[i] = SimpleNamespace(status=4, error_message='', events=[])
+            else:
+                chain['mismatches'] += 1
+                results[i] = SimpleNamespace(status=4, error_message=f'[Error Code: 1007] invalid proposal key: has sequence number {chain["seq"]}, but given {seq}', events=[])
+
+    class FakeClient:
+        async def get_latest_block(self, is_sealed=True):
+            return SimpleNamespace(id=b'\x00' * 32, height=1)
+
+        async def get_account_at_latest_block(self, address):
+            return SimpleNamespace(keys=[SimpleNamespace(index=0, sequence_number=10, weight=1000, revoked=False, public_key=account_key.public_key)])
+
+        async def send_transaction(self, transaction):
+            sent.append((bytes([len(sent) + 1]), transaction.proposal_key.sequence_number))
+            return SimpleNamespace(id=sent[-1][0])
+
+        async def get_transaction_result(self, id):
+            if id == sent[0][0]:
+                return SimpleNamespace(status=5 if chain['mismatches'] >= 2 else 1, error_message='', events=[])
+            execute(id)
+            return results[id]
+
+    @asynccontextmanager
+    async def fake_client(network, kind='script'):
+        yield FakeClient()
+
+    async def main():
+        return await asyncio.gather(*(adapter._execute_transaction('tx.cdc', [], {}, {}, 'mainnet', finality=finality) for _ in range(3)))
+
+    adapter._tx_tracker._client_factory = fake_client
+    with patch.object(adapter, '_client', side_effect=fake_client), patch.object(adapter, '_read_cadence', return_value='transaction {}'):
+        returned = adapter._run(asyncio.wait_for(main(), 10))
+        outcomes = []
+        deadline = time.time() + 10
+        while finality != 'sealed' and time.time() < deadline:
+            outcomes = [adapter.seal_outcome(r['transaction_id']) for r in returned]
+            if all(outcomes):
+                break
+            time.sleep(0.02)
+    adapter.close()
+    return returned, outcomes, sent, chain
+
+
+def test_transactions_behind_a_failed_one_are_resigned_in_order():
+    returned, _, sent, chain = _run_three_behind_expired_first('sealed')
+    assert [r['success'] for r in returned] == [False, True, True]
+    assert [seq for _, seq in sent[:3]] == [10, 11, 12]
+    assert sorted(seq for _, seq in sent[3:]) == [10, 11]
+    assert chain['seq'] == 12
+
+
+def test_submitted_transactions_behind_a_failed_one_are_reported_rolled_back():
+    returned, outcomes, sent, chain = _run_three_behind_expired_first('submitted')
+    assert [r['success'] for r in returned] == [True, True, True]
+    assert [(o['sealed'], o['rolled_back']) for o in outcomes] == [(False, False), (False, True), (False, True)]
+    # The seal watcher only observes: nothing the caller was already answered for is signed again.
+    assert len(sent) == 3
+    assert chain['seq'] == 10
+
+
+def test_proposal_key_discovery_is_retried_after_a_failure():
+    adapter = flow_py_adapter.FlowPyAdapter(repo_root='/nonexistent')
+    account_key, signer = AccountKey.from_seed(sign_algo=SignAlgo.ECDSA_P256, hash_algo=HashAlgo.SHA3_256, seed='66' * 32)
+    adapter._service_account = {'address': 'f1ab99c82dee3526', 'key': signer.key.to_string().hex(), 'signatureAlgorithm': 'ECDSA_P256', 'hashAlgorithm': 'SHA3_256', 'keyId': 0}
+    lookups = []
+
+    class FakeClient:
+        async def get_account_at_latest_block(self, address):
+            lookups.append(address)
+            if len(lookups) == 1:
+                raise ConnectionError('access node down')
+            keys = [SimpleNamespace(index=i, weight=1000, revoked=False, public_key=account_key.public_key) for i in range(3)]
+            return SimpleNamespace(keys=keys)
+
+    @asynccontextmanager
+    async def fake_client(network, kind='script'):
+        yield FakeClient()
+
+    async def pool_keys():
+        return (await adapter._get_proposal_key_pool('mainnet')).keys
+
+    with patch.object(adapter, '_client', side_effect=fake_client):
+        first = adapter._run(pool_keys())
+        backing_off = adapter._run(pool_keys())
+        adapter._proposal_key_pools['mainnet']._retry_at = 0.0
+        recovered = adapter._run(pool_keys())
+    adapter.close()
+    assert (first, backing_off, recovered) == ([0], [0], [0, 1, 2])
+    assert len(lookups) == 2
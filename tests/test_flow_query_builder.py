@@ -0,0 +1,38 @@
+import pytest
+
+from flow_cadence_registry import CadenceTemplate
+from flow_query_builder import CompositeQuery, QueryShapeCache, generate_script
+
+
+def test_generated_script_declares_each_read_once():
+    shape = (('bait', 'bait_balance'), ('caps', 'bait_capabilities'), ('caps2', 'bait_capabilities'), ('supply', 'bait_total_supply'))
+    source = generate_script(shape)
+    assert source.count('import "BaitCoin"') == 1
+    assert source.count('fun baitCapabilities') == 1
+    assert 'result.insert(key: "supply", BaitCoin.totalSupply)' in source
+    template = CadenceTemplate('<query>', source)
+    assert template.kind == 'script'
+    assert [(p.name, p.type) for p in template.params] == [('r0_address', 'Address'), ('r1_address', 'Address'), ('r2_address', 'Address')]
+    assert template.code('mainnet', {'FungibleToken': 'f233dcee88fe0abe', 'BaitCoin': 'ed2202de80195438'}).startswith('import FungibleToken from 0xf233dcee88fe0abe')
+
+
+def test_shape_cache_reuses_template_across_arguments():
+    cache = QueryShapeCache(max_shapes=1)
+    first = CompositeQuery(None).add('bait', 'bait_balance', '0x01')
+    second = CompositeQuery(None).add('bait', 'bait_balance', '0x02')
+    assert cache.template(first.shape) is cache.template(second.shape)
+    cache.template((('supply', 'bait_total_supply'),))
+    assert cache.metrics() == {'shapes': 1, 'hits': 1, 'generated': 2, 'evictions': 1}
+
+
+def test_add_validates_reads():
+    query = CompositeQuery(None).add('bait', 'bait_balance', '0x01')
+    with pytest.raises(ValueError):
+        query.add('bait', 'flow_balance', '0x01')
+    with pytest.raises(ValueError):
+        query.add('flow', 'flow_balance')
+    with pytest.raises(ValueError):
+        query.add('usdf', 'usdf_balance', '0x01')
+    with pytest.raises(ValueError):
+        query.add('bad"name', 'bait_total_supply')
+    assert len(query) == 1 and query.args == ['0x01']
@@ -0,0 +1,51 @@
+import asyncio
+import time
+
+from grpclib.const import Status
+from grpclib.exceptions import GRPCError
+
+import flow_rate_limiter
+from flow_rate_limiter import AdaptiveRateLimiter, TokenBucket
+
+
+def test_bucket_spaces_calls_without_holding_a_lock():
+    bucket = TokenBucket(rate=50, max_rate=50)
+
+    async def run():
+        started = time.monotonic()
+        await asyncio.gather(*(bucket.acquire() for _ in range(60)))
+        return time.monotonic() - started
+
+    elapsed = asyncio.run(run())
+    assert 0.15 <= elapsed < 1.0
+    assert bucket.stats['acquired'] == 60
+    assert bucket.stats['delayed'] == 10
+
+
+def test_aimd_adjusts_rate(monkeypatch):
+    monkeypatch.setattr(flow_rate_limiter, 'ADJUST_INTERVAL', 0)
+    bucket = TokenBucket(rate=10, max_rate=12)
+    bucket.succeeded()
+    assert bucket.rate == 10
+    for _ in range(12):
+        bucket.reserve()
+    bucket.succeeded()
+    assert bucket.rate == 11
+
+    bucket.throttled()
+    assert bucket.rate == 5.5
+    assert bucket.tokens <= 0
+    for _ in range(10):
+        bucket.throttled()
+    assert bucket.rate == flow_rate_limiter.MIN_RATE
+
+
+def test_limiter_keys_by_node_and_call_class():
+    limiter = AdaptiveRateLimiter({'script': (10, 20), 'transaction': (5, 10)})
+    node = ('node-a', 9000)
+    limiter.observe(node, 'transaction', GRPCError(Status.RESOURCE_EXHAUSTED, 'slow down'))
+    limiter.observe(node, 'script', GRPCError(Status.INTERNAL, 'boom'))
+    metrics = limiter.metrics()
+    assert metrics['node-a:9000/transaction']['rate'] == 2.5
+    assert metrics['node-a:9000/script']['rate'] == 10
+    assert limiter.bucket(('node-b', 9000), 'script') is not limiter.bucket(node, 'script')
@@ -0,0 +1,54 @@
+import asyncio
+from types import SimpleNamespace
+
+from flow_reference_block import ReferenceBlockCache, is_expired_error
+
+
+def _fetcher(blocks):
+    calls = []
+
+    async def fetch():
+        calls.append(1)
+        return blocks[min(len(calls), len(blocks)) - 1]
+    return fetch, calls
+
+
+def test_get_serves_cached_block_until_invalidated():
+    cache = ReferenceBlockCache(max_age=60)
+    fetch, calls = _fetcher([SimpleNamespace(id=b'a', height=10), SimpleNamespace(id=b'b', height=11)])
+
+    async def main():
+        first = await cache.get('mainnet', fetch)
+        second = await cache.get('mainnet', fetch)
+        cache.invalidate('mainnet')
+        third = await cache.get('mainnet', fetch)
+        return first, second, third
+
+    assert asyncio.run(main()) == (b'a', b'a', b'b')
+    assert len(calls) == 2
+    assert cache.stats['hits'] == 1
+    assert cache.stats['forced'] == 1
+
+
+def test_stale_entry_is_refetched():
+    cache = ReferenceBlockCache(max_age=0)
+    fetch, calls = _fetcher([SimpleNamespace(id=b'a', height=10), SimpleNamespace(id=b'b', height=11)])
+
+    async def main():
+        await cache.get('mainnet', fetch)
+        return await cache.get('mainnet', fetch)
+
+    assert asyncio.run(main()) == b'b'
+    assert cache.metrics()['blocks']['mainnet']['height'] == 11
+
+
+def test_update_ignores_older_heights():
+    cache = ReferenceBlockCache()
+    cache.update('mainnet', b'new', 20)
+    cache.update('mainnet', b'old', 19)
+    assert cache.metrics()['blocks']['mainnet']['height'] == 20
+
+
+def test_is_expired_error():
+    assert is_expired_error('transaction is expired')
+    assert not is_expired_error('insufficient balance')
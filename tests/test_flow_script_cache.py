@@ -0,0 +1,59 @@
+import time
+
+from flow_py_sdk.cadence import Address, Array, Optional, UFix64
+
+from flow_script_cache import ScriptResultCache, addresses_in
+
+A = 'ed2202de80195438'
+B = '941947eccc6e9de4'
+
+
+def _key(address, network='mainnet'):
+    return ('hash', (address.encode(),), network)
+
+
+def test_hit_until_age_or_block_bound():
+    cache = ScriptResultCache(max_blocks=2, max_age_ms=50)
+    key = _key(A)
+    assert cache.get(key) is None
+    assert cache.put(key, {'data': 1}, frozenset({A}), cache.versions('mainnet', frozenset({A})), height=100)
+    assert cache.get(key, height=102) == {'data': 1}
+    assert cache.get(key, height=103) is None
+    cache.put(key, {'data': 2}, frozenset({A}), cache.versions('mainnet', frozenset({A})))
+    time.sleep(0.06)
+    assert cache.get(key) is None
+    metrics = cache.metrics()
+    assert metrics['hits'] == 1
+    assert metrics['expired'] == 2
+    assert metrics['hit_ratio'] == 0.25
+
+
+def test_touch_invalidates_and_blocks_caching_until_final():
+    cache = ScriptResultCache(max_blocks=10, max_age_ms=10_000)
+    addresses = frozenset({A})
+    cache.put(_key(A), {'data': 1}, addresses, cache.versions('mainnet', addresses))
+    cache.put(_key(B), {'data': 2}, frozenset({B}), cache.versions('mainnet', frozenset({B})))
+
+    assert cache.touch('mainnet', ['0x' + A]) == 1
+    assert cache.get(_key(A)) is None
+    assert cache.get(_key(B)) == {'data': 2}
+    assert not cache.put(_key(A), {'data': 3}, addresses, cache.versions('mainnet', addresses))
+
+    cache.invalidate('mainnet', [A])
+    assert cache.put(_key(A), {'data': 4}, addresses, cache.versions('mainnet', addresses))
+    assert cache.get(_key(A)) == {'data': 4}
+
+
+def test_read_that_raced_a_write_is_not_stored():
+    cache = ScriptResultCache(max_blocks=10, max_age_ms=10_000)
+    addresses = frozenset({A})
+    versions = cache.versions('mainnet', addresses)
+    cache.invalidate('mainnet', [A])
+    assert not cache.put(_key(A), {'data': 'stale'}, addresses, versions)
+    assert cache.metrics()['skipped'] == 1
+
+
+def test_disabled_and_address_extraction():
+    assert not ScriptResultCache(max_blocks=0).enabled
+    values = [Address.from_hex('0x' + A), Array([Optional(Address.from_hex('0x' + B)), UFix64(1)])]
+    assert addresses_in(values) == frozenset({A, B})
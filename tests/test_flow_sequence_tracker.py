@@ -0,0 +1,90 @@
+import asyncio
+
+from flow_sequence_tracker import SequenceTracker, is_sequence_mismatch
+
+
+def test_is_sequence_mismatch():
+    assert is_sequence_mismatch('[Error Code: 1007] invalid proposal key: public key 0 on account f1ab99c82dee3526 has sequence number 12, but given 11')
+    assert not is_sequence_mismatch('[Error Code: 1101] cadence runtime error')
+    assert not is_sequence_mismatch(None)
+
+
+def test_current_fetches_once_then_advances_locally():
+    tracker = SequenceTracker()
+    calls = []
+
+    async def fetch():
+        calls.append(1)
+        return 5
+
+    async def main():
+        first = await tracker.current('0xF1AB99C82DEE3526', 0, fetch)
+        tracker.advance('f1ab99c82dee3526', 0)
+        second = await tracker.current('f1ab99c82dee3526', 0, fetch)
+        return first, second
+
+    assert asyncio.run(main()) == (5, 6)
+    assert len(calls) == 1
+    assert tracker.stats['hits'] == 1
+
+
+def test_invalidate_forces_resync():
+    tracker = SequenceTracker()
+    values = iter([3, 9])
+
+    async def fetch():
+        return next(values)
+
+    async def main():
+        await tracker.current('f1ab99c82dee3526', 1, fetch)
+        tracker.invalidate('f1ab99c82dee3526', 1, mismatch=True)
+        return await tracker.current('f1ab99c82dee3526', 1, fetch)
+
+    assert asyncio.run(main()) == 9
+    assert tracker.stats['mismatches'] == 1
+    assert tracker.stats['resyncs'] == 2
+
+
+def test_unconsumed_sequence_is_rewound_while_others_in_flight():
+    tracker = SequenceTracker()
+
+    async def fetch():
+        return 10
+
+    async def main():
+        for _ in range(3):
+            seq = await tracker.current('f1ab99c82dee3526', 0, fetch)
+            tracker.submitted('f1ab99c82dee3526', 0, seq)
+        tracker.settle('f1ab99c82dee3526', 0, 10)
+        tracker.settle('f1ab99c82dee3526', 0, 11, consumed=False)
+        return await tracker.current('f1ab99c82dee3526', 0, fetch)
+
+    assert asyncio.run(main()) == 11
+    assert tracker.in_flight('f1ab99c82dee3526', 0) == 1
+    assert tracker.stats['rewinds'] == 1
+
+
+def test_rewind_marks_later_submissions_rolled_back_and_wakes_waiters():
+    tracker = SequenceTracker()
+
+    async def fetch():
+        return 10
+
+    async def main():
+        for ref in (b'a', b'b', b'c'):
+            seq = await tracker.current('f1ab99c82dee3526', 0, fetch)
+            tracker.submitted('f1ab99c82dee3526', 0, seq, ref)
+        earlier = tracker.pending_before('f1ab99c82dee3526', 0, 12)
+        waiting = asyncio.ensure_future(tracker.wait_settled('f1ab99c82dee3526', 0, earlier, timeout=1))
+        await asyncio.sleep(0)
+        tracker.settle('f1ab99c82dee3526', 0, 10, consumed=False, ref=b'a')
+        marked = (tracker.rolled_back(b'b'), tracker.rolled_back(b'c'))
+        tracker.settle('f1ab99c82dee3526', 0, 11, consumed=False, mismatch=True, ref=b'b')
+        return earlier, marked, await waiting, await tracker.current('f1ab99c82dee3526', 0, fetch)
+
+    earlier, marked, settled, current = asyncio.run(main())
+    assert earlier == [b'a', b'b']
+    assert marked == (True, True)
+    assert settled is True
+    assert current == 10
+    assert tracker.stats['rolled_back'] == 2
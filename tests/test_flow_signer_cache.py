@@ -0,0 +1,52 @@
+from flow_py_sdk.signer import HashAlgo, InMemorySigner, SignAlgo
+
+from flow_signer_cache import SignerCache
+
+KEY_A = '11' * 32
+KEY_B = '22' * 32
+
+
+def _factory(calls):
+    def create(private_key_hex, signature_algo, hash_algo):
+        calls.append(private_key_hex)
+        return InMemorySigner(hash_algo=HashAlgo.SHA3_256, sign_algo=SignAlgo.ECDSA_P256, private_key_hex=private_key_hex)
+    return create
+
+
+def test_get_reuses_signer_and_loads_key_once():
+    calls, loads = [], []
+    cache = SignerCache(_factory(calls))
+
+    def load():
+        loads.append(1)
+        return KEY_A
+
+    first = cache.get('0xF1AB99C82DEE3526', 0, 'ECDSA_P256', 'SHA3_256', load_key=load)
+    second = cache.get('f1ab99c82dee3526', 0, 'ECDSA_P256', 'SHA3_256', load_key=load)
+    assert first is second
+    assert len(loads) == 1 and len(calls) == 1
+    assert cache.stats['hits'] == 1
+
+
+def test_rotated_private_key_rebuilds_signer():
+    calls = []
+    cache = SignerCache(_factory(calls))
+    first = cache.get('f1ab99c82dee3526', 0, 'ECDSA_P256', 'SHA3_256', private_key_hex=KEY_A)
+    second = cache.get('f1ab99c82dee3526', 0, 'ECDSA_P256', 'SHA3_256', private_key_hex=KEY_B)
+    assert first is not second
+    assert cache.stats['rotations'] == 1
+
+
+def test_lru_eviction_ttl_and_invalidate():
+    calls = []
+    cache = SignerCache(_factory(calls), max_size=2)
+    for addr in ('01', '02', '03'):
+        cache.get(addr, 0, 'ECDSA_P256', 'SHA3_256', private_key_hex=KEY_A)
+    assert cache.stats['evictions'] == 1
+    assert cache.invalidate('0x03') == 1
+    assert cache.metrics()['size'] == 1
+
+    expiring = SignerCache(_factory(calls), ttl=0)
+    expiring.get('01', 0, 'ECDSA_P256', 'SHA3_256', private_key_hex=KEY_A)
+    expiring.get('01', 0, 'ECDSA_P256', 'SHA3_256', private_key_hex=KEY_A)
+    assert expiring.stats['expired'] == 1
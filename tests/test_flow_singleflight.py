@@ -0,0 +1,48 @@
+import asyncio
+
+from flow_singleflight import SingleFlight
+
+
+def test_concurrent_identical_calls_share_one_request():
+    flights = SingleFlight()
+    started = []
+
+    async def fetch():
+        started.append(1)
+        await asyncio.sleep(0.01)
+        return 42
+
+    async def run():
+        results = await asyncio.gather(*(flights.do(('bait', '0x01'), fetch) for _ in range(20)), flights.do(('bait', '0x02'), fetch))
+        again = await flights.do(('bait', '0x01'), fetch)
+        return results, again
+
+    results, again = asyncio.run(run())
+    assert results == [42] * 21 and again == 42
+    assert len(started) == 3
+    assert flights.stats['shared'] == 19
+    assert flights.in_flight() == 0
+
+
+def test_errors_are_shared_and_cancelled_waiter_does_not_cancel_others():
+    flights = SingleFlight()
+
+    async def boom():
+        await asyncio.sleep(0.01)
+        raise RuntimeError('node down')
+
+    async def slow():
+        await asyncio.sleep(0.05)
+        return 'ok'
+
+    async def run():
+        errors = await asyncio.gather(*(flights.do('k', boom) for _ in range(3)), return_exceptions=True)
+        impatient = asyncio.ensure_future(asyncio.wait_for(flights.do('s', slow), 0.01))
+        patient = flights.do('s', slow)
+        results = await asyncio.gather(impatient, patient, return_exceptions=True)
+        return errors, results
+
+    errors, (impatient, patient) = asyncio.run(run())
+    assert all(isinstance(e, RuntimeError) for e in errors)
+    assert isinstance(impatient, asyncio.TimeoutError)
+    assert patient == 'ok'
@@ -0,0 +1,98 @@
+import asyncio
+from contextlib import asynccontextmanager
+from types import SimpleNamespace
+
+from flow_tx_tracker import TransactionStatusTracker
+
+
+class FakeClient:
+    def __init__(self, statuses):
+        self.statuses = statuses
+        self.calls = []
+
+    async def get_transaction_result(self, id):
+        self.calls.append(id)
+        seq = self.statuses[id]
+        status = seq.pop(0) if len(seq) > 1 else seq[0]
+        return SimpleNamespace(status=status, error_message='')
+
+
+def _tracker(client, **kwargs):
+    @asynccontextmanager
+    async def factory(network):
+        yield client
+    return TransactionStatusTracker(factory, tick=0.01, max_interval=0.02, **kwargs)
+
+
+def test_wait_resolves_each_waiter_at_its_target():
+    client = FakeClient({b'a': [1, 3, 4]})
+    tracker = _tracker(client)
+
+    async def main():
+        executed = tracker.wait('mainnet', b'a', 3)
+        sealed = tracker.wait('mainnet', b'a', 4)
+        return await asyncio.gather(executed, sealed)
+
+    executed, sealed = asyncio.run(main())
+    assert executed.status == 3
+    assert sealed.status == 4
+    assert tracker.in_flight() == 0
+    assert tracker.expected_time(4) is not None
+
+
+def test_polls_per_tick_are_bounded_by_limit():
+    statuses = {bytes([i]): [1, 1, 4] for i in range(20)}
+    client = FakeClient(statuses)
+    tracker = _tracker(client, max_polls_per_tick=5)
+    batch_sizes = []
+    original = tracker._observe
+
+    async def main():
+        return await asyncio.gather(*(tracker.wait('mainnet', tx_id, 4) for tx_id in statuses))
+
+    def observe(entry, result, now):
+        batch_sizes.append(now)
+        original(entry, result, now)
+
+    tracker._observe = observe
+    results = asyncio.run(main())
+    assert all(r.status == 4 for r in results)
+    per_tick = {}
+    for ts in batch_sizes:
+        per_tick[ts] = per_tick.get(ts, 0) + 1
+    assert max(per_tick.values()) <= 5
+
+
+def test_expired_resolves_waiters():
+    client = FakeClient({b'x': [5]})
+    tracker = _tracker(client)
+    result = asyncio.run(tracker.wait('mainnet', b'x', 4))
+    assert result.status == 5
+
+
+def test_timeout_returns_last_known_result():
+    client = FakeClient({b'p': [1]})
+    tracker = _tracker(client)
+    result = asyncio.run(tracker.wait('mainnet', b'p', 4, timeout=0.1))
+    assert result.status == 1
+    assert tracker.stats['timeouts'] == 1
+    assert tracker.in_flight() == 0
+
+
+def test_each_poll_borrows_its_own_client():
+    client = FakeClient({bytes([i]): [1, 4] for i in range(5)})
+    borrows = []
+
+    @asynccontextmanager
+    async def factory(network):
+        borrows.append(network)
+        yield client
+
+    tracker = TransactionStatusTracker(factory, tick=0.01, max_interval=0.02, max_polls_per_tick=5)
+
+    async def main():
+        return await asyncio.gather(*(tracker.wait('mainnet', bytes([i]), 4) for i in range(5)))
+
+    asyncio.run(main())
+    # Every get_transaction_result goes through the factory, which is where rate limit tokens are taken.
+    assert len(borrows) == len(client.calls) == tracker.stats['polls']